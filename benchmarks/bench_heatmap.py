@@ -0,0 +1,107 @@
+"""
+Tiempo de render del heatmap Cluster × Skill: seaborn frente a Plotly.
+
+Para cada k compara:
+- seaborn: pivot de `top_skills_per_cluster` + heatmap 20×8" + PNG
+  (lo que hacía `st.pyplot`); solo si seaborn y matplotlib están instalados
+- plotly: figura desde los centroides + JSON (lo que envía `st.plotly_chart`)
+- plotly (caché): la misma llamada servida desde `figure_cache`
+
+Los clusterings se calculan antes de medir: solo se mide el render.
+
+    python -m benchmarks.bench_heatmap --ks 3 6 12 --repeat 5
+"""
+import argparse
+import io
+import time
+
+import plotly.io as pio
+
+from src.clustering import (
+    cluster_centroids,
+    get_clustering_engine,
+    plot_heatmap_clusters,
+    run_clustering,
+)
+from src.load_data import load_all_data
+
+
+def seaborn_heatmap_png(top_skills_per_cluster) -> bytes:
+    """Render anterior (seaborn + matplotlib), hasta el PNG."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    heatmap_df = (
+        top_skills_per_cluster
+        .pivot_table(index="Cluster", columns="Skill", values="Importance", observed=True)
+        .fillna(0)
+    )
+    fig, ax = plt.subplots(figsize=(20, 8))
+    sns.heatmap(heatmap_df, cmap="viridis", linewidths=0.3, linecolor="gray", ax=ax)
+    ax.set_xlabel("Habilidad")
+    ax.set_ylabel("Cluster")
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def plotly_heatmap_json(centroids, cached: bool) -> str:
+    build = plot_heatmap_clusters if cached else plot_heatmap_clusters.uncached
+    return pio.to_json(build(centroids), validate=False)
+
+
+def best_ms(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return min(times) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ks", type=int, nargs="+", default=[3, 6, 12])
+    parser.add_argument("--algorithm", default="exact")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    try:
+        import matplotlib  # noqa: F401
+        import seaborn  # noqa: F401
+        has_seaborn = True
+    except ImportError:
+        has_seaborn = False
+
+    df_rec = load_all_data()[3]
+    engine = get_clustering_engine(df_rec, args.algorithm)
+
+    print(f"algorithm={args.algorithm}, repeat={args.repeat} (mejor tiempo)")
+    print(f"{'k':>3} {'seaborn ms':>11} {'plotly ms':>10} {'caché ms':>9} {'PNG KB':>7} {'JSON KB':>8}")
+
+    for k in args.ks:
+        _, top_skills_per_cluster, _ = run_clustering(df_rec, k, args.algorithm)
+        centroids = cluster_centroids(df_rec, k, args.algorithm)
+        engine.fit(k)
+
+        if has_seaborn:
+            png_kb = len(seaborn_heatmap_png(top_skills_per_cluster)) / 1024
+            sns_ms = best_ms(lambda: seaborn_heatmap_png(top_skills_per_cluster), args.repeat)
+        else:
+            png_kb, sns_ms = float("nan"), float("nan")
+
+        json_kb = len(plotly_heatmap_json(centroids, cached=False)) / 1024
+        plotly_ms = best_ms(lambda: plotly_heatmap_json(centroids, cached=False), args.repeat)
+        plotly_heatmap_json(centroids, cached=True)
+        cached_ms = best_ms(lambda: plotly_heatmap_json(centroids, cached=True), args.repeat)
+
+        print(f"{k:>3} {sns_ms:>11.1f} {plotly_ms:>10.1f} {cached_ms:>9.2f} {png_kb:>7.0f} {json_kb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Tiempo de importación de los módulos de `src` y primer render de las
+páginas ligeras, con presupuesto de arranque.
+
+Cada medida se hace en un proceso nuevo. Para los módulos se usa
+`python -X importtime` después de `import streamlit`, así que el tiempo
+es lo que añade el módulo a un proceso de Streamlit ya arrancado. Para
+las páginas se mide la primera ejecución con `AppTest`, incluida la
+carga de datos (con el snapshot ya en disco).
+
+Falla (código de salida 1) si algún módulo o página supera su
+presupuesto o carga alguno de los paquetes de HEAVY_PACKAGES que no
+necesita (scikit-learn, SciPy, plotly.express…).
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --scale 2 --no-pages
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Paquetes que solo deben cargarse en el primer uso
+HEAVY_PACKAGES = ("sklearn", "scipy", "plotly.express", "matplotlib", "seaborn")
+
+# Módulo → presupuesto de importación (ms) sobre un proceso con streamlit
+MODULE_BUDGETS_MS = {
+    "src.data_access": 1000,
+    "src.load_data": 1000,
+    "src.charts_wages": 1000,
+    "src.charts_skills": 1000,
+    "src.clustering": 1000,
+    "src.recommender": 1000,
+    "src.oews_trends": 1000,
+}
+
+# Página → (presupuesto del primer render en ms, paquetes que no debe cargar)
+PAGE_BUDGETS = {
+    "Inicio.py": (3000, HEAVY_PACKAGES),
+    "pages/1_Wage_Maps_and_Trends.py": (8000, ("sklearn", "scipy", "matplotlib", "seaborn")),
+}
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Líneas de `-X importtime` → {módulo: (self µs, acumulado µs)}."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def loaded_heavy(modules, heavy=HEAVY_PACKAGES) -> list[str]:
+    return sorted({h for h in heavy for m in modules if m == h or m.startswith(h + ".")})
+
+
+def measure_module(module: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import streamlit; import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = parse_importtime(proc.stderr)
+    own = times[module][1] / 1000
+    # -X importtime escribe cada módulo al terminar de importarlo: lo que
+    # va entre `streamlit` y `module` lo ha importado el propio módulo
+    names = list(times)
+    mine = names[names.index("streamlit") + 1:names.index(module) + 1]
+    top = sorted(mine, key=lambda n: -times[n][0])[:5]
+    return {
+        "ms": round(own, 1),
+        "heavy": loaded_heavy(mine),
+        "top": [(n, round(times[n][0] / 1000, 1)) for n in top],
+    }
+
+
+PAGE_SCRIPT = """
+import json, sys, time, warnings, logging
+warnings.filterwarnings("ignore")
+logging.disable(logging.CRITICAL)
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({path!r}, default_timeout=600).run()
+ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({{"ms": ms, "errors": [str(e.value) for e in at.exception], "modules": list(sys.modules)}}))
+"""
+
+
+def measure_page(page: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", PAGE_SCRIPT.format(path=str(ROOT / page))],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiplica todos los presupuestos (máquinas lentas)")
+    parser.add_argument("--no-pages", action="store_true", help="Medir solo los módulos")
+    args = parser.parse_args(argv)
+
+    failures = []
+
+    print(f"{'módulo':<22} {'ms':>8} {'budget':>8}  pesados / top self ms")
+    for module, budget in MODULE_BUDGETS_MS.items():
+        result = measure_module(module)
+        budget *= args.scale
+        ok = result["ms"] <= budget and not result["heavy"]
+        if not ok:
+            failures.append(module)
+        top = ", ".join(f"{n} {ms}" for n, ms in result["top"])
+        heavy = ",".join(result["heavy"]) or "-"
+        print(f"{module:<22} {result['ms']:>8.1f} {budget:>8.0f}  {'OK ' if ok else 'FAIL'} {heavy} | {top}")
+
+    if not args.no_pages:
+        print()
+        print(f"{'página':<34} {'ms':>8} {'budget':>8}  pesados")
+        for page, (budget, forbidden) in PAGE_BUDGETS.items():
+            result = measure_page(page)
+            budget *= args.scale
+            heavy = loaded_heavy(result["modules"], forbidden)
+            ok = result["ms"] <= budget and not heavy and not result["errors"]
+            if not ok:
+                failures.append(page)
+            print(f"{page:<34} {result['ms']:>8.0f} {budget:>8.0f}  {'OK ' if ok else 'FAIL'} {','.join(heavy) or '-'}")
+
+    if failures:
+        print(f"\nFuera de presupuesto: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
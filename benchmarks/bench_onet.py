@@ -0,0 +1,93 @@
+"""
+Lectura de las tablas O*NET: .xlsx frente a texto delimitado por
+tabuladores (`onet_reader.read_onet`).
+
+Por defecto las entradas .txt se generan una vez en
+data/cache/benchmarks/onet_txt a partir de los .xlsx de data/raw, con
+todas sus columnas y el formato de la base de datos de texto de O*NET
+(tabuladores, sin comillas), así que la comparación se puede repetir con
+lo que trae el repositorio. Con `--txt-dir` se usan en su lugar los .txt
+oficiales descargados de O*NET.
+
+Para cada tabla mide la mejor de `--repeat` lecturas por formato y
+comprueba que ambas devuelven el mismo DataFrame.
+
+    python -m benchmarks.bench_onet
+    python -m benchmarks.bench_onet --txt-dir ~/db_29_0_text --repeat 5
+"""
+import argparse
+import csv
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.load_data import OPTIONAL_RAW_FILES, RAW_DIR, RAW_FILES
+from src.onet_reader import ONET_TABLES, read_onet
+from src.snapshot import CACHE_DIR
+
+
+TXT_DIR = CACHE_DIR / "benchmarks" / "onet_txt"
+
+
+def onet_workbooks() -> dict[str, Path]:
+    """Tablas O*NET con .xlsx en data/raw → ruta."""
+    files = {**RAW_FILES, **OPTIONAL_RAW_FILES}
+    return {
+        name: RAW_DIR / files[name]
+        for name in ONET_TABLES
+        if name in files and (RAW_DIR / files[name]).exists()
+    }
+
+
+def text_copy(xlsx: Path, out_dir: Path = TXT_DIR) -> Path:
+    """Escribe (una vez) el .txt equivalente a `xlsx` en `out_dir`."""
+    txt = out_dir / xlsx.with_suffix(".txt").name
+    if not txt.exists():
+        out_dir.mkdir(parents=True, exist_ok=True)
+        df = pd.read_excel(xlsx, engine="openpyxl")
+        df.to_csv(txt, sep="\t", index=False, quoting=csv.QUOTE_NONE, escapechar="\\")
+    return txt
+
+
+def best_seconds(func, repeat: int):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--txt-dir", type=Path, default=None, help="Directorio con los .txt oficiales de O*NET")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'tabla':<16} {'filas':>8} {'xlsx s':>8} {'txt s':>8} {'x':>6}  iguales")
+    total_xlsx = total_txt = 0.0
+    for name, xlsx in onet_workbooks().items():
+        txt = (args.txt_dir / xlsx.with_suffix(".txt").name) if args.txt_dir else text_copy(xlsx)
+        if not txt.exists():
+            print(f"{name:<16} sin {txt.name}")
+            continue
+
+        xlsx_s, from_xlsx = best_seconds(lambda: read_onet(xlsx, name), args.repeat)
+        txt_s, from_txt = best_seconds(lambda: read_onet(txt, name), args.repeat)
+        total_xlsx += xlsx_s
+        total_txt += txt_s
+
+        try:
+            pd.testing.assert_frame_equal(from_xlsx, from_txt)
+            same = "sí"
+        except AssertionError:
+            same = "no"
+        print(f"{name:<16} {len(from_txt):>8} {xlsx_s:>8.3f} {txt_s:>8.3f} {xlsx_s / txt_s:>6.1f}  {same}")
+
+    if total_txt:
+        print(f"{'total':<16} {'':>8} {total_xlsx:>8.3f} {total_txt:>8.3f} {total_xlsx / total_txt:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+"""
+Benchmark de las etapas principales sobre los CSV de data/processed y
+sobre copias sintéticas escaladas (10×, 100×).
+
+Etapas (en orden, cada una usa lo que produjo la anterior):
+- load_data: lectura de los CSV + limpieza + diccionarios compartidos
+  (lo que hace `load_all_data` a partir de los frames limpios)
+- build_merged, recommender_build, recommend_occupations,
+  run_clustering, skills_salary_correlation
+- charts: mapa, barras de estados, top skills, radar y PCA sin caché
+
+Antes de cada medida se vacían las cachés en memoria (`cache_by_frame`,
+FIGURE_CACHE), así que se mide el cálculo y no el acierto de caché; una
+ejecución previa de calentamiento absorbe las importaciones perezosas. Por
+etapa se guarda la mediana del tiempo de pared de `--repeat` ejecuciones
+y el pico de memoria asignada (tracemalloc, en una ejecución aparte).
+
+Cada ejecución se añade a benchmarks/results/history.json y se compara
+con benchmarks/results/baseline.json: una etapa es regresión si tarda o
+reserva más de un `--tolerance` por encima de la referencia. Solo se
+compara si la configuración (`--repeat`, `--n-boot`,
+`--cluster-algorithm`), la arquitectura y el número de CPUs coinciden con
+los de la referencia; si no, se avisa y se omite la comparación (con
+`--check`, código 2).
+
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --datasets bundled 10x --repeat 5
+    python -m benchmarks.bench_suite --update-baseline
+    python -m benchmarks.bench_suite --check     # código 1 si hay regresión
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from src import charts_skills, charts_wages, clustering, correlations, recommender
+from src.encoding import build_dictionaries, encode_frame
+from src.figure_cache import FIGURE_CACHE
+from src.merge_datasets import build_merged
+from src.preprocess_oews import FIPS_TO_STATE, clean_oews
+from src.skill_matrix import get_skill_wage_matrix
+from src.snapshot import BASE_DIR, CACHE_DIR
+from src.wage_store import get_wage_store
+
+
+PROCESSED_DIR = BASE_DIR / "data" / "processed"
+SYNTHETIC_DIR = CACHE_DIR / "benchmarks"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+HISTORY_PATH = RESULTS_DIR / "history.json"
+BASELINE_PATH = RESULTS_DIR / "baseline.json"
+
+PROCESSED_FILES = {
+    "oews": "oews_state_clean.csv",
+    "occ": "occ_clean.csv",
+    "skills": "skills_clean.csv",
+    "tasks": "tasks_clean.csv",
+}
+
+
+class Scale(NamedTuple):
+    socs: int
+    skills: int
+    states: int
+
+
+# El factor del nombre es el de ocupaciones; skills y estados crecen menos
+# para que la matriz SOC × skill (y el bootstrap de correlaciones) quepa
+# en memoria a 100×.
+SCALES = {
+    "10x": Scale(socs=10, skills=2, states=2),
+    "100x": Scale(socs=100, skills=2, states=4),
+}
+
+DATASETS = ("bundled",) + tuple(SCALES)
+
+
+# ============================================================
+#   DATOS SINTÉTICOS
+# ============================================================
+
+def synthetic_copy(name: str, scale: Scale, seed: int = 0) -> Path:
+    """
+    Escribe (una vez) en data/cache/benchmarks/<name> los CSV de
+    data/processed escalados:
+    - cada SOC se replica `socs` veces (SOC "11-1011.00-3") con la
+      importancia de sus skills y sus salarios perturbados
+    - cada skill se replica `skills` veces ("Writing #2")
+    - cada estado se replica `states` veces como área nueva con su
+      propia sigla (AREA_TYPE / PRIM_STATE, ver `clean_oews`)
+    """
+    out = SYNTHETIC_DIR / name
+    if all((out / f).exists() for f in PROCESSED_FILES.values()):
+        return out
+
+    rng = np.random.default_rng(seed)
+    src = {k: pd.read_csv(PROCESSED_DIR / f, dtype={"OCC_CODE": str}) for k, f in PROCESSED_FILES.items()}
+
+    def soc_copies(df, col="SOC"):
+        parts = []
+        for k in range(scale.socs):
+            part = df.copy()
+            if k:
+                part[col] = part[col].astype(str) + f"-{k}"
+            parts.append(part)
+        return pd.concat(parts, ignore_index=True)
+
+    occ = soc_copies(src["occ"])
+    occ["Title"] = np.where(
+        occ["SOC"].str.count("-") > 1,
+        occ["Title"] + " (" + occ["SOC"].str.split("-").str[-1] + ")",
+        occ["Title"],
+    )
+    tasks = soc_copies(src["tasks"])
+
+    skills = pd.concat(
+        [
+            src["skills"].assign(Skill=src["skills"]["Skill"] + (f" #{j + 1}" if j else ""))
+            for j in range(scale.skills)
+        ],
+        ignore_index=True,
+    )
+    skills = soc_copies(skills)
+    noise = rng.normal(0, 0.3, len(skills)) * (skills["SOC"].str.count("-") > 1)
+    skills["Importance"] = (skills["Importance"] + noise).clip(1, 5).round(2)
+
+    # OEWS: OCC_CODE sin decimales, copias con el mismo sufijo que en O*NET
+    oews = src["oews"]
+    oews_parts = []
+    for k in range(scale.socs):
+        part = oews.copy()
+        if k:
+            part["OCC_CODE"] = part["OCC_CODE"] + f".00-{k}"
+            part["OCC_TITLE"] = part["OCC_TITLE"] + f" ({k})"
+            factor = rng.lognormal(0, 0.1, len(part))
+            for col in ("A_MEAN", "A_MEDIAN", "A_PCT10", "A_PCT90", "H_MEAN", "H_MEDIAN"):
+                part[col] = (part[col] * factor).round(2)
+        oews_parts.append(part)
+    oews = pd.concat(oews_parts, ignore_index=True)
+
+    state_parts = [oews.assign(AREA_TYPE=2, PRIM_STATE=oews["AREA"].map(FIPS_TO_STATE))]
+    for s in range(1, scale.states):
+        state_parts.append(oews.assign(
+            AREA=oews["AREA"] + 100 * s,
+            AREA_TITLE=oews["AREA_TITLE"] + f" {s}",
+            AREA_TYPE=2,
+            PRIM_STATE=oews["AREA"].map(FIPS_TO_STATE) + str(s),
+        ))
+    oews = pd.concat(state_parts, ignore_index=True)
+
+    out.mkdir(parents=True, exist_ok=True)
+    for key, frame in {"oews": oews, "occ": occ, "skills": skills, "tasks": tasks}.items():
+        frame.to_csv(out / PROCESSED_FILES[key], index=False)
+    return out
+
+
+def dataset_dir(name: str) -> Path:
+    return PROCESSED_DIR if name == "bundled" else synthetic_copy(name, SCALES[name])
+
+
+def load_processed(path: Path):
+    """CSV limpios → (oews_clean, occ, skills_clean, tasks_clean) codificados."""
+    oews = pd.read_csv(path / PROCESSED_FILES["oews"], dtype={"OCC_CODE": str})
+    oews_clean = clean_oews(oews, occupations=None, states_only="AREA_TYPE" not in oews.columns)
+    occ = pd.read_csv(path / PROCESSED_FILES["occ"])
+    skills_clean = pd.read_csv(path / PROCESSED_FILES["skills"])
+    tasks_clean = pd.read_csv(path / PROCESSED_FILES["tasks"])
+
+    frames = (oews_clean, occ, skills_clean, tasks_clean)
+    dicts = build_dictionaries(*frames)
+    return tuple(encode_frame(df, dicts) for df in frames)
+
+
+# ============================================================
+#   ETAPAS
+# ============================================================
+
+def clear_caches():
+    for func in (
+        get_wage_store,
+        get_skill_wage_matrix,
+        recommender.get_recommender_artifact,
+        clustering.get_clustering_engine,
+        correlations.skill_salary_correlations,
+    ):
+        func.cache_clear()
+    FIGURE_CACHE.clear()
+
+
+def stage_load_data(ctx):
+    ctx["frames"] = load_processed(ctx["dir"])
+
+
+def stage_build_merged(ctx):
+    ctx["merged"], ctx["df_plot"], ctx["df_rec"] = build_merged(*ctx["frames"])
+
+
+def stage_recommender_build(ctx):
+    ctx["artifact"] = recommender.build_recommender_artifact(ctx["df_rec"])
+
+
+def stage_recommend_occupations(ctx):
+    # 100 consultas de 5 skills; la primera construye (o lee) el artefacto
+    skills = ctx["artifact"].skills
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        picked = list(rng.choice(skills, size=min(5, len(skills)), replace=False))
+        recommender.recommend_occupations(ctx["df_rec"], picked, top_n=10)
+
+
+def stage_run_clustering(ctx):
+    engine = clustering.ClusteringEngine(ctx["df_rec"], algorithm=ctx["cluster_algorithm"])
+    ctx["clusters"] = engine.run(6)
+
+
+def stage_skills_salary_correlation(ctx):
+    ctx["df_corr"] = correlations.compute_skill_salary_correlations(
+        ctx["df_plot"], n_boot=ctx["n_boot"]
+    )
+
+
+def stage_charts(ctx):
+    oews_clean = ctx["frames"][0]
+    df_plot = ctx["df_plot"]
+    occupation = str(oews_clean["OCC_TITLE"].iloc[0])
+    titles = sorted(df_plot["OCC_TITLE"].dropna().unique())[:3]
+
+    charts_wages.choropleth_wage_map.uncached(oews_clean, occupation)
+    charts_wages.top_n_states_bar.uncached(oews_clean, occupation, 10)
+    charts_skills.top_skills_bar.uncached(df_plot, "All", 10)
+    charts_skills.radar_chart.uncached(df_plot, titles, 10)
+    clustering.plot_clusters.uncached(ctx["clusters"][0])
+
+
+STAGES = {
+    "load_data": stage_load_data,
+    "build_merged": stage_build_merged,
+    "recommender_build": stage_recommender_build,
+    "recommend_occupations": stage_recommend_occupations,
+    "run_clustering": stage_run_clustering,
+    "skills_salary_correlation": stage_skills_salary_correlation,
+    "charts": stage_charts,
+}
+
+
+def measure(stage, ctx, repeat: int) -> dict:
+    # Una ejecución de calentamiento: importaciones perezosas (sklearn,
+    # plotly.express…) y artefactos en disco no cuentan en la medida
+    stage(ctx)
+    times = []
+    for _ in range(repeat):
+        clear_caches()
+        t0 = time.perf_counter()
+        stage(ctx)
+        times.append(time.perf_counter() - t0)
+
+    clear_caches()
+    tracemalloc.start()
+    try:
+        stage(ctx)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": round(statistics.median(times), 4),
+        "min_seconds": round(min(times), 4),
+        "peak_mb": round(peak / 2**20, 2),
+    }
+
+
+def run_dataset(name: str, repeat: int, n_boot: int, cluster_algorithm: str) -> dict:
+    ctx = {"dir": dataset_dir(name), "n_boot": n_boot, "cluster_algorithm": cluster_algorithm}
+    results = {}
+    for stage_name, stage in STAGES.items():
+        results[stage_name] = measure(stage, ctx, repeat)
+        r = results[stage_name]
+        print(f"  {stage_name:<27} {r['seconds']:>9.3f} s {r['peak_mb']:>9.1f} MB", flush=True)
+
+    oews_clean, occ, skills_clean, _ = ctx["frames"]
+    results["_size"] = {
+        "oews_rows": len(oews_clean),
+        "socs": int(skills_clean["SOC"].nunique()),
+        "skills": int(skills_clean["Skill"].nunique()),
+        "states": int(oews_clean["STATE_ABBR"].nunique()),
+    }
+    return results
+
+
+# ============================================================
+#   HISTÓRICO Y REGRESIONES
+# ============================================================
+
+def environment() -> dict:
+    def version(pkg):
+        try:
+            return metadata.version(pkg)
+        except metadata.PackageNotFoundError:
+            return None
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "packages": {p: version(p) for p in ("pandas", "numpy", "scikit-learn", "scipy", "plotly", "pyarrow")},
+    }
+
+
+def read_json(path: Path, default):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return default
+
+
+COMPARABLE_KEYS = ("machine", "cpus")
+
+
+def comparison_mismatches(run: dict, baseline: dict) -> list[str]:
+    """
+    Diferencias de configuración o de máquina entre `run` y `baseline`
+    que hacen que sus tiempos no sean comparables.
+    """
+    found = []
+    run_config, base_config = run.get("config", {}), baseline.get("config", {})
+    for key in sorted(set(run_config) | set(base_config)):
+        if run_config.get(key) != base_config.get(key):
+            found.append(f"config.{key}: {base_config.get(key)!r} → {run_config.get(key)!r}")
+    for key in COMPARABLE_KEYS:
+        if run.get(key) != baseline.get(key):
+            found.append(f"{key}: {baseline.get(key)!r} → {run.get(key)!r}")
+    return found
+
+
+def find_regressions(run: dict, baseline: dict, tolerance: float, min_seconds: float) -> list[str]:
+    """
+    Etapas de `run` más lentas (o con más memoria) que las de `baseline`
+    en más de `tolerance` (fracción). Diferencias de tiempo por debajo de
+    `min_seconds` se consideran ruido.
+
+    Lanza ValueError si las ejecuciones no son comparables (ver
+    `comparison_mismatches`).
+    """
+    mismatches = comparison_mismatches(run, baseline)
+    if mismatches:
+        raise ValueError("ejecuciones no comparables: " + "; ".join(mismatches))
+
+    found = []
+    for dataset, stages in run["results"].items():
+        for stage, r in stages.items():
+            base = baseline["results"].get(dataset, {}).get(stage)
+            if stage.startswith("_") or base is None:
+                continue
+            dt = r["seconds"] - base["seconds"]
+            if dt > min_seconds and r["seconds"] > base["seconds"] * (1 + tolerance):
+                found.append(f"{dataset}/{stage}: {base['seconds']:.3f} s → {r['seconds']:.3f} s")
+            if r["peak_mb"] > max(base["peak_mb"] * (1 + tolerance), base["peak_mb"] + 1):
+                found.append(f"{dataset}/{stage}: {base['peak_mb']:.1f} MB → {r['peak_mb']:.1f} MB")
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--datasets", nargs="+", choices=DATASETS, default=list(DATASETS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--n-boot", type=int, default=1000, help="Remuestreos bootstrap de las correlaciones")
+    parser.add_argument("--cluster-algorithm", default="exact", choices=clustering.CLUSTERING_ALGORITHMS)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Margen sobre la referencia (0.25 = +25 %%)")
+    parser.add_argument("--min-seconds", type=float, default=0.02, help="Diferencias menores son ruido")
+    parser.add_argument("--update-baseline", action="store_true", help="Guardar esta ejecución como referencia")
+    parser.add_argument("--check", action="store_true", help="Salir con código 1 si hay regresiones")
+    parser.add_argument("--no-history", action="store_true", help="No añadir la ejecución al histórico")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.datasets:
+        print(f"[{name}]", flush=True)
+        results[name] = run_dataset(name, args.repeat, args.n_boot, args.cluster_algorithm)
+
+    run = {
+        **environment(),
+        "config": {"repeat": args.repeat, "n_boot": args.n_boot, "cluster_algorithm": args.cluster_algorithm},
+        "results": results,
+    }
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    if not args.no_history:
+        history = read_json(HISTORY_PATH, [])
+        history.append(run)
+        HISTORY_PATH.write_text(json.dumps(history, indent=1))
+
+    baseline = read_json(BASELINE_PATH, None)
+    regressions = []
+    mismatches = []
+    if baseline is not None:
+        print(f"\nReferencia: {baseline.get('commit')} ({baseline.get('timestamp')})")
+        mismatches = comparison_mismatches(run, baseline)
+        if mismatches:
+            print("Aviso: la referencia no es comparable con esta ejecución, se omite la comparación:")
+            for line in mismatches:
+                print(f"  {line}")
+        else:
+            regressions = find_regressions(run, baseline, args.tolerance, args.min_seconds)
+            if regressions:
+                print("Regresiones:")
+                for line in regressions:
+                    print(f"  {line}")
+            else:
+                print("Sin regresiones.")
+
+    if args.update_baseline or baseline is None:
+        BASELINE_PATH.write_text(json.dumps(run, indent=1))
+        print(f"Referencia guardada en {BASELINE_PATH}")
+
+    if args.check and regressions:
+        sys.exit(1)
+    if args.check and mismatches and not args.update_baseline:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import streamlit as st
+import pandas as pd
 
 
 st.markdown("""
@@ -19,28 +20,28 @@ h1, h2, h3 {
 
 
 
-from src.load_data import load_all_data
+from src.data_access import get_data
 from src.charts_wages import (
     choropleth_wage_map,
     top_n_states_bar,
     employment_vs_wage_scatter,
     heatmap_top_states,
+    wage_trend_lines,
+    wage_growth_bar,
 )
-
-
-@st.cache_data
-def get_data():
-    return load_all_data()
+from src.oews_trends import load_trends
+from src.wage_store import get_wage_store
 
 
 def main():
     st.title("Mapas y Tendencias Salariales")
 
     oews_clean, merged, df_plot, df_rec, occ, skills_clean, tasks_clean = get_data()
+    occupations = get_wage_store(oews_clean).occupations
 
     # Tabs principales
-    tab1, tab2, tab3 = st.tabs(
-        ["Mapa + Top N", "Empleo vs Salario", "Comparador entre Ocupaciones"]
+    tab1, tab2, tab3, tab4 = st.tabs(
+        ["Mapa + Top N", "Empleo vs Salario", "Comparador entre Ocupaciones", "Tendencias"]
     )
 
     # --------------------------------------------------------------------
@@ -49,7 +50,7 @@ def main():
     with tab1:
         st.subheader("Mapa salarial por estado")
 
-        occupation_list = sorted(oews_clean["OCC_TITLE"].unique())
+        occupation_list = occupations
         occupation = st.selectbox(
             "Selecciona una ocupación",
             occupation_list,
@@ -82,7 +83,7 @@ def main():
     with tab2:
         st.subheader("Relación entre Empleo y Salario Medio")
 
-        occupation_list2 = sorted(oews_clean["OCC_TITLE"].unique())
+        occupation_list2 = occupations
         occupation2 = st.selectbox(
             "Selecciona una ocupación",
             occupation_list2,
@@ -110,7 +111,7 @@ def main():
 
         colA, colB = st.columns(2)
 
-        occupation_list3 = sorted(oews_clean["OCC_TITLE"].unique())
+        occupation_list3 = occupations
 
         with colA:
             st.markdown("### Ocupación A")
@@ -156,6 +157,67 @@ def main():
             figB = heatmap_top_states(oews_clean, occB, topB)
             st.plotly_chart(figB, use_container_width=True)
 
+    # --------------------------------------------------------------------
+    # TAB 4: TENDENCIAS MULTI-AÑO (store OEWS particionado por año)
+    # --------------------------------------------------------------------
+    with tab4:
+        st.subheader("Tendencias salariales por año")
+
+        trends = load_trends()
+        if trends is None or len(trends.years) < 2:
+            st.info(
+                "Se necesitan al menos dos ediciones del OEWS en el store. "
+                "Ingiérelas con: `python -m src.oews_trends all_data_M_2019.xlsx all_data_M_2023.xlsx`"
+            )
+            return
+
+        occupation_list4 = trends.occupations
+        occ4 = st.selectbox(
+            "Selecciona una ocupación",
+            occupation_list4,
+            index=occupation_list4.index("Software Developers")
+            if "Software Developers" in occupation_list4
+            else 0,
+            key="tab4_occ",
+        )
+
+        st.caption(f"Años disponibles: {', '.join(map(str, trends.years))}")
+
+        df_series = trends.series(occ4)
+        df_growth = trends.growth(occ4)
+
+        if df_series["SOC_SPLIT"].any():
+            st.caption(
+                "Parte de la serie anterior a SOC 2018 es una estimación: el código "
+                "antiguo se dividió y su empleo se reparte según la primera edición SOC 2018."
+            )
+        if trends.report["unmapped"]:
+            with st.expander(f"{len(trends.report['unmapped'])} códigos SOC retirados sin traducir"):
+                st.dataframe(pd.DataFrame(trends.report["unmapped"]), use_container_width=True)
+
+        states = sorted(df_series["STATE_ABBR"].dropna().unique())
+        default_states = df_growth["STATE_ABBR"].dropna().head(5).tolist()
+        sel_states = st.multiselect(
+            "Estados",
+            states,
+            default=default_states,
+            key="tab4_states",
+        )
+
+        fig_lines = wage_trend_lines(df_series, occ4, sel_states)
+        st.plotly_chart(fig_lines, use_container_width=True)
+
+        top_g = st.slider(
+            "Número de estados (Top N por CAGR)",
+            1,
+            50,
+            10,
+            key="tab4_topn",
+        )
+
+        fig_growth = wage_growth_bar(df_growth, occ4, top_g)
+        st.plotly_chart(fig_growth, use_container_width=True)
+
 
 if __name__ == "__main__":
     main()
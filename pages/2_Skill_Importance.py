@@ -18,12 +18,13 @@ h1, h2, h3 {
 </style>
 """, unsafe_allow_html=True)
 
-from src.load_data import load_all_data
+from src.data_access import get_data
 
 
-@st.cache_data
-def get_data():
-    return load_all_data()
+@st.cache_resource
+def load_occ_level():
+    # Mismo objeto en cada rerun: la caché de figuras lo hashea una sola vez
+    return pd.read_csv("data/raw/occ_level.csv")  # AJUSTA si está en otro sitio
 
 
 def main():
@@ -57,8 +58,7 @@ def main():
     # --------------------------------------------------------------
     st.subheader("Exposición a la IA por familias ocupacionales")
 
-    # Cargar dataset occ_level.csv (AJUSTA la ruta si está en otro sitio)
-    df_occ_level = pd.read_csv("data/raw/occ_level.csv")
+    df_occ_level = load_occ_level()
 
     top_groups = st.slider(
         "Número de familias ocupacionales (Top N)",
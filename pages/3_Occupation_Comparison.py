@@ -17,13 +17,17 @@ h1, h2, h3 {
 </style>
 """, unsafe_allow_html=True)
 
-from src.load_data import load_all_data
-from src.charts_skills import radar_chart
+from src.data_access import get_data
+from src.charts_skills import profile_heatmap, profile_parallel_coordinates, radar_chart
 
+# Por encima de este número de ocupaciones el radar deja de ser legible
+RADAR_MAX = 5
 
-@st.cache_data
-def get_data():
-    return load_all_data()
+CHART_MODES = {
+    "Radar": radar_chart,
+    "Mapa de calor": profile_heatmap,
+    "Coordenadas paralelas": profile_parallel_coordinates,
+}
 
 
 def main():
@@ -33,7 +37,7 @@ def main():
 
     occ_list = sorted(df_plot["OCC_TITLE"].dropna().unique())
     selected = st.multiselect(
-        "Selecciona hasta 3 ocupaciones",
+        "Selecciona ocupaciones",
         occ_list,
         default=["Software Developers", "Information Security Analysts"][: min(2, len(occ_list))],
     )
@@ -41,13 +45,18 @@ def main():
     if len(selected) == 0:
         st.info("Selecciona al menos una ocupación.")
         return
-    if len(selected) > 3:
-        st.warning("Máximo 3 ocupaciones. Se usarán las primeras 3 seleccionadas.")
-        selected = selected[:3]
 
-    max_skills = st.slider("Número de habilidades en el radar", 5, 20, 10)
-    fig_radar = radar_chart(df_plot, selected, max_skills)
-    st.plotly_chart(fig_radar, use_container_width=True)
+    modes = list(CHART_MODES)
+    mode = st.radio(
+        "Vista",
+        modes,
+        index=0 if len(selected) <= RADAR_MAX else 1,
+        horizontal=True,
+    )
+
+    max_skills = st.slider("Número de habilidades", 5, 20, 10)
+    fig = CHART_MODES[mode](df_plot, selected, max_skills)
+    st.plotly_chart(fig, use_container_width=True)
 
 
 if __name__ == "__main__":
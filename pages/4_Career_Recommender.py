@@ -18,20 +18,23 @@ h1, h2, h3 {
 </style>
 """, unsafe_allow_html=True)
 
-from src.load_data import load_all_data
-from src.recommender import recommend_occupations, top_skills_for_soc
+from src.data_access import get_data, get_descriptors
+from src.recommender import (
+    DOMAIN_LABELS,
+    get_descriptor_artifact,
+    recommend_by_descriptors,
+    top_skills_for_soc,
+)
 
 
 # ============================
 # Load OEWS + O*NET + IA risk
 # ============================
 
-@st.cache_data
-def get_data():
-    return load_all_data()
-
-@st.cache_data
+@st.cache_resource
 def load_ai_exposure():
+    # cache_resource: el mismo DataFrame en cada rerun (no se modifica), en
+    # lugar de una copia nueva que las cachés por frame tendrían que rehashear
     df_ai = pd.read_csv("data/raw/occ_level.csv")  # AJUSTA si está en otra carpeta
 
     # Categorías de riesgo IA según gamma
@@ -50,9 +53,12 @@ def main():
 
     # Cargar datos
     oews_clean, merged, df_plot, df_rec, occ, skills_clean, tasks_clean = get_data()
+    descriptors = get_descriptors()
     df_ai = load_ai_exposure()
 
     all_skills = sorted(df_rec["Skill"].unique())
+    artifact = get_descriptor_artifact(descriptors)
+    extra_domains = [d for d in artifact.domains if d != "skills"]
 
     col_input, col_output = st.columns([1, 2])
 
@@ -67,27 +73,46 @@ def main():
             all_skills,
         )
 
+        # Otros dominios O*NET (si están en data/raw) y peso de cada uno
+        selections = {"skills": selected_skills}
+        domain_weights = {}
+        with st.expander("Más descriptores y pesos por dominio"):
+            for domain in extra_domains:
+                selections[domain] = st.multiselect(
+                    DOMAIN_LABELS.get(domain, domain),
+                    artifact.elements(domain),
+                )
+            for domain in artifact.domains:
+                domain_weights[domain] = st.slider(
+                    f"Peso: {DOMAIN_LABELS.get(domain, domain)}",
+                    0.0, 2.0, 1.0, 0.1,
+                )
+
         top_n = st.slider("Top N ocupaciones", 5, 30, 10)
 
         if st.button("Recomendar"):
             st.session_state["recommend_triggered"] = True
-            st.session_state["selected_skills"] = selected_skills
+            st.session_state["selections"] = selections
+            st.session_state["domain_weights"] = domain_weights
             st.session_state["top_n"] = top_n
 
     # ============================================================
     # PANEL DERECHO — RESULTADOS
     # ============================================================
     if "recommend_triggered" in st.session_state and st.session_state["recommend_triggered"]:
-        selected_skills = st.session_state.get("selected_skills", [])
+        selections = st.session_state.get("selections", {})
+        domain_weights = st.session_state.get("domain_weights")
         top_n = st.session_state.get("top_n", 10)
 
         with col_output:
-            if not selected_skills:
-                st.warning("Selecciona al menos una habilidad.")
+            if not any(selections.values()):
+                st.warning("Selecciona al menos una habilidad o descriptor.")
                 return
 
             # Obtener recomendaciones base
-            recs = recommend_occupations(df_rec, selected_skills, top_n=top_n)
+            recs = recommend_by_descriptors(
+                descriptors, selections, top_n=top_n, domain_weights=domain_weights
+            )
 
             if recs.empty:
                 st.info("No se encontraron recomendaciones.")
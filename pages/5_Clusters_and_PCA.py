@@ -16,13 +16,15 @@ h1, h2, h3 {
 </style>
 """, unsafe_allow_html=True)
 
-from src.load_data import load_all_data
-from src.clustering import run_clustering, plot_clusters, plot_heatmap_clusters
-
-
-@st.cache_data
-def get_data():
-    return load_all_data()
+from src.data_access import get_data
+from src.clustering import (
+    get_clustering_engine,
+    run_clustering,
+    cluster_centroids,
+    clustering_metrics,
+    plot_clusters,
+    plot_heatmap_clusters,
+)
 
 
 def main():
@@ -32,17 +34,37 @@ def main():
 
     n_clusters = st.slider("Número de clusters", 3, 12, 6)
 
+    algorithm_names = {
+        "exact": "KMeans (exacto)",
+        "minibatch": "MiniBatch KMeans",
+        "streaming": "Streaming (partial_fit por bloques)",
+    }
+    algorithm = st.radio(
+        "Algoritmo",
+        list(algorithm_names),
+        format_func=algorithm_names.get,
+        horizontal=True,
+    )
+
     df_pivot, top_skills_per_cluster, cluster_summary = run_clustering(
-        df_rec, n_clusters=n_clusters
+        df_rec, n_clusters=n_clusters, algorithm=algorithm
     )
 
+    # Precalcular el resto de valores del slider en segundo plano
+    get_clustering_engine(df_rec, algorithm).precompute_async(range(3, 13))
+
+    metrics = clustering_metrics(df_rec, n_clusters, algorithm)
+    col_inertia, col_silhouette = st.columns(2)
+    col_inertia.metric("Inercia", f"{metrics['inertia']:,.0f}")
+    col_silhouette.metric("Silhouette", f"{metrics['silhouette']:.3f}")
+
     st.subheader("Visualización de clusters")
     fig_clusters = plot_clusters(df_pivot)
     st.plotly_chart(fig_clusters, use_container_width=True)
 
     st.subheader("Mapa de calor de habilidades por cluster")
-    fig_heatmap = plot_heatmap_clusters(top_skills_per_cluster)
-    st.pyplot(fig_heatmap)
+    fig_heatmap = plot_heatmap_clusters(cluster_centroids(df_rec, n_clusters, algorithm))
+    st.plotly_chart(fig_heatmap, use_container_width=True)
 
     st.subheader("Top skills por cluster")
     st.dataframe(cluster_summary)
@@ -0,0 +1,102 @@
+import functools
+import hashlib
+import threading
+import weakref
+
+import pandas as pd
+
+from .snapshot import CACHE_DIR
+
+
+ARTIFACTS_DIR = CACHE_DIR / "artifacts"
+
+
+def frame_digest(*frames: pd.DataFrame) -> str:
+    """
+    Hash del contenido de uno o varios DataFrames (columnas + valores).
+    Sirve como clave de versión para artefactos derivados en disco.
+    """
+    h = hashlib.sha256()
+    for df in frames:
+        h.update("\x1f".join(map(str, df.columns)).encode())
+        h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()[:16]
+
+
+def cache_by_frame(func):
+    """
+    Memoiza `func(df, *args)` por identidad del DataFrame `df`.
+
+    Los datos compartidos (ver `data_access.get_data`) son siempre el
+    mismo objeto, así que el resultado se calcula una vez por proceso.
+    Las entradas de cada frame se liberan juntas cuando el DataFrame deja
+    de existir.
+
+    Lo llaman a la vez los hilos de sesión de Streamlit y el de
+    `ClusteringEngine.precompute_async`, así que los accesos van bajo un
+    lock; el cálculo se hace fuera de él. El lock es reentrante porque la
+    liberación (`weakref.finalize`) puede dispararse dentro de una sección
+    protegida del mismo hilo.
+    """
+    cache = {}      # id(df) → {(args, kwargs) → resultado}
+    lock = threading.RLock()
+
+    @functools.wraps(func)
+    def wrapper(df, *args, **kwargs):
+        frame_id = id(df)
+        key = (args, tuple(sorted(kwargs.items())))
+        with lock:
+            entries = cache.get(frame_id)
+            if entries is not None and key in entries:
+                return entries[key]
+
+        result = func(df, *args, **kwargs)
+        with lock:
+            entries = cache.get(frame_id)
+            if entries is None:
+                entries = cache[frame_id] = {}
+                weakref.finalize(df, _evict, cache, lock, frame_id)
+            return entries.setdefault(key, result)
+
+    def cache_clear():
+        with lock:
+            cache.clear()
+
+    def cache_frames() -> int:
+        """Número de DataFrames con resultados en caché."""
+        with lock:
+            return len(cache)
+
+    wrapper.cache_clear = cache_clear
+    wrapper.cache_frames = cache_frames
+    return wrapper
+
+
+def _evict(cache: dict, lock, frame_id: int):
+    with lock:
+        cache.pop(frame_id, None)
+
+
+_FRAME_VERSIONS: dict[int, str] = {}
+_FRAME_VERSIONS_LOCK = threading.RLock()
+
+
+def set_frame_version(df: pd.DataFrame, *parts) -> pd.DataFrame:
+    """
+    Asigna a `df` una versión calculada por quien lo produce, p. ej. la
+    versión del frame padre más los parámetros del slice, para que las
+    cachés que dependen de `frame_version` no tengan que hashear su
+    contenido. Devuelve el propio `df`.
+    """
+    version = hashlib.sha256(repr(parts).encode()).hexdigest()[:16]
+    with _FRAME_VERSIONS_LOCK:
+        if id(df) not in _FRAME_VERSIONS:
+            weakref.finalize(df, _evict, _FRAME_VERSIONS, _FRAME_VERSIONS_LOCK, id(df))
+        _FRAME_VERSIONS[id(df)] = version
+    return df
+
+
+def known_frame_version(df: pd.DataFrame) -> str | None:
+    """Versión asignada con `set_frame_version`, o None."""
+    with _FRAME_VERSIONS_LOCK:
+        return _FRAME_VERSIONS.get(id(df))
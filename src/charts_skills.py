@@ -1,19 +1,30 @@
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 
+from .correlations import skill_salary_correlations
+from .figure_cache import cached_figure
+from .skill_matrix import get_skill_wage_matrix
 
+
+def _px():
+    """plotly.express, importado en el primer gráfico y no al importar el módulo."""
+    import plotly.express as px
+    return px
+
+
+@cached_figure
 def top_skills_bar(df_plot: pd.DataFrame, occupation: str, top_n: int):
+    matrix = get_skill_wage_matrix(df_plot)
     if occupation == "All":
-        df_filtered = df_plot.copy()
+        means = matrix.mean_importance()
         title_occ = "All occupations"
     else:
-        df_filtered = df_plot[df_plot["OCC_TITLE"] == occupation]
+        means = matrix.mean_importance(matrix.rows([occupation]))
         title_occ = occupation
 
     ranking = (
-        df_filtered.groupby("Skill_Name")["Importance"]
-        .mean()
+        means.rename_axis("Skill_Name")
+        .rename("Importance")
         .sort_values(ascending=False)
         .head(top_n)
         .reset_index()
@@ -22,7 +33,7 @@ def top_skills_bar(df_plot: pd.DataFrame, occupation: str, top_n: int):
     # Orden inverso para barra horizontal
     ranking = ranking.sort_values("Importance", ascending=True)
 
-    fig = px.bar(
+    fig = _px().bar(
         ranking,
         x="Importance",
         y="Skill_Name",
@@ -58,20 +69,22 @@ def top_skills_bar(df_plot: pd.DataFrame, occupation: str, top_n: int):
 
 
 def skills_salary_correlation(df_plot: pd.DataFrame):
-    corr_data = (
-        df_plot.groupby(["SOC", "Skill_Name"])
-        .agg(Importance=("Importance", "mean"), Salary=("A_MEAN", "mean"))
-        .reset_index()
+    return correlation_table(df_plot), correlation_bar(df_plot)
+
+
+def correlation_table(df_plot: pd.DataFrame) -> pd.DataFrame:
+    # Pearson + IC bootstrap 95 %, calculado una vez por dataset
+    df_corr = (
+        skill_salary_correlations(df_plot)[
+            ["Skill_Name", "Pearson", "Pearson_Low", "Pearson_High", "Spearman"]
+        ]
+        .rename(columns={
+            "Pearson": "Correlation",
+            "Pearson_Low": "CI_Low",
+            "Pearson_High": "CI_High",
+        })
     )
 
-    skill_corr = (
-        corr_data.groupby("Skill_Name")
-        .apply(lambda x: x["Importance"].corr(x["Salary"]))
-        .sort_values(ascending=False)
-    )
-
-    df_corr = skill_corr.reset_index().rename(columns={0: "Correlation"})
-
     skill_categories = {
         "Complex Problem Solving": "Cognitive",
         "Critical Thinking": "Cognitive",
@@ -99,8 +112,14 @@ def skills_salary_correlation(df_plot: pd.DataFrame):
     }
 
     df_corr["Category"] = df_corr["Skill_Name"].map(skill_categories).fillna("Other")
+    return df_corr
 
-    fig = px.bar(
+
+@cached_figure
+def correlation_bar(df_plot: pd.DataFrame):
+    df_corr = correlation_table(df_plot)
+
+    fig = _px().bar(
         df_corr,
         x="Correlation",
         y="Skill_Name",
@@ -113,6 +132,8 @@ def skills_salary_correlation(df_plot: pd.DataFrame):
             "Technical": "#d62728",
             "Other": "#7f7f7f",
         },
+        error_x=df_corr["CI_High"] - df_corr["Correlation"],
+        error_x_minus=df_corr["Correlation"] - df_corr["CI_Low"],
         title="Correlation Between Skill Importance and Salary",
         height=900,
     )
@@ -128,10 +149,7 @@ def skills_salary_correlation(df_plot: pd.DataFrame):
 
     fig.add_vline(x=0, line_width=2, line_dash="dash", line_color="black")
 
-    return df_corr, fig
-
-import plotly.graph_objects as go
-import pandas as pd
+    return fig
 
 # Convertir color HEX a rgba(r,g,b,a)
 def hex_to_rgba(hex_color, alpha=0.25):
@@ -142,39 +160,35 @@ def hex_to_rgba(hex_color, alpha=0.25):
     return f"rgba({r},{g},{b},{alpha})"
 
 
-def radar_chart(df_plot: pd.DataFrame, occupations: list[str], max_skills: int = 10):
-
-    # Colores fijos y contrastados (hex)
-    fixed_colors = ["#1f77b4", "#ff7f0e", "#2ca02c"]
-
-    # Skills más importantes del subconjunto
+def comparison_skills(df_plot: pd.DataFrame, occupations: list[str], max_skills: int) -> list[str]:
+    """Skills con mayor importancia media en el subconjunto de ocupaciones."""
+    matrix = get_skill_wage_matrix(df_plot)
     importance_means = (
-        df_plot[df_plot["OCC_TITLE"].isin(occupations)]
-        .groupby("Skill_Name")["Importance"]
-        .mean()
+        matrix.mean_importance(matrix.rows(occupations))
         .sort_values(ascending=False)
     )
+    return list(importance_means.head(max_skills).index)
+
 
-    skill_list = list(importance_means.head(max_skills).index)
+@cached_figure
+def radar_chart(df_plot: pd.DataFrame, occupations: list[str], max_skills: int = 10):
+    # Colores fijos y contrastados (hex): azul, naranja, verde…
+    fixed_colors = _px().colors.qualitative.D3
 
-    def get_profile_for_occ(occ):
-        df_occ = df_plot[df_plot["OCC_TITLE"] == occ]
-        avg = df_occ.groupby("Skill_Name")["Importance"].mean()
-        return [avg.get(skill, 0) for skill in skill_list]
+    skill_list = comparison_skills(df_plot, occupations, max_skills)
+    profiles = get_skill_wage_matrix(df_plot).profiles_for(occupations, skill_list)
 
     fig = go.Figure()
 
     # Añadir cada ocupación con color sólido + relleno rgba transparente
-    for idx, occ in enumerate(occupations):
-        values = get_profile_for_occ(occ)
-
-        base_hex = fixed_colors[idx % 3]               # Azul, naranja, verde
+    for idx, (occ, values) in enumerate(profiles.iterrows()):
+        base_hex = fixed_colors[idx % len(fixed_colors)]
         rgba_fill = hex_to_rgba(base_hex, 0.25)        # Relleno transparente
         rgba_line = hex_to_rgba(base_hex, 1.0)         # Línea color sólido
 
         fig.add_trace(
             go.Scatterpolar(
-                r=values,
+                r=values.tolist(),
                 theta=skill_list,
                 fill="toself",
                 name=occ,
@@ -192,13 +206,59 @@ def radar_chart(df_plot: pd.DataFrame, occupations: list[str], max_skills: int =
     return fig
 
 
+@cached_figure
+def profile_heatmap(df_plot: pd.DataFrame, occupations: list[str], max_skills: int = 10):
+    """Ocupación × skill como mapa de calor: legible con decenas de ocupaciones."""
+    skill_list = comparison_skills(df_plot, occupations, max_skills)
+    profiles = get_skill_wage_matrix(df_plot).profiles_for(occupations, skill_list)
+
+    fig = _px().imshow(
+        profiles,
+        color_continuous_scale="Viridis",
+        zmin=0,
+        zmax=5,
+        aspect="auto",
+        labels=dict(x="Skill", y="Ocupación", color="Importancia"),
+        height=max(500, 28 * len(profiles) + 200),
+    )
+    fig.update_xaxes(tickangle=-45)
+    return fig
 
+
+@cached_figure
+def profile_parallel_coordinates(df_plot: pd.DataFrame, occupations: list[str], max_skills: int = 10):
+    """Una línea por ocupación y un eje por skill, coloreada por salario medio."""
+    matrix = get_skill_wage_matrix(df_plot)
+    skill_list = comparison_skills(df_plot, occupations, max_skills)
+    profiles = matrix.profiles_for(occupations, skill_list)
+
+    wages = pd.Series(matrix.wages).groupby(matrix.titles).mean()
+    profiles["A_MEAN"] = wages.reindex(profiles.index).to_numpy()
+
+    fig = go.Figure(
+        go.Parcoords(
+            line=dict(
+                color=profiles["A_MEAN"],
+                colorscale="Viridis",
+                showscale=True,
+                colorbar=dict(title="Salario medio"),
+            ),
+            dimensions=[
+                dict(label=skill, values=profiles[skill], range=[0, 5])
+                for skill in skill_list
+            ],
+        )
+    )
+    fig.update_layout(height=600, margin=dict(l=80, r=80, t=80, b=40))
+    return fig
+
+
+@cached_figure
 def ai_exposure_by_group(df_occ_level, top_n=10):
     """
     Crea un bar chart horizontal mostrando exposición a IA (dv_rating_gamma)
     por familias ocupacionales O*NET (primeros 2 dígitos del SOC).
     """
-
     group_names = {
         "11": "Management",
         "13": "Business & Financial Operations",
@@ -241,7 +301,7 @@ def ai_exposure_by_group(df_occ_level, top_n=10):
 
     df_top = df_grouped.head(top_n)
 
-    fig = px.bar(
+    fig = _px().bar(
         df_top,
         x="dv_rating_gamma",
         y="Group_Name",
@@ -1,15 +1,34 @@
+import numpy as np
 import pandas as pd
-import plotly.express as px
+
+from .figure_cache import cached_figure
+from .wage_store import get_wage_store
+
+
+def _px():
+    """plotly.express, importado en el primer gráfico y no al importar el módulo."""
+    import plotly.express as px
+    return px
+
+
+def occupation_rows(df: pd.DataFrame, occupation: str) -> pd.DataFrame:
+    """
+    Filas de `occupation` ordenadas por A_MEDIAN descendente.
+    Slice O(1) sobre el índice precalculado (ver `WageStore`), sin copia:
+    no modificar el resultado in situ.
+    """
+    return get_wage_store(df).block(occupation)
 
 
 # ============================================================
 #   MAPA SALARIAL — INTERACTIVO, AMPLIADO Y RESPONSIVO
 # ============================================================
 
+@cached_figure
 def choropleth_wage_map(df: pd.DataFrame, occupation: str):
-    df_occ = df[df["OCC_TITLE"] == occupation].copy()
+    df_occ = occupation_rows(df, occupation)
 
-    fig = px.choropleth(
+    fig = _px().choropleth(
         df_occ,
         locations="STATE_ABBR",
         locationmode="USA-states",
@@ -29,7 +48,7 @@ def choropleth_wage_map(df: pd.DataFrame, occupation: str):
                       "Índice de concentración (LQ): %{customdata[1]:.2f}<br>"
                       "<extra></extra>",
         hovertext=df_occ["AREA_TITLE"],
-        customdata=df_occ[["TOT_EMP", "LOC_QUOTIENT"]].values,
+        customdata=df_occ[["TOT_EMP", "LOC_QUOTIENT"]].to_numpy(dtype=float, na_value=np.nan),
     )
 
     fig.update_layout(
@@ -46,12 +65,11 @@ def choropleth_wage_map(df: pd.DataFrame, occupation: str):
 #   TOP N ESTADOS — BARRAS RESPONSIVAS
 # ============================================================
 
+@cached_figure
 def top_n_states_bar(df: pd.DataFrame, occupation: str, top_n: int):
-    df_occ = df[df["OCC_TITLE"] == occupation].copy()
-    df_occ = df_occ.sort_values("A_MEDIAN", ascending=False)
-    df_top = df_occ.head(int(top_n))
+    df_top = occupation_rows(df, occupation).head(int(top_n))
 
-    fig = px.bar(
+    fig = _px().bar(
         df_top,
         x="STATE_ABBR",
         y="A_MEDIAN",
@@ -82,28 +100,32 @@ def top_n_states_bar(df: pd.DataFrame, occupation: str, top_n: int):
 #   SCATTER EMPLEO vs SALARIO — RESPONSIVO
 # ============================================================
 
+@cached_figure
 def employment_vs_wage_scatter(df: pd.DataFrame, occupation: str, xscale: str = "linear"):
-    df_occ = df[df["OCC_TITLE"] == occupation].copy()
+    df_occ = occupation_rows(df, occupation)
     df_occ = df_occ.dropna(subset=["TOT_EMP", "A_MEDIAN", "LOC_QUOTIENT"])
 
-    fig = px.scatter(
+    fig = _px().scatter(
         df_occ,
         x="TOT_EMP",
         y="A_MEDIAN",
         color="LOC_QUOTIENT",
         size="LOC_QUOTIENT",
         hover_name="AREA_TITLE",
+        # Formatos d3: LOC_QUOTIENT es float32 y sin formato el hover
+        # mostraría 0.8999999761581421 en lugar de 0.90.
         hover_data={
-            "TOT_EMP": "Empleo total",
-            "A_MEDIAN": "Salario anual mediano ($)",
-            "LOC_QUOTIENT": "Índice de concentración (LQ)",
-            "STATE_ABBR": "Estado",
+            "TOT_EMP": ":,.0f",
+            "A_MEDIAN": ":,.0f",
+            "LOC_QUOTIENT": ":.2f",
+            "STATE_ABBR": True,
         },
         color_continuous_scale="Viridis",
         labels={
             "TOT_EMP": "Empleo total",
             "A_MEDIAN": "Salario anual mediano ($)",
             "LOC_QUOTIENT": "Índice de concentración (LQ)",
+            "STATE_ABBR": "Estado",
         },
         title=f"Relación entre empleo y salario — {occupation}",
     )
@@ -123,13 +145,13 @@ def employment_vs_wage_scatter(df: pd.DataFrame, occupation: str, xscale: str =
 #   HEATMAP TOP ESTADOS — RESPONSIVO
 # ============================================================
 
+@cached_figure
 def heatmap_top_states(df: pd.DataFrame, occupation: str, top_n: int = 5):
-    df_occ = df[df["OCC_TITLE"] == occupation].copy()
-    df_sorted = df_occ.sort_values("A_MEDIAN", ascending=False).head(top_n)
+    df_sorted = occupation_rows(df, occupation).head(top_n)
 
     mat = df_sorted[["STATE_ABBR", "A_MEDIAN"]].set_index("STATE_ABBR")
 
-    fig = px.imshow(
+    fig = _px().imshow(
         mat,
         labels=dict(color="Salario anual medio ($)"),
         color_continuous_scale="Viridis",
@@ -146,3 +168,76 @@ def heatmap_top_states(df: pd.DataFrame, occupation: str, top_n: int = 5):
     )
 
     return fig
+
+
+# ============================================================
+#   TENDENCIAS — SERIES ANUALES Y CRECIMIENTO (CAGR)
+# ============================================================
+
+@cached_figure
+def wage_trend_lines(df_series: pd.DataFrame, occupation: str, states: list[str]):
+    """Salario mediano por año de `occupation` en los estados elegidos."""
+    df_sel = df_series[df_series["STATE_ABBR"].isin(states)]
+
+    fig = _px().line(
+        df_sel,
+        x="YEAR",
+        y="A_MEDIAN",
+        color="STATE_ABBR",
+        markers=True,
+        hover_name="AREA_TITLE",
+        hover_data={"A_MEDIAN_YOY": ":.1%", "TOT_EMP": ":,.0f"},
+        labels={
+            "YEAR": "Año",
+            "A_MEDIAN": "Salario anual mediano ($)",
+            "STATE_ABBR": "Estado",
+            "A_MEDIAN_YOY": "Variación interanual",
+            "TOT_EMP": "Empleo total",
+        },
+        title=f"Evolución del salario mediano — {occupation}",
+    )
+
+    fig.update_xaxes(dtick=1)
+
+    fig.update_layout(
+        height=550,
+        margin=dict(l=20, r=20, t=80, b=40),
+        title_font=dict(size=26),
+    )
+
+    return fig
+
+
+@cached_figure
+def wage_growth_bar(df_growth: pd.DataFrame, occupation: str, top_n: int):
+    """Top N estados por CAGR del salario mediano."""
+    df_top = df_growth.dropna(subset=["A_MEDIAN_CAGR"]).head(int(top_n))
+
+    fig = _px().bar(
+        df_top,
+        x="STATE_ABBR",
+        y="A_MEDIAN_CAGR",
+        color="A_MEDIAN_CAGR",
+        color_continuous_scale="Teal",
+        hover_name="AREA_TITLE",
+        hover_data={"YEAR_START": True, "YEAR_END": True, "TOT_EMP_CAGR": ":.1%"},
+        labels={
+            "STATE_ABBR": "Estado",
+            "A_MEDIAN_CAGR": "CAGR salario mediano",
+            "YEAR_START": "Desde",
+            "YEAR_END": "Hasta",
+            "TOT_EMP_CAGR": "CAGR empleo",
+        },
+        title=f"Top {top_n} estados por crecimiento salarial — {occupation}",
+    )
+
+    fig.update_yaxes(tickformat=".1%")
+
+    fig.update_layout(
+        height=550,
+        margin=dict(l=20, r=20, t=80, b=40),
+        coloraxis_showscale=False,
+        title_font=dict(size=26),
+    )
+
+    return fig
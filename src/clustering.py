@@ -1,128 +1,479 @@
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
-import plotly.express as px
-import seaborn as sns
-import matplotlib.pyplot as plt
+import plotly.graph_objects as go
+
+from .artifacts import cache_by_frame
+from .figure_cache import cached_figure
+from .encoding import ids
+
+
+def _px():
+    """plotly.express, importado en el primer gráfico y no al importar el módulo."""
+    import plotly.express as px
+    return px
+
+
+# Nombres explicativos para cada cluster
+# (basados en los skills dominantes del CSV exportado)
+# OJO: estos índices (0–5) son los que devuelve KMeans con k=6
+# y los usamos tal cual para etiquetar.
+DEFAULT_CLUSTER_NAMES = {
+    0: "Grupo 1 – Habilidades cognitivas y de comunicación avanzadas",
+    1: "Grupo 2 – Operaciones, control y supervisión de procesos",
+    2: "Grupo 3 – Comunicación, comprensión y aprendizaje continuo",
+    3: "Grupo 4 – Servicio, trato con personas y coordinación",
+    4: "Grupo 5 – Análisis y resolución de problemas complejos",
+    5: "Grupo 6 – Operaciones técnicas, calidad y mantenimiento",
+}
 
 
 # ============================================================
-#   FUNCIÓN PRINCIPAL DE CLUSTERING
+#   MOTOR DE CLUSTERING (pivot/escalado/PCA una sola vez)
 # ============================================================
 
-def run_clustering(df_rec: pd.DataFrame, n_clusters: int = 6):
+CLUSTERING_ALGORITHMS = ("exact", "minibatch", "streaming")
+
+
+class ClusterFit(NamedTuple):
+    centers: np.ndarray     # (k, n_skills) en el espacio escalado
+    labels: np.ndarray      # (n_occ,)
+
+
+class ClusteringEngine:
     """
-    df_rec debe contener columnas:
-        ['SOC', 'Skill', 'Importance', 'Title']
+    Precalcula todo lo que no depende de `n_clusters` (pivot, escalado,
+    proyección PCA 2D y perfiles SOC × skill) y memoiza los KMeans por k
+    en una caché LRU.
 
-    Devuelve:
-        - df_pivot: matriz SOC × skills con:
-            * SOC
-            * Title
-            * Cluster (número)
-            * Cluster_Label (nombre explicativo)
-            * PC1, PC2 (coordenadas PCA)
-        - top_skills_per_cluster: importancia media de skills por cluster
-        - cluster_summary: top 10 skills por cluster
+    Solo k = ANCHOR_K se ajusta en frío (random_state=42, como siempre,
+    para conservar las etiquetas de DEFAULT_CLUSTER_NAMES). El resto se
+    inicializa a partir de la solución vecina en la cadena hacia ANCHOR_K:
+    - k > ANCHOR_K: centroides de k-1 + el punto peor representado
+    - k < ANCHOR_K: centroides de k+1 fusionando el par más cercano
+    Así el resultado de cada k es determinista, sin importar el orden
+    en que se pidan.
+
+    Algoritmos (`algorithm`):
+    - "exact": KMeans sobre la matriz densa completa
+    - "minibatch": MiniBatchKMeans sobre la matriz densa
+    - "streaming": nunca materializa la matriz SOC × skill completa; el
+      pivot se construye por bloques de `chunk_size` ocupaciones y
+      escalado, PCA (IncrementalPCA) y MiniBatchKMeans se ajustan con
+      `partial_fit`. `df_pivot` solo trae SOC, Title, Cluster y PC1/PC2.
     """
 
-    # ---------------------------------------
-    # 1. Pivot ocupaciones × habilidades
-    # ---------------------------------------
-    df_pivot = (
-        df_rec.pivot_table(
-            index=["SOC", "Title"],
-            columns="Skill",
-            values="Importance",
-            aggfunc="mean",
+    ANCHOR_K = 6
+
+    def __init__(
+        self,
+        df_rec: pd.DataFrame,
+        algorithm: str = "exact",
+        random_state: int = 42,
+        max_cached: int = 16,
+        batch_size: int = 1024,
+        chunk_size: int = 2048,
+        n_epochs: int = 5,
+    ):
+        if algorithm not in CLUSTERING_ALGORITHMS:
+            raise ValueError(
+                f"Algoritmo desconocido: {algorithm!r} (opciones: {CLUSTERING_ALGORITHMS})"
+            )
+        self.algorithm = algorithm
+        self.random_state = random_state
+        self.max_cached = max_cached
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.n_epochs = n_epochs
+
+        if algorithm == "streaming":
+            self._init_streaming(df_rec)
+        else:
+            self._init_dense(df_rec)
+
+        # Perfiles medios SOC × skill para los resúmenes por cluster
+        self.profiles = (
+            df_rec.groupby(["SOC", "Title", "Skill"], observed=True)["Importance"]
+            .mean()
+            .reset_index()
         )
-        .fillna(0)
-    )
 
-    # ---------------------------------------
-    # 2. Normalización
-    # ---------------------------------------
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(df_pivot)
+        self._fits = OrderedDict()
+        self._results = OrderedDict()
+        self._centroids = OrderedDict()
+        self._metrics = OrderedDict()
+        self._lock = threading.RLock()
+        self._precompute_thread = None
 
     # ---------------------------------------
-    # 3. KMeans clustering
+    # Preparación de la matriz (densa o por bloques)
     # ---------------------------------------
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-    clusters = kmeans.fit_predict(X_scaled)
-    df_pivot["Cluster"] = clusters
+    def _init_dense(self, df_rec: pd.DataFrame):
+        from sklearn.decomposition import PCA
+        from sklearn.preprocessing import StandardScaler
+
+        # 1. Pivot ocupaciones × habilidades
+        self.pivot = (
+            df_rec.pivot_table(
+                index=["SOC", "Title"],
+                columns="Skill",
+                values="Importance",
+                aggfunc="mean",
+                observed=True,
+            )
+            .fillna(0)
+        )
+        self.index = self.pivot.index
+
+        # 2. Normalización
+        self.scaler = StandardScaler()
+        self.X_scaled = self.scaler.fit_transform(self.pivot)
+
+        # 3. PCA para visualización 2D (no depende de k)
+        self.coords = PCA(n_components=2).fit_transform(self.X_scaled)
+
+    def _init_streaming(self, df_rec: pd.DataFrame):
+        from sklearn.decomposition import IncrementalPCA
+        from sklearn.preprocessing import StandardScaler
+
+        self.pivot = None
+        self.X_scaled = None
+
+        # Filas ordenadas por SOC: cada bloque es un rango contiguo
+        self._long = df_rec[["SOC", "Title", "Skill", "Importance"]].sort_values(
+            "SOC", kind="stable"
+        )
+        socs = ids(self._long["SOC"])
+        starts = np.flatnonzero(np.r_[True, socs[1:] != socs[:-1]])
+        bounds = np.r_[starts, len(socs)]
+        n_chunks = max(1, int(np.ceil(len(starts) / self.chunk_size)))
+        self._chunk_bounds = [
+            (bounds[g[0]], bounds[g[-1] + 1])
+            for g in np.array_split(np.arange(len(starts)), n_chunks)
+            if len(g)
+        ]
+        self.columns = sorted(self._long["Skill"].unique())
+
+        # Pasada 1: índice + escalado
+        self.scaler = StandardScaler()
+        index_parts = []
+        for chunk in self._raw_chunks():
+            index_parts.append(chunk.index)
+            self.scaler.partial_fit(chunk.to_numpy())
+        self.index = index_parts[0].append(index_parts[1:])
+
+        # Pasada 2: PCA incremental; pasada 3: proyección
+        pca = IncrementalPCA(n_components=2)
+        for X in self._chunks():
+            pca.partial_fit(X)
+        self.coords = np.vstack([pca.transform(X) for X in self._chunks()])
+
+    def _raw_chunks(self):
+        for lo, hi in self._chunk_bounds:
+            yield (
+                self._long.iloc[lo:hi]
+                .pivot_table(
+                    index=["SOC", "Title"],
+                    columns="Skill",
+                    values="Importance",
+                    aggfunc="mean",
+                    observed=True,
+                )
+                .reindex(columns=self.columns)
+                .fillna(0)
+            )
+
+    def _chunks(self):
+        """Bloques de filas ya escaladas, en el orden de `self.index`."""
+        if self.X_scaled is not None:
+            yield self.X_scaled
+            return
+        for chunk in self._raw_chunks():
+            yield self.scaler.transform(chunk.to_numpy())
 
     # ---------------------------------------
-    # 4. PCA para visualización 2D
+    # KMeans por k (memoizado + warm start)
     # ---------------------------------------
-    pca = PCA(n_components=2)
-    coords = pca.fit_transform(X_scaled)
-    df_pivot["PC1"] = coords[:, 0]
-    df_pivot["PC2"] = coords[:, 1]
+    def _remember(self, cache: OrderedDict, k: int, value):
+        cache[k] = value
+        cache.move_to_end(k)
+        while len(cache) > self.max_cached:
+            cache.popitem(last=False)
+
+    def fit(self, k: int) -> ClusterFit:
+        with self._lock:
+            if k in self._fits:
+                self._fits.move_to_end(k)
+                return self._fits[k]
+
+            init = self._warm_start(k)
+            if self.algorithm == "exact":
+                result = self._fit_exact(k, init)
+            elif self.algorithm == "minibatch":
+                result = self._fit_minibatch(k, init)
+            else:
+                result = self._fit_streaming(k, init)
+
+            self._remember(self._fits, k, result)
+            return result
+
+    def _fit_exact(self, k: int, init) -> ClusterFit:
+        from sklearn.cluster import KMeans
+
+        if init is None:
+            kmeans = KMeans(n_clusters=k, random_state=self.random_state)
+        else:
+            kmeans = KMeans(
+                n_clusters=k, init=init, n_init=1,
+                random_state=self.random_state,
+            )
+        kmeans.fit(self.X_scaled)
+        return ClusterFit(kmeans.cluster_centers_, kmeans.labels_)
+
+    def _fit_minibatch(self, k: int, init) -> ClusterFit:
+        from sklearn.cluster import MiniBatchKMeans
+
+        kmeans = MiniBatchKMeans(
+            n_clusters=k,
+            init="k-means++" if init is None else init,
+            n_init=3 if init is None else 1,
+            batch_size=self.batch_size,
+            random_state=self.random_state,
+        )
+        kmeans.fit(self.X_scaled)
+        return ClusterFit(kmeans.cluster_centers_, kmeans.labels_)
+
+    def _fit_streaming(self, k: int, init) -> ClusterFit:
+        from sklearn.cluster import MiniBatchKMeans
+
+        kmeans = MiniBatchKMeans(
+            n_clusters=k,
+            init="k-means++" if init is None else init,
+            n_init=1,
+            batch_size=self.batch_size,
+            random_state=self.random_state,
+        )
+        for _ in range(self.n_epochs):
+            for X in self._chunks():
+                kmeans.partial_fit(X)
+        labels = np.concatenate([kmeans.predict(X) for X in self._chunks()])
+        return ClusterFit(kmeans.cluster_centers_, labels)
+
+    def _warm_start(self, k: int):
+        if k == self.ANCHOR_K or not 1 < k < len(self.index):
+            return None
 
-    df_pivot.reset_index(inplace=True)
+        if k > self.ANCHOR_K:
+            prev = self.fit(k - 1)
+            # Nuevo centroide: el punto más alejado de su centroide actual
+            best_dist, best_row, offset = -1.0, None, 0
+            for X in self._chunks():
+                labels = prev.labels[offset:offset + len(X)]
+                dist = np.linalg.norm(X - prev.centers[labels], axis=1)
+                i = int(np.argmax(dist))
+                if dist[i] > best_dist:
+                    best_dist, best_row = dist[i], X[i]
+                offset += len(X)
+            return np.vstack([prev.centers, best_row])
+
+        prev = self.fit(k + 1)
+        centers = prev.centers
+        sizes = np.bincount(prev.labels, minlength=len(centers)).astype(float)
+        # Fusionar el par de centroides más cercano (media ponderada)
+        d = np.linalg.norm(centers[:, None] - centers[None, :], axis=2)
+        np.fill_diagonal(d, np.inf)
+        i, j = np.unravel_index(np.argmin(d), d.shape)
+        w = sizes[[i, j]] / max(sizes[[i, j]].sum(), 1.0)
+        merged = w[0] * centers[i] + w[1] * centers[j]
+        keep = [c for c in range(len(centers)) if c not in (i, j)]
+        return np.vstack([centers[keep], merged])
 
     # ---------------------------------------
-    # 5. Nombres explicativos para cada cluster
-    #    (basados en los skills dominantes del CSV exportado)
+    # Calidad del clustering
     # ---------------------------------------
-    # OJO: estos índices (0–5) son los que devuelve KMeans
-    # y los usamos tal cual para etiquetar.
-    default_names = {
-        0: "Grupo 1 – Habilidades cognitivas y de comunicación avanzadas",
-        1: "Grupo 2 – Operaciones, control y supervisión de procesos",
-        2: "Grupo 3 – Comunicación, comprensión y aprendizaje continuo",
-        3: "Grupo 4 – Servicio, trato con personas y coordinación",
-        4: "Grupo 5 – Análisis y resolución de problemas complejos",
-        5: "Grupo 6 – Operaciones técnicas, calidad y mantenimiento",
-    }
-
-    # Si cambia el número de clusters, rellenamos con nombres genéricos
-    cluster_labels = {
-        c: default_names.get(c, f"Grupo {c+1}") 
-        for c in sorted(df_pivot["Cluster"].unique())
-    }
-
-    df_pivot["Cluster_Label"] = df_pivot["Cluster"].map(cluster_labels)
+    def metrics(self, k: int, silhouette_sample: int = 5000) -> dict:
+        """
+        Inercia (suma de distancias al cuadrado a su centroide, sobre
+        todas las ocupaciones) y silhouette sobre una muestra de filas.
+        Se memoiza por (k, silhouette_sample) como los resultados.
+        """
+        with self._lock:
+            key = (k, silhouette_sample)
+            if key not in self._metrics:
+                self._remember(self._metrics, key, self._compute_metrics(k, silhouette_sample))
+            self._metrics.move_to_end(key)
+            return dict(self._metrics[key])
+
+    def _compute_metrics(self, k: int, silhouette_sample: int) -> dict:
+        from sklearn.metrics import silhouette_score
+
+        fit = self.fit(k)
+        rng = np.random.default_rng(self.random_state)
+        n = len(fit.labels)
+        sample = np.sort(rng.choice(n, size=min(n, silhouette_sample), replace=False))
+
+        inertia, offset, rows = 0.0, 0, []
+        for X in self._chunks():
+            labels = fit.labels[offset:offset + len(X)]
+            inertia += float(((X - fit.centers[labels]) ** 2).sum())
+            in_chunk = sample[(sample >= offset) & (sample < offset + len(X))]
+            rows.append(X[in_chunk - offset])
+            offset += len(X)
+
+        sample_labels = fit.labels[sample]
+        silhouette = (
+            float(silhouette_score(np.vstack(rows), sample_labels))
+            if 1 < len(np.unique(sample_labels)) < len(sample)
+            else float("nan")
+        )
+        return {"algorithm": self.algorithm, "k": k, "inertia": inertia, "silhouette": silhouette}
 
     # ---------------------------------------
-    # 6. Perfiles de skills por cluster
+    # Resultados listos para la página
     # ---------------------------------------
-    cluster_profiles = (
-        df_rec.groupby(["SOC", "Title", "Skill"])["Importance"].mean().reset_index()
-        .merge(df_pivot[["SOC", "Cluster"]], on="SOC")
-    )
+    def run(self, n_clusters: int):
+        with self._lock:
+            if n_clusters in self._results:
+                self._results.move_to_end(n_clusters)
+                return self._results[n_clusters]
 
-    top_skills_per_cluster = (
-        cluster_profiles.groupby(["Cluster", "Skill"])["Importance"]
-        .mean()
-        .reset_index()
-        .sort_values(["Cluster", "Importance"], ascending=[True, False])
-    )
+            result = self._build_result(self.fit(n_clusters))
+            self._remember(self._results, n_clusters, result)
+            return result
 
-    # Top K skills por cluster
-    topk = 10
-    cluster_summary = (
-        top_skills_per_cluster.groupby("Cluster")
-        .head(topk)
-        .reset_index(drop=True)
-    )
+    def _build_result(self, fit: ClusterFit):
+        if self.pivot is not None:
+            df_pivot = self.pivot.copy()
+        else:
+            df_pivot = pd.DataFrame(index=self.index)
+        df_pivot["Cluster"] = fit.labels
+        df_pivot["PC1"] = self.coords[:, 0]
+        df_pivot["PC2"] = self.coords[:, 1]
+        df_pivot.reset_index(inplace=True)
+
+        # Si cambia el número de clusters, rellenamos con nombres genéricos
+        cluster_labels = {
+            c: DEFAULT_CLUSTER_NAMES.get(c, f"Grupo {c+1}")
+            for c in sorted(df_pivot["Cluster"].unique())
+        }
+        df_pivot["Cluster_Label"] = df_pivot["Cluster"].map(cluster_labels)
+
+        # Perfiles de skills por cluster
+        cluster_profiles = self.profiles.merge(df_pivot[["SOC", "Cluster"]], on="SOC")
+
+        top_skills_per_cluster = (
+            cluster_profiles.groupby(["Cluster", "Skill"], observed=True)["Importance"]
+            .mean()
+            .reset_index()
+            .sort_values(["Cluster", "Importance"], ascending=[True, False])
+        )
+
+        # Top K skills por cluster
+        topk = 10
+        cluster_summary = (
+            top_skills_per_cluster.groupby("Cluster")
+            .head(topk)
+            .reset_index(drop=True)
+        )
+
+        return df_pivot, top_skills_per_cluster, cluster_summary
+
+    def centroids(self, n_clusters: int) -> pd.DataFrame:
+        """
+        Matriz Cluster × Skill: los centroides de KMeans devueltos a la
+        escala original (importancia media de cada skill en el cluster).
+        Es de tamaño k × n_skills y no necesita recorrer las ocupaciones.
+        """
+        with self._lock:
+            if n_clusters in self._centroids:
+                self._centroids.move_to_end(n_clusters)
+                return self._centroids[n_clusters]
+
+            fit = self.fit(n_clusters)
+            columns = self.pivot.columns if self.pivot is not None else self.columns
+            result = pd.DataFrame(
+                self.scaler.inverse_transform(fit.centers),
+                index=pd.RangeIndex(len(fit.centers), name="Cluster"),
+                columns=pd.Index(list(columns), name="Skill"),
+            )
+            self._remember(self._centroids, n_clusters, result)
+            return result
+
+    def precompute_async(self, ks=range(3, 13)):
+        """
+        Calcula en segundo plano los resultados para `ks` (una sola vez
+        por motor), para que mover el slider sea instantáneo.
+        """
+        with self._lock:
+            if self._precompute_thread is not None:
+                return self._precompute_thread
+
+            def work():
+                for k in ks:
+                    self.run(k)
+
+            self._precompute_thread = threading.Thread(
+                target=work, name="clustering-precompute", daemon=True
+            )
+            self._precompute_thread.start()
+            return self._precompute_thread
+
+
+@cache_by_frame
+def get_clustering_engine(df_rec: pd.DataFrame, algorithm: str = "exact") -> ClusteringEngine:
+    return ClusteringEngine(df_rec, algorithm=algorithm)
+
+
+# ============================================================
+#   FUNCIÓN PRINCIPAL DE CLUSTERING
+# ============================================================
 
-    return df_pivot, top_skills_per_cluster, cluster_summary
+def run_clustering(df_rec: pd.DataFrame, n_clusters: int = 6, algorithm: str = "exact"):
+    """
+    df_rec debe contener columnas:
+        ['SOC', 'Skill', 'Importance', 'Title']
+
+    Devuelve:
+        - df_pivot: matriz SOC × skills con:
+            * SOC
+            * Title
+            * Cluster (número)
+            * Cluster_Label (nombre explicativo)
+            * PC1, PC2 (coordenadas PCA)
+        - top_skills_per_cluster: importancia media de skills por cluster
+        - cluster_summary: top 10 skills por cluster
+
+    `algorithm`: "exact" (KMeans), "minibatch" o "streaming"
+    (ver `ClusteringEngine`). Los resultados se memoizan por `df_rec`,
+    `algorithm` y `n_clusters`; no deben modificarse in situ.
+    """
+    return get_clustering_engine(df_rec, algorithm).run(n_clusters)
+
+
+def cluster_centroids(df_rec: pd.DataFrame, n_clusters: int = 6, algorithm: str = "exact") -> pd.DataFrame:
+    """Centroides Cluster × Skill en escala de importancia (ver `ClusteringEngine.centroids`)."""
+    return get_clustering_engine(df_rec, algorithm).centroids(n_clusters)
+
+
+def clustering_metrics(df_rec: pd.DataFrame, n_clusters: int = 6, algorithm: str = "exact") -> dict:
+    """Inercia y silhouette del clustering con `n_clusters` y `algorithm`."""
+    return get_clustering_engine(df_rec, algorithm).metrics(n_clusters)
 
 
 # ============================================================
 #   VISUALIZACIÓN PCA + CLUSTERS
 # ============================================================
 
+@cached_figure
 def plot_clusters(df_pivot: pd.DataFrame):
     """
     Visualiza las ocupaciones proyectadas en 2D (PCA),
     coloreadas según el grupo de habilidades.
     """
-
-    fig = px.scatter(
+    fig = _px().scatter(
         df_pivot,
         x="PC1",
         y="PC2",
@@ -148,35 +499,30 @@ def plot_clusters(df_pivot: pd.DataFrame):
 
     return fig
 
-def plot_heatmap_clusters(top_skills_per_cluster: pd.DataFrame):
+@cached_figure
+def plot_heatmap_clusters(centroids: pd.DataFrame):
     """
-    Devuelve un heatmap profesional Cluster × Skill usando seaborn.
+    Heatmap interactivo Cluster × Skill a partir de los centroides
+    (ver `cluster_centroids`).
     """
-
-    heatmap_df = (
-        top_skills_per_cluster
-        .pivot_table(
-            index="Cluster",
-            columns="Skill",
-            values="Importance"
+    fig = go.Figure(
+        go.Heatmap(
+            z=centroids.to_numpy(),
+            x=list(centroids.columns),
+            y=[str(c) for c in centroids.index],
+            colorscale="Viridis",
+            xgap=1,
+            ygap=1,
+            colorbar=dict(title="Importancia"),
+            hovertemplate="Cluster %{y}<br>%{x}: %{z:.2f}<extra></extra>",
         )
-        .fillna(0)
     )
 
-    # Crear figura correctamente
-    fig, ax = plt.subplots(figsize=(20, 8))
-
-    sns.heatmap(
-        heatmap_df,
-        cmap="viridis",
-        linewidths=0.3,
-        linecolor="gray",
-        ax=ax
+    fig.update_layout(
+        height=max(400, 45 * len(centroids) + 250),
+        margin=dict(l=20, r=20, t=40, b=40),
+        xaxis=dict(title="Habilidad", tickangle=-45),
+        yaxis=dict(title="Cluster", autorange="reversed"),
     )
 
-    ax.set_xlabel("Habilidad")
-    ax.set_ylabel("Cluster")
-
-    fig.tight_layout()
-
-    return fig    
+    return fig
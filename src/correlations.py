@@ -0,0 +1,175 @@
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import ARTIFACTS_DIR, cache_by_frame, frame_digest
+from .skill_matrix import get_skill_wage_matrix
+from .snapshot import read_frame, write_frame
+
+
+CORRELATIONS_DIR = ARTIFACTS_DIR / "correlations"
+
+
+# ============================================================
+#   MATRIZ SOC × SKILL + VECTOR DE SALARIOS
+# ============================================================
+
+def skill_wage_arrays(df_plot: pd.DataFrame):
+    """
+    Arrays de `skill_matrix.SkillWageMatrix` (df_plot pivotado una vez):
+    - X: (n_soc, n_skills) importancia media, NaN si la skill no aplica
+    - y: (n_soc,) salario medio anual por SOC
+    - skills: nombres de columna de X
+    """
+    matrix = get_skill_wage_matrix(df_plot)
+    return matrix.importance, matrix.wages, matrix.skills
+
+
+# ============================================================
+#   CORRELACIONES VECTORIZADAS (con borrado por pares de NaN)
+# ============================================================
+
+def masked_pearson(X: np.ndarray, Y: np.ndarray) -> np.ndarray:
+    """
+    Pearson columna a columna entre X e Y de forma (..., n, S), usando
+    en cada columna solo las filas sin NaN en ambos (como Series.corr).
+    Las dimensiones iniciales permiten evaluar muchos remuestreos a la vez;
+    Y puede tener una sola columna (se difunde sobre las S de X). Calcula
+    en el dtype de X y reutiliza los buffers para no crear temporales de
+    tamaño (..., n, S) más allá de dx y dy.
+    """
+    mask = ~(np.isnan(X) | np.isnan(Y))
+    n = mask.sum(axis=-2)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dx = np.where(mask, X, X.dtype.type(0))
+        dy = np.where(mask, Y, X.dtype.type(0))
+        mx = np.where(n > 0, dx.sum(axis=-2) / n, 0).astype(X.dtype, copy=False)
+        my = np.where(n > 0, dy.sum(axis=-2) / n, 0).astype(X.dtype, copy=False)
+        dx -= mx[..., None, :]
+        dx *= mask
+        dy -= my[..., None, :]
+        dy *= mask
+        cov = np.einsum("...ij,...ij->...j", dx, dy)
+        r = cov / np.sqrt(np.einsum("...ij,...ij->...j", dx, dx) * np.einsum("...ij,...ij->...j", dy, dy))
+
+    return np.where(n >= 2, r, np.nan)
+
+
+def masked_spearman(X: np.ndarray, Y: np.ndarray) -> np.ndarray:
+    """Spearman = Pearson sobre rangos calculados en las filas comunes."""
+    from scipy.stats import rankdata
+
+    mask = ~(np.isnan(X) | np.isnan(Y))
+    Xr = rankdata(np.where(mask, X, np.nan), axis=-2, nan_policy="omit")
+    Yr = rankdata(np.where(mask, Y, np.nan), axis=-2, nan_policy="omit")
+    # Los rangos (enteros o medios) son exactos también en float32
+    return masked_pearson(Xr.astype(X.dtype, copy=False), Yr.astype(X.dtype, copy=False))
+
+
+CORRELATION_METHODS = {
+    "pearson": masked_pearson,
+    "spearman": masked_spearman,
+}
+
+
+# Memoria de trabajo de un lote de remuestreos (variable de entorno
+# BOOTSTRAP_MEMORY_MB) y pico medido con tracemalloc, en arrays (n, S) del
+# dtype de cálculo por remuestreo: Pearson guarda el remuestreo de X, dx y
+# dy; Spearman además los rangos en float64 de scipy.
+DEFAULT_BOOTSTRAP_MB = 256
+BOOTSTRAP_ARRAYS = {"pearson": 4, "spearman": 16}
+
+
+def bootstrap_batch_size(
+    n: int, n_skills: int, method: str = "pearson", dtype=np.float32, n_boot: int = 1000
+) -> int:
+    """Remuestreos por lote para que cada lote quepa en BOOTSTRAP_MEMORY_MB."""
+    env = os.environ.get("BOOTSTRAP_MEMORY_MB")
+    budget = float(env) * 2**20 if env else DEFAULT_BOOTSTRAP_MB * 2**20
+    per_resample = max(n * n_skills, 1) * BOOTSTRAP_ARRAYS[method] * np.dtype(dtype).itemsize
+    return int(max(1, min(n_boot, budget // per_resample)))
+
+
+def bootstrap_ci(
+    X: np.ndarray,
+    y: np.ndarray,
+    method: str = "pearson",
+    n_boot: int = 1000,
+    alpha: float = 0.05,
+    batch_size: int | None = None,
+    seed: int = 42,
+    dtype=np.float32,
+):
+    """
+    Intervalos de confianza bootstrap (percentiles) remuestreando SOCs.
+    Los remuestreos se evalúan en lotes (batch_size, n, S) con NumPy; por
+    defecto el tamaño del lote sale de `bootstrap_batch_size`. Se calcula
+    en `dtype` (float32: el error es muy inferior a la anchura del IC).
+    """
+    corr = CORRELATION_METHODS[method]
+    rng = np.random.default_rng(seed)
+    n = len(y)
+    X = np.asarray(X, dtype=dtype)
+    y = np.asarray(y, dtype=dtype)
+    if batch_size is None:
+        batch_size = bootstrap_batch_size(n, X.shape[1], method, dtype, n_boot)
+
+    stats = np.empty((n_boot, X.shape[1]), dtype=dtype)
+    for start in range(0, n_boot, batch_size):
+        b = min(batch_size, n_boot - start)
+        idx = rng.integers(0, n, size=(b, n))
+        stats[start:start + b] = corr(X[idx], y[idx][..., None])
+
+    # Skills sin pares suficientes: todo NaN → IC NaN, sin avisos
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        low = np.nanpercentile(stats, 100 * alpha / 2, axis=0)
+        high = np.nanpercentile(stats, 100 * (1 - alpha / 2), axis=0)
+    return low.astype(float), high.astype(float)
+
+
+def compute_skill_salary_correlations(df_plot: pd.DataFrame, n_boot: int = 1000) -> pd.DataFrame:
+    """
+    Correlación de Pearson y Spearman entre la importancia de cada skill
+    y el salario, con IC bootstrap al 95 %. Una fila por skill.
+    """
+    X, y, skills = skill_wage_arrays(df_plot)
+    Y = np.broadcast_to(y[:, None], X.shape)
+
+    result = pd.DataFrame({
+        "Skill_Name": skills,
+        "N": (~(np.isnan(X) | np.isnan(Y))).sum(axis=0),
+    })
+    for method, corr in CORRELATION_METHODS.items():
+        name = method.capitalize()
+        result[name] = corr(X, Y)
+        result[f"{name}_Low"], result[f"{name}_High"] = bootstrap_ci(
+            X, y, method=method, n_boot=n_boot
+        )
+
+    return result.sort_values("Pearson", ascending=False).reset_index(drop=True)
+
+
+@cache_by_frame
+def skill_salary_correlations(df_plot: pd.DataFrame, n_boot: int = 1000) -> pd.DataFrame:
+    """
+    Igual que `compute_skill_salary_correlations`, memoizado en el proceso
+    y persistido en data/cache/artifacts/correlations junto al snapshot.
+    """
+    path = CORRELATIONS_DIR / f"{frame_digest(df_plot)}_{n_boot}.arrow"
+    if path.exists():
+        try:
+            return read_frame(path)
+        except (OSError, ValueError):
+            pass
+
+    result = compute_skill_salary_correlations(df_plot, n_boot=n_boot)
+    try:
+        CORRELATIONS_DIR.mkdir(parents=True, exist_ok=True)
+        write_frame(result, path)
+    except OSError:
+        pass
+    return result
@@ -0,0 +1,48 @@
+from typing import NamedTuple
+
+import pandas as pd
+import streamlit as st
+
+from .load_data import load_frames
+
+
+class AppData(NamedTuple):
+    """Tupla con nombre de los DataFrames que devuelve `load_all_data()`."""
+    oews_clean: pd.DataFrame
+    merged: pd.DataFrame
+    df_plot: pd.DataFrame
+    df_rec: pd.DataFrame
+    occ: pd.DataFrame
+    skills_clean: pd.DataFrame
+    tasks_clean: pd.DataFrame
+
+
+@st.cache_resource(show_spinner="Cargando datos…")
+def get_frames() -> dict[str, pd.DataFrame]:
+    """
+    Todos los frames de `load_frames()` (los de AppData y los
+    descriptores O*NET), compartidos por todas las páginas y sesiones
+    del proceso.
+
+    `st.cache_resource` devuelve siempre el mismo objeto (sin pickle ni
+    copia), así que el pipeline se ejecuta una sola vez por proceso y la
+    memoria no crece al navegar entre páginas. Los DataFrames se tratan
+    como de solo lectura: quien necesite modificarlos debe trabajar sobre
+    un `.copy()`.
+    """
+    return load_frames()
+
+
+def get_data() -> AppData:
+    """Frames de `load_all_data()` como AppData (ver `get_frames`)."""
+    frames = get_frames()
+    return AppData(*(frames[name] for name in AppData._fields))
+
+
+def get_descriptors() -> pd.DataFrame:
+    """
+    Descriptores O*NET del recomendador (Skills, Knowledge, Abilities y
+    Work Activities disponibles, escalas IM y LV), del mismo snapshot que
+    `get_data`.
+    """
+    return get_frames()["descriptors"]
@@ -0,0 +1,83 @@
+"""
+Codificación por diccionario compartida entre todos los DataFrames.
+
+SOC, skill, estado y título de O*NET se guardan como `pd.Categorical`
+con las MISMAS categorías en todos los frames, de modo que:
+
+- los `merge` por SOC comparan códigos enteros en lugar de strings
+  (pandas solo usa los códigos si los dos lados tienen el mismo dtype)
+- los filtros `== valor` se resuelven con una búsqueda en el diccionario
+  y una comparación de enteros
+- cada string se guarda una sola vez por proceso
+
+El ID global de un valor es su posición en las categorías (`ids()`).
+Las agrupaciones sobre estas columnas deben usar `observed=True`.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .preprocess_oews import FIPS_TO_STATE
+
+
+class Dictionaries(NamedTuple):
+    soc: pd.CategoricalDtype
+    skill: pd.CategoricalDtype
+    state: pd.CategoricalDtype
+    title: pd.CategoricalDtype
+
+
+# Columna → diccionario que la codifica
+ENCODED_COLUMNS = {
+    "SOC": "soc",
+    "Skill": "skill",
+    "Skill_Name": "skill",
+    "STATE_ABBR": "state",
+    "Title": "title",
+}
+
+
+def _dictionary(*columns: pd.Series, base=()) -> pd.CategoricalDtype:
+    values = set(base)
+    for s in columns:
+        values.update(s.dropna().astype(str).unique())
+    return pd.CategoricalDtype(sorted(values))
+
+
+def build_dictionaries(
+    oews_clean: pd.DataFrame,
+    occ: pd.DataFrame,
+    skills_clean: pd.DataFrame,
+    tasks_clean: pd.DataFrame,
+) -> Dictionaries:
+    """
+    Diccionarios ordenados con la unión de valores de los frames limpios.
+    Los estados parten de la lista FIPS fija para que sus IDs no cambien
+    entre ediciones del OEWS.
+    """
+    return Dictionaries(
+        soc=_dictionary(oews_clean["SOC"], occ["SOC"], skills_clean["SOC"], tasks_clean["SOC"]),
+        skill=_dictionary(skills_clean["Skill"]),
+        state=_dictionary(oews_clean["STATE_ABBR"], base=FIPS_TO_STATE.values()),
+        title=_dictionary(occ["Title"]),
+    )
+
+
+def encode_frame(df: pd.DataFrame, dicts: Dictionaries) -> pd.DataFrame:
+    """Convierte in situ las columnas de ENCODED_COLUMNS al dtype compartido."""
+    for col, name in ENCODED_COLUMNS.items():
+        if col in df.columns:
+            df[col] = df[col].astype(getattr(dicts, name))
+    return df
+
+
+def ids(s: pd.Series) -> np.ndarray:
+    """
+    IDs enteros (int32) de una columna; -1 para NaN. En columnas
+    codificadas son los IDs globales del diccionario; en el resto, los
+    de `pd.factorize` (válidos solo dentro de esa columna).
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.codes.to_numpy(dtype=np.int32)
+    return pd.factorize(s)[0].astype(np.int32)
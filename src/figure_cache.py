@@ -0,0 +1,156 @@
+"""
+Caché de figuras Plotly compartida por todas las sesiones del proceso.
+
+Los constructores de gráficos decorados con `cached_figure` guardan la
+figura serializada (JSON) bajo la clave (función, versión de los datos,
+parámetros). Un acierto reconstruye la figura desde el JSON sin volver a
+validarla, así que vistas populares (p. ej. el mapa de "Software
+Developers") no se recalculan en cada rerun ni para cada usuario.
+
+La versión de un DataFrame es la que le haya asignado su productor con
+`set_frame_version` (p. ej. los slices de `TrendStore`, que son objetos
+nuevos en cada rerun) o, si no tiene, su `frame_digest` memoizado por
+identidad: los frames compartidos (ver `data_access.get_data`) se
+hashean una sola vez por proceso. La caché es LRU con presupuesto en bytes (variable de
+entorno FIGURE_CACHE_MB, 64 por defecto).
+"""
+import functools
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from .artifacts import cache_by_frame, frame_digest, known_frame_version
+
+
+DEFAULT_BUDGET_MB = 64
+
+
+class FigureCache:
+    """
+    LRU de figuras serializadas con límite de bytes y contadores.
+
+    Se comparte entre los hilos de Streamlit, así que todos los accesos
+    van bajo un lock; la construcción de la figura se hace fuera de él.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # clave → (JSON, bytes en UTF-8)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, spec: str):
+        # Bytes, no caracteres: los títulos y etiquetas llevan tildes
+        size = len(spec.encode())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (spec, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _budget_bytes() -> int:
+    env = os.environ.get("FIGURE_CACHE_MB")
+    return int(float(env) * 2**20) if env else DEFAULT_BUDGET_MB * 2**20
+
+
+FIGURE_CACHE = FigureCache(_budget_bytes())
+
+
+def frame_version(df: pd.DataFrame) -> str:
+    """Versión asignada por el productor de `df` o, si no hay, su contenido."""
+    version = known_frame_version(df)
+    if version is None:
+        version = _content_version(df)
+    return version
+
+
+@cache_by_frame
+def _content_version(df: pd.DataFrame) -> str:
+    """`frame_digest` de `df`, calculado una vez por objeto."""
+    return frame_digest(df)
+
+
+def _key_part(value):
+    if isinstance(value, pd.DataFrame):
+        return ("frame", frame_version(value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_key_part(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _key_part(v)) for k, v in value.items()))
+    return value
+
+
+def figure_key(func, args, kwargs) -> tuple:
+    return (
+        f"{func.__module__}.{func.__qualname__}",
+        _key_part(args),
+        _key_part(kwargs),
+    )
+
+
+def cached_figure(func):
+    """
+    Memoiza un constructor de figuras Plotly en FIGURE_CACHE.
+
+    Cada llamada devuelve una figura nueva (se puede modificar sin
+    afectar a la caché). Los argumentos deben ser DataFrames, escalares
+    o listas/tuplas/dicts de ellos.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = figure_key(func, args, kwargs)
+        spec = FIGURE_CACHE.get(key)
+        if spec is None:
+            fig = func(*args, **kwargs)
+            FIGURE_CACHE.put(key, pio.to_json(fig, validate=False))
+            return fig
+        return go.Figure(json.loads(spec), _validate=False)
+
+    wrapper.uncached = func
+    return wrapper
@@ -2,53 +2,135 @@ from pathlib import Path
 
 import pandas as pd
 
-from .preprocess_oews import clean_oews
-from .preprocess_onet import load_and_clean_onet
-from .merge_datasets import build_merged
+from .onet_reader import ONET_TABLES, prefer_text, read_onet
+from .parallel import run_parallel
+from .pipeline import run_pipeline
+from . import snapshot
 
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 RAW_DIR = BASE_DIR / "data" / "raw"
 
+RAW_FILES = {
+    "oews": "oews.xlsx",
+    "occupation": "Occupation Data.xlsx",
+    "skills": "Skills.xlsx",
+    "tasks": "Task Statements.xlsx",
+}
 
-def load_oews_raw() -> pd.DataFrame:
-    path = RAW_DIR / "oews.xlsx"
+# Descriptores adicionales para el recomendador: se usan si existen
+OPTIONAL_RAW_FILES = {
+    "knowledge": "Knowledge.xlsx",
+    "abilities": "Abilities.xlsx",
+    "work_activities": "Work Activities.xlsx",
+}
+
+
+def raw_input_paths() -> dict[str, Path]:
+    """
+    Rutas de los raw; para O*NET se prefiere la versión .txt si existe.
+    Los ficheros de OPTIONAL_RAW_FILES solo se incluyen si están en disco.
+    """
+    paths = {
+        name: prefer_text(RAW_DIR / fname) if name in ONET_TABLES else RAW_DIR / fname
+        for name, fname in RAW_FILES.items()
+    }
+    for name, fname in OPTIONAL_RAW_FILES.items():
+        path = prefer_text(RAW_DIR / fname)
+        if path.exists():
+            paths[name] = path
+    return paths
+
+
+def read_raw(path: Path) -> pd.DataFrame:
     return pd.read_excel(path, engine="openpyxl")
 
 
-def load_onet_raw():
-    occ_path = RAW_DIR / "Occupation Data.xlsx"
-    skills_path = RAW_DIR / "Skills.xlsx"
-    tasks_path = RAW_DIR / "Task Statements.xlsx"
+def load_raw_files(names=None, workers: int | None = None, timings: dict | None = None) -> dict:
+    """
+    Lee en paralelo (pool de procesos) los ficheros raw `names`
+    (por defecto, todos los de RAW_FILES). Si se pasa `timings` se
+    rellena con los segundos de lectura de cada fichero.
+    """
+    paths = raw_input_paths()
+    names = list(names or paths)
+    # Primero los más grandes: el tiempo total tiende al del mayor
+    names.sort(key=lambda n: paths[n].stat().st_size, reverse=True)
+
+    calls = {
+        n: (read_onet, paths[n], n) if n in ONET_TABLES else (read_raw, paths[n])
+        for n in names
+    }
+    results = run_parallel(calls, workers)
+    if timings is not None:
+        timings.update({n: round(sec, 3) for n, (_, sec) in results.items()})
+    return {n: df for n, (df, _) in results.items()}
 
-    occ = pd.read_excel(occ_path)
-    skills = pd.read_excel(skills_path)
-    tasks = pd.read_excel(tasks_path)
-    return occ, skills, tasks
+
+def load_oews_raw() -> pd.DataFrame:
+    return read_raw(RAW_DIR / RAW_FILES["oews"])
 
 
-def load_all_data():
+def load_onet_raw(workers: int | None = None):
+    raw = load_raw_files(["occupation", "skills", "tasks"], workers)
+    return raw["occupation"], raw["skills"], raw["tasks"]
+
+
+def load_frames(use_snapshot: bool = True, workers: int | None = None) -> dict[str, pd.DataFrame]:
+    """
+    Todos los frames de `snapshot.SNAPSHOT_FRAMES` (los de `load_all_data`
+    y los descriptores O*NET) en una sola ejecución del pipeline.
+
+    Con `use_snapshot=True` el resultado se guarda en data/cache/snapshot
+    (Arrow IPC) y los arranques siguientes lo leen con memory mapping
+    mientras los ficheros raw no cambien. `workers` limita los procesos
+    usados para leer los ficheros raw (ver `parallel.default_workers`).
+    """
+    paths = raw_input_paths()
+
+    if use_snapshot:
+        frames = snapshot.load_snapshot(paths)
+        if frames is not None:
+            return dict(zip(snapshot.SNAPSHOT_FRAMES, frames))
+
+    frames, _ = run_pipeline(paths, workers=workers, outputs=snapshot.SNAPSHOT_FRAMES)
+
+    if use_snapshot:
+        snapshot.save_snapshot(paths, [frames[name] for name in snapshot.SNAPSHOT_FRAMES])
+
+    return frames
+
+
+def load_all_data(use_snapshot: bool = True, workers: int | None = None):
     """
     Pipeline completo:
     - Carga OEWS y O*NET (raw)
     - Limpieza
     - Unión
     - Devuelve:
-      oews_clean, merged, df_plot, df_rec
+      oews_clean, merged, df_plot, df_rec, occ, skills_clean, tasks_clean
+
+    Snapshot y `workers`: ver `load_frames`.
     """
-    # OEWS
-    oews_raw = load_oews_raw()
-    oews_clean = clean_oews(oews_raw)
+    frames = load_frames(use_snapshot, workers)
+    return tuple(frames[name] for name in snapshot.FRAME_NAMES)
 
-    # O*NET
-    occ_raw, skills_raw, tasks_raw = load_onet_raw()
-    occ, skills_clean, tasks_clean = load_and_clean_onet(
-        occ_raw, skills_raw, tasks_raw
-    )
 
-    # Merge
-    merged, df_plot, df_rec = build_merged(
-        oews_clean, occ, skills_clean, tasks_clean
-    )
+def build_all_data(workers: int | None = None):
+    """
+    Ejecuta el pipeline desde los ficheros raw, sin snapshot. Las etapas
+    cuyas entradas no han cambiado se reutilizan (ver `pipeline`) y las
+    que leen ficheros raw se ejecutan en paralelo.
+    """
+    frames = load_frames(use_snapshot=False, workers=workers)
+    return tuple(frames[name] for name in snapshot.FRAME_NAMES)
 
-    return oews_clean, merged, df_plot, df_rec, occ, skills_clean, tasks_clean
+
+def load_descriptors(workers: int | None = None) -> pd.DataFrame:
+    """
+    Descriptores O*NET en formato largo (SOC, Domain, Element, Scale,
+    Value, Title) para el recomendador: Skills y, si están en data/raw,
+    Knowledge, Abilities y Work Activities, con escalas IM y LV. Salen
+    del mismo snapshot que `load_all_data`.
+    """
+    return load_frames(workers=workers)["descriptors"]
@@ -1,58 +1,52 @@
 import pandas as pd
 
 
-def build_merged(
-    oews_clean: pd.DataFrame,
-    occ: pd.DataFrame,
-    skills_clean: pd.DataFrame,
-    tasks_clean: pd.DataFrame,
-):
+def merge_oews_onet(oews_clean: pd.DataFrame, occ: pd.DataFrame) -> pd.DataFrame:
     """
-    Une OEWS + O*NET y construye:
-    - merged: info completa por SOC + estado
-    - df_plot: base para análisis de skills vs salario
-    - df_rec: base para recomendador (occupation-skill-importance)
+    merged: info completa por SOC + estado (las skills de cada SOC se
+    consultan con `soc_index.get_skills_index`).
     """
     # Merge OEWS con Occupation Data por SOC
     merged = oews_clean.merge(occ, on="SOC", how="left")
 
-    # Agrupar skills y tasks en listas por SOC (para descripción cualitativa)
-    skills_grouped = (
-        skills_clean
-        .groupby("SOC")["Skill"]
-        .apply(list)
-        .reset_index()
-        .rename(columns={"Skill": "Skills_List"})
-    )
-
-    tasks_grouped = (
-        tasks_clean
-        .groupby("SOC")["Task"]
-        .apply(list)
-        .reset_index()
-        .rename(columns={"Task": "Tasks_List"})
-    )
-
-    merged = merged.merge(skills_grouped, on="SOC", how="left")
-    merged = merged.merge(tasks_grouped, on="SOC", how="left")
-
     # Filtrar ocupaciones que realmente mapean con O*NET
-    merged = merged[merged["Title"].notna()].reset_index(drop=True)
+    return merged[merged["Title"].notna()].reset_index(drop=True)
 
-    # ---------- df_plot: skill importance + salario medio por SOC ----------
+
+def build_df_plot(merged: pd.DataFrame, skills_clean: pd.DataFrame) -> pd.DataFrame:
+    """df_plot: skill importance + salario medio por SOC."""
     wages_by_soc = (
-        merged.groupby(["SOC", "OCC_TITLE"])["A_MEAN"]
+        merged.groupby(["SOC", "OCC_TITLE"], observed=True)["A_MEAN"]
         .mean()
         .reset_index()
     )
 
     df_plot = wages_by_soc.merge(skills_clean, on="SOC", how="left")
     df_plot = df_plot.rename(columns={"Skill": "Skill_Name"})
-    df_plot = df_plot.dropna(subset=["Importance", "A_MEAN"])
+    return df_plot.dropna(subset=["Importance", "A_MEAN"])
+
 
-    # ---------- df_rec: base para recomendador ----------
-    # df_rec = skills_clean + título ocupación
+def build_df_rec(skills_clean: pd.DataFrame, occ: pd.DataFrame) -> pd.DataFrame:
+    """df_rec: base para recomendador (skills_clean + título ocupación)."""
     occ_small = occ[["SOC", "Title"]]
-    df_rec = skills_clean.merge(occ_small, on="SOC", how="left")
+    return skills_clean.merge(occ_small, on="SOC", how="left")
+
+
+def build_merged(
+    oews_clean: pd.DataFrame,
+    occ: pd.DataFrame,
+    skills_clean: pd.DataFrame,
+    tasks_clean: pd.DataFrame,
+):
+    """
+    Une OEWS + O*NET y construye:
+    - merged: info completa por SOC + estado
+    - df_plot: base para análisis de skills vs salario
+    - df_rec: base para recomendador (occupation-skill-importance)
 
+    Cada parte es también una etapa independiente de `pipeline`.
+    """
+    merged = merge_oews_onet(oews_clean, occ)
+    df_plot = build_df_plot(merged, skills_clean)
+    df_rec = build_df_rec(skills_clean, occ)
     return merged, df_plot, df_rec
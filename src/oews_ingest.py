@@ -0,0 +1,203 @@
+"""
+Ingesta por bloques del fichero completo del OEWS ("all data" del BLS).
+
+El fichero se lee por trozos de filas (CSV con `chunksize` o XLSX con
+openpyxl en modo read-only), cada trozo se limpia con `clean_oews` sin
+lista blanca de ocupaciones y el resultado se escribe como dataset
+Parquet particionado por nivel geográfico y año:
+
+    data/store/oews/AREA_LEVEL=state/YEAR=2023/part-0.parquet
+
+    python -m src.oews_ingest all_data_M_2023.xlsx --year 2023
+"""
+import argparse
+import time
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from .preprocess_oews import (
+    FIPS_TO_STATE,
+    OEWS_COLS,
+    OEWS_SCHEMA,
+    SELECTED_OCC,
+    clean_oews,
+    coerce_oews_schema,
+)
+
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+OEWS_STORE_DIR = BASE_DIR / "data" / "store" / "oews"
+
+# Tipos Arrow equivalentes a OEWS_SCHEMA (las categorías se guardan
+# como string: cada bloque tendría su propio diccionario)
+ARROW_TYPES = {
+    "Int8": pa.int8(),
+    "Int32": pa.int32(),
+    "float32": pa.float32(),
+    "category": pa.string(),
+}
+
+STORE_SCHEMA = pa.schema(
+    [
+        (col, ARROW_TYPES[OEWS_SCHEMA[col]])
+        for col in OEWS_COLS
+        if col != "OCC_CODE"
+    ]
+    + [
+        ("SOC", pa.string()),
+        ("AREA_TYPE", ARROW_TYPES[OEWS_SCHEMA["AREA_TYPE"]]),
+        ("STATE_ABBR", pa.string()),
+        ("AREA_LEVEL", pa.string()),
+        ("YEAR", pa.int16()),
+    ]
+)
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("AREA_LEVEL", pa.string()), ("YEAR", pa.int16())]),
+    flavor="hive",
+)
+
+
+# ============================================================
+#   LECTURA POR BLOQUES
+# ============================================================
+
+def iter_raw_chunks(path: Path, chunk_size: int = 50_000):
+    """Genera DataFrames de como máximo `chunk_size` filas del fichero raw."""
+    path = Path(path)
+
+    if path.suffix.lower() in (".csv", ".txt"):
+        sep = "\t" if path.suffix.lower() == ".txt" else ","
+        yield from pd.read_csv(path, sep=sep, chunksize=chunk_size, dtype=str)
+        return
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(c).strip().upper() for c in next(rows)]
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame(buffer, columns=header)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=header)
+    finally:
+        wb.close()
+
+
+def _clean_chunk(chunk: pd.DataFrame, year: int, occupations, report: Counter) -> pd.DataFrame:
+    chunk.columns = [str(c).strip().upper() for c in chunk.columns]
+    # El extracto por estado no trae AREA_TYPE: estados (FIPS) o territorios
+    if "AREA_TYPE" not in chunk.columns:
+        area = pd.to_numeric(chunk["AREA"], errors="coerce")
+        chunk["AREA_TYPE"] = area.isin(list(FIPS_TO_STATE)).map({True: 2, False: 3})
+
+    clean = clean_oews(chunk, occupations=occupations, states_only=False, report=report)
+    clean["YEAR"] = year
+    for col in clean.select_dtypes("category"):
+        clean[col] = clean[col].astype(object)
+    return clean.reindex(columns=STORE_SCHEMA.names)
+
+
+# ============================================================
+#   ESCRITURA DEL DATASET PARTICIONADO
+# ============================================================
+
+def ingest_oews(
+    path,
+    year: int,
+    store_dir: Path = OEWS_STORE_DIR,
+    occupations: list[str] | None = None,
+    chunk_size: int = 50_000,
+) -> dict:
+    """
+    Limpia `path` por bloques y lo escribe en `store_dir`. Se sustituyen
+    solo las particiones (AREA_LEVEL, YEAR) que trae el fichero; las de
+    otros niveles o años no se tocan.
+    Devuelve estadísticas de la ingesta (filas leídas/escritas, celdas
+    suprimidas por cada símbolo del BLS, tiempo).
+    """
+    stats = {"rows_read": 0, "rows_written": 0, "chunks": 0}
+    suppressed = Counter()
+    t0 = time.perf_counter()
+
+    def batches():
+        for chunk in iter_raw_chunks(path, chunk_size):
+            stats["rows_read"] += len(chunk)
+            stats["chunks"] += 1
+            clean = _clean_chunk(chunk, year, occupations, suppressed)
+            stats["rows_written"] += len(clean)
+            table = pa.Table.from_pandas(clean, schema=STORE_SCHEMA, preserve_index=False)
+            yield from table.to_batches()
+
+    ds.write_dataset(
+        batches(),
+        base_dir=store_dir,
+        schema=STORE_SCHEMA,
+        format="parquet",
+        partitioning=PARTITIONING,
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+    )
+
+    stats["suppressed"] = dict(suppressed)
+    stats["seconds"] = round(time.perf_counter() - t0, 2)
+    return stats
+
+
+def load_oews_store(
+    area_level: str = "state",
+    year: int | None = None,
+    occupations: list[str] | None = None,
+    columns: list[str] | None = None,
+    store_dir: Path = OEWS_STORE_DIR,
+) -> pd.DataFrame:
+    """
+    Lee del dataset solo las particiones y columnas pedidas.
+    Con los valores por defecto devuelve el equivalente de `clean_oews`
+    (nivel estatal) para todas las ocupaciones y todos los años.
+    """
+    dataset = ds.dataset(store_dir, format="parquet", partitioning=PARTITIONING)
+
+    expr = ds.field("AREA_LEVEL") == area_level
+    if year is not None:
+        expr &= ds.field("YEAR") == year
+    if occupations is not None:
+        expr &= ds.field("OCC_TITLE").isin(occupations)
+
+    df = dataset.to_table(columns=columns, filter=expr).to_pandas()
+    return coerce_oews_schema(df)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingesta por bloques del OEWS completo.")
+    parser.add_argument("input", help="Fichero OEWS (xlsx, csv o txt)")
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--store", type=Path, default=OEWS_STORE_DIR)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument(
+        "--selected-only", action="store_true",
+        help="Aplicar la lista SELECTED_OCC (por defecto: todas las ocupaciones)",
+    )
+    args = parser.parse_args(argv)
+
+    stats = ingest_oews(
+        args.input,
+        year=args.year,
+        store_dir=args.store,
+        occupations=SELECTED_OCC if args.selected_only else None,
+        chunk_size=args.chunk_size,
+    )
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+"""
+Series temporales del OEWS a partir del store particionado por año.
+
+Cada edición anual se ingesta con `oews_ingest.ingest_oews` en su propia
+partición YEAR=..., así que añadir un año no reescribe los anteriores.
+Sobre el store se construye un panel (YEAR, AREA, SOC) con los códigos
+SOC armonizados a la clasificación 2018 (crosswalk del BLS en
+data/reference, ver `harmonize_soc`) y se precalculan:
+
+- crecimiento interanual (YoY) de salario y empleo por ocupación y estado
+- CAGR entre el primer y el último año disponible
+
+El resultado se guarda en data/store/oews_trends/<clave>/ y solo se
+recalcula cuando cambian los ficheros del store.
+
+    python -m src.oews_trends all_data_M_2019.xlsx all_data_M_2023.xlsx
+    python -m src.oews_trends 2021=oews_2021.csv
+"""
+import argparse
+import hashlib
+import json
+import re
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import set_frame_version
+from .oews_ingest import BASE_DIR, OEWS_STORE_DIR, ingest_oews, load_oews_store
+
+
+TRENDS_DIR = OEWS_STORE_DIR.parent / "oews_trends"
+
+# Crosswalk SOC 2010 → SOC 2018 del BLS (más los códigos híbridos que el
+# OEWS publicó en 2019-2020), versionado con el repositorio
+CROSSWALK_PATH = BASE_DIR / "data" / "reference" / "soc_2010_to_2018.csv"
+
+# Primera edición del OEWS publicada íntegramente en SOC 2018: el
+# crosswalk solo se aplica a los años anteriores
+SOC_2018_FIRST_YEAR = 2021
+
+PANEL_KEYS = ["YEAR", "AREA", "SOC"]
+WAGE_COLS = ["A_MEAN", "A_MEDIAN"]
+TREND_METRICS = ["A_MEDIAN", "A_MEAN", "TOT_EMP"]
+STORE_COLUMNS = ["YEAR", "AREA", "AREA_TITLE", "STATE_ABBR", "SOC", "OCC_TITLE", "TOT_EMP"] + WAGE_COLS
+
+
+# ============================================================
+#   INGESTA DE VARIAS EDICIONES
+# ============================================================
+
+def infer_year(path) -> int:
+    """Año de la edición a partir del nombre (p. ej. all_data_M_2023.xlsx)."""
+    years = re.findall(r"(?:19|20)\d{2}", Path(path).stem)
+    if not years:
+        raise ValueError(f"No se puede deducir el año de {path}; usa AÑO=fichero")
+    return int(years[-1])
+
+
+def ingest_oews_years(sources: dict[int, Path], store_dir: Path = OEWS_STORE_DIR, **kwargs) -> dict:
+    """
+    Ingesta varias ediciones anuales en el mismo store. Cada año sustituye
+    solo su propia partición. Devuelve las estadísticas por año.
+    """
+    return {
+        year: ingest_oews(path, year=year, store_dir=store_dir, **kwargs)
+        for year, path in sorted(sources.items())
+    }
+
+
+# ============================================================
+#   PANEL ARMONIZADO
+# ============================================================
+
+def load_crosswalk(path: Path = CROSSWALK_PATH) -> pd.DataFrame:
+    """
+    Crosswalk versionado: una fila por (SOC_OLD, SOC_2018), con SOC en
+    el formato del store ("15-1252.00") y N_TARGETS = número de destinos
+    del código antiguo (más de uno = división).
+    """
+    cw = pd.read_csv(path, comment="#", dtype=str)
+    for col in ("SOC_OLD", "SOC_2018"):
+        cw[col] = cw[col].str.strip() + ".00"
+    cw["N_TARGETS"] = cw.groupby("SOC_OLD")["SOC_2018"].transform("size")
+    return cw
+
+
+def crosswalk_from_bls(xlsx_path, out_path: Path = CROSSWALK_PATH) -> pd.DataFrame:
+    """
+    Regenera el CSV versionado a partir del crosswalk oficial del BLS
+    (soc_2010_to_2018_crosswalk.xlsx): conserva los códigos que cambian
+    o se dividen y las filas híbridas del CSV actual, que el BLS no
+    incluye.
+    """
+    raw = pd.read_excel(xlsx_path, header=None, dtype=str)
+    header = raw.index[raw.eq("2010 SOC Code").any(axis=1)][0]
+    bls = raw.iloc[header + 1:].set_axis(raw.iloc[header].str.strip(), axis=1)
+    bls = bls.rename(columns={
+        "2010 SOC Code": "SOC_OLD", "2010 SOC Title": "TITLE_OLD",
+        "2018 SOC Code": "SOC_2018", "2018 SOC Title": "TITLE_2018",
+    })[["SOC_OLD", "TITLE_OLD", "SOC_2018", "TITLE_2018"]].dropna(subset=["SOC_OLD", "SOC_2018"])
+    bls = bls.apply(lambda s: s.str.strip())
+
+    n_targets = bls.groupby("SOC_OLD")["SOC_2018"].transform("size")
+    changed = bls[(bls["SOC_OLD"] != bls["SOC_2018"]) | (n_targets > 1)].assign(SOURCE="2010")
+
+    current = pd.read_csv(out_path, comment="#", dtype=str) if Path(out_path).exists() else None
+    hybrid = current[current["SOURCE"] == "hybrid"] if current is not None else None
+    out = pd.concat([changed, hybrid], ignore_index=True).drop_duplicates(["SOC_OLD", "SOC_2018"])
+
+    header_lines = Path(out_path).read_text().splitlines() if current is not None else []
+    comments = [line for line in header_lines if line.startswith("#")]
+    with open(out_path, "w", newline="") as f:
+        f.writelines(line + "\n" for line in comments)
+        out.to_csv(f, index=False)
+    return out
+
+
+def _split_shares(pairs: pd.DataFrame, df: pd.DataFrame) -> pd.Series:
+    """
+    Fracción del empleo de cada fila antigua que va a cada destino.
+
+    En una división el reparto sigue el empleo de los destinos en la
+    primera edición SOC 2018 del panel: el de la misma área y, si el
+    área no tiene empleo en ninguno, el del conjunto de áreas. Sin
+    edición de referencia (o sin empleo publicado), partes iguales.
+    """
+    equal = 1.0 / pairs["N_TARGETS"]
+    ref_years = df.loc[df["YEAR"] >= SOC_2018_FIRST_YEAR, "YEAR"]
+    if ref_years.empty:
+        return equal
+
+    ref = df[df["YEAR"] == ref_years.min()]
+    by_area = ref.groupby(["SOC", "AREA"])["TOT_EMP"].sum()
+    by_soc = ref.groupby("SOC")["TOT_EMP"].sum()
+
+    keys = pd.MultiIndex.from_arrays([pairs["SOC_2018"], pairs["AREA"]])
+    emp_area = pd.Series(by_area.reindex(keys).to_numpy(), index=pairs.index).fillna(0.0)
+    emp_soc = pd.Series(by_soc.reindex(pairs["SOC_2018"]).to_numpy(), index=pairs.index).fillna(0.0)
+
+    share_area = emp_area / emp_area.groupby(pairs["_ROW"]).transform("sum")
+    share_soc = emp_soc / emp_soc.groupby(pairs["_ROW"]).transform("sum")
+    share = share_area.fillna(share_soc).fillna(equal)
+    return share.where(pairs["N_TARGETS"] > 1, 1.0)
+
+
+def unmapped_retired_codes(df: pd.DataFrame, crosswalk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Códigos de ediciones anteriores a SOC 2018 que ya no aparecen en
+    ninguna edición SOC 2018 del panel y que el crosswalk no traduce:
+    sus series se cortan. Vacío si el panel no tiene ediciones SOC 2018.
+    """
+    new = df["YEAR"] >= SOC_2018_FIRST_YEAR
+    if not new.any():
+        return pd.DataFrame(columns=["SOC", "OCC_TITLE", "LAST_YEAR"])
+
+    old = df[~new & ~df["SOC"].isin(crosswalk["SOC_OLD"])]
+    old = old[~old["SOC"].isin(df.loc[new, "SOC"].unique())]
+    return (
+        old.sort_values("YEAR")
+        .groupby("SOC", sort=True)
+        .agg(OCC_TITLE=("OCC_TITLE", "last"), LAST_YEAR=("YEAR", "max"))
+        .reset_index()
+    )
+
+
+def harmonize_soc(
+    df: pd.DataFrame,
+    crosswalk: pd.DataFrame | None = None,
+    report: dict | None = None,
+) -> pd.DataFrame:
+    """
+    Lleva SOC a la clasificación 2018 y agrega las filas que pasan a
+    compartir (YEAR, AREA, SOC): empleo sumado y salarios ponderados
+    por empleo (media simple si no hay empleo publicado). El título de
+    cada SOC es el de su año más reciente.
+
+    Las divisiones (un código antiguo → varios nuevos) reparten el
+    empleo según `_split_shares` y conservan el salario del código
+    antiguo; esas filas quedan marcadas con SOC_SPLIT. Si se pasa
+    `report` (dict) se guardan en él los códigos divididos ("split") y
+    los retirados que siguen sin traducir ("unmapped").
+    """
+    if crosswalk is None:
+        crosswalk = load_crosswalk()
+
+    df = df.copy()
+    df["SOC"] = df["SOC"].astype(str)
+    df["OCC_TITLE"] = df["OCC_TITLE"].astype(str)
+    df["TOT_EMP"] = df["TOT_EMP"].astype(float)
+    df["SOC_SPLIT"] = False
+
+    mapped = (df["YEAR"] < SOC_2018_FIRST_YEAR) & df["SOC"].isin(crosswalk["SOC_OLD"])
+    pairs = (
+        df[mapped].rename_axis("_ROW").reset_index()
+        .merge(crosswalk[["SOC_OLD", "SOC_2018", "TITLE_2018", "N_TARGETS"]], left_on="SOC", right_on="SOC_OLD")
+    )
+    share = _split_shares(pairs, df)
+    pairs["TOT_EMP"] = pairs["TOT_EMP"] * share
+    pairs["SOC"] = pairs["SOC_2018"]
+    pairs["OCC_TITLE"] = pairs["TITLE_2018"]
+    pairs["SOC_SPLIT"] = pairs["N_TARGETS"] > 1
+
+    if report is not None:
+        report["split"] = sorted(pairs.loc[pairs["SOC_SPLIT"], "SOC_OLD"].unique().tolist())
+        report["unmapped"] = unmapped_retired_codes(df, crosswalk).to_dict("records")
+
+    # Destinos sin empleo en la edición de referencia no reciben filas
+    df = pd.concat([df[~mapped], pairs.loc[share > 0, df.columns]], ignore_index=True)
+
+    w = df["TOT_EMP"].fillna(0.0)
+    for col in WAGE_COLS:
+        x = df[col].astype(float)
+        df[f"_{col}_wx"] = x * w
+        df[f"_{col}_w"] = w.where(x.notna(), 0.0)
+
+    g = df.groupby(PANEL_KEYS, sort=False)
+    panel = g.agg(
+        AREA_TITLE=("AREA_TITLE", "first"),
+        STATE_ABBR=("STATE_ABBR", "first"),
+        TOT_EMP=("TOT_EMP", lambda s: s.sum(min_count=1)),
+        SOC_SPLIT=("SOC_SPLIT", "any"),
+        **{f"_{c}_wx": (f"_{c}_wx", "sum") for c in WAGE_COLS},
+        **{f"_{c}_w": (f"_{c}_w", "sum") for c in WAGE_COLS},
+        **{f"_{c}_mean": (c, "mean") for c in WAGE_COLS},
+    ).reset_index()
+
+    for col in WAGE_COLS:
+        weighted = panel[f"_{col}_wx"] / panel[f"_{col}_w"].replace(0.0, np.nan)
+        panel[col] = weighted.fillna(panel[f"_{col}_mean"]).astype("float32")
+    panel = panel.drop(columns=[c for c in panel.columns if c.startswith("_")])
+    panel["TOT_EMP"] = panel["TOT_EMP"].astype("float32")
+
+    latest = df.sort_values("YEAR").drop_duplicates("SOC", keep="last")
+    panel["OCC_TITLE"] = panel["SOC"].map(latest.set_index("SOC")["OCC_TITLE"])
+    return panel
+
+
+def add_yoy(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    Añade <métrica>_YOY: variación respecto al año anterior disponible
+    de la misma ocupación y área. Si faltan años intermedios la tasa se
+    anualiza: (actual / anterior) ** (1 / huecos) - 1.
+    """
+    panel = panel.sort_values(["SOC", "AREA", "YEAR"], kind="stable").reset_index(drop=True)
+    g = panel.groupby(["SOC", "AREA"], sort=False)
+    gap = (panel["YEAR"] - g["YEAR"].shift(1)).astype(float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for col in TREND_METRICS:
+            prev = g[col].shift(1).astype(float)
+            ratio = panel[col].astype(float) / prev
+            panel[f"{col}_YOY"] = (ratio ** (1.0 / gap) - 1.0).astype("float32")
+    return panel
+
+
+def compute_cagr(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    CAGR por (SOC, AREA) entre el primer y el último año con dato de
+    cada métrica. Una fila por ocupación y área.
+    """
+    out = None
+    for col in TREND_METRICS:
+        sub = panel.dropna(subset=[col])
+        g = sub.groupby(["SOC", "AREA"], sort=False)
+        first = g[["YEAR", col]].first()
+        last = g[["YEAR", col]].last()
+        years = (last["YEAR"] - first["YEAR"]).astype(float)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cagr = (last[col].astype(float) / first[col].astype(float)) ** (1.0 / years) - 1.0
+        part = pd.DataFrame({
+            f"{col}_CAGR": cagr.where(years > 0).astype("float32"),
+        })
+        if col == "A_MEDIAN":
+            part["YEAR_START"] = first["YEAR"]
+            part["YEAR_END"] = last["YEAR"]
+            part["A_MEDIAN_START"] = first[col]
+            part["A_MEDIAN_END"] = last[col]
+        out = part if out is None else out.join(part, how="outer")
+
+    labels = panel.drop_duplicates(["SOC", "AREA"], keep="last").set_index(["SOC", "AREA"])
+    out = out.join(labels[["OCC_TITLE", "AREA_TITLE", "STATE_ABBR"]])
+    return out.reset_index()
+
+
+def build_trends(store_dir: Path = OEWS_STORE_DIR, area_level: str = "state"):
+    """
+    Panel con YoY, tabla de CAGR e informe de la armonización SOC
+    (ver `harmonize_soc`) leyendo todos los años del store.
+    """
+    raw = load_oews_store(area_level=area_level, columns=STORE_COLUMNS, store_dir=store_dir)
+    report = {}
+    panel = add_yoy(harmonize_soc(raw, report=report))
+    return panel, compute_cagr(panel), report
+
+
+# ============================================================
+#   PERSISTENCIA Y ACCESO
+# ============================================================
+
+def store_key(store_dir: Path = OEWS_STORE_DIR, area_level: str = "state") -> str | None:
+    """
+    Huella del store (ruta, tamaño y mtime de cada fichero) y del
+    crosswalk SOC; None si el store está vacío.
+    """
+    files = sorted(Path(store_dir).rglob("*.parquet")) if Path(store_dir).exists() else []
+    if not files:
+        return None
+    h = hashlib.sha256(f"{Path(store_dir).resolve()}|{area_level}".encode())
+    h.update(CROSSWALK_PATH.read_bytes())
+    for f in files:
+        stat = f.stat()
+        h.update(f"{f.relative_to(store_dir)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return h.hexdigest()[:16]
+
+
+class TrendStore:
+    """
+    Panel anual y CAGR indexados por ocupación.
+
+    Como en `WageStore`, las filas se ordenan una vez por ocupación y cada
+    consulta es un slice posicional del bloque contiguo correspondiente.
+    `report` es el informe de `harmonize_soc` (códigos divididos y
+    retirados sin traducir). Con `version` (la clave del store), cada
+    slice lleva la versión (store, tabla, ocupación) y la caché de
+    figuras no tiene que hashearlo.
+    """
+
+    def __init__(self, panel: pd.DataFrame, cagr: pd.DataFrame, report: dict | None = None,
+                 version: str | None = None):
+        self.report = report or {"split": [], "unmapped": []}
+        self.version = version
+        self.panel = panel.sort_values(["OCC_TITLE", "AREA", "YEAR"], kind="stable").reset_index(drop=True)
+        self.cagr = cagr.sort_values(["OCC_TITLE", "A_MEDIAN_CAGR"], ascending=[True, False]).reset_index(drop=True)
+        self._panel_blocks = self._blocks(self.panel)
+        self._cagr_blocks = self._blocks(self.cagr)
+        self.years = sorted(self.panel["YEAR"].unique().tolist())
+
+    @staticmethod
+    def _blocks(df: pd.DataFrame) -> dict:
+        titles = df["OCC_TITLE"].to_numpy()
+        if not len(titles):
+            return {}
+        starts = np.r_[0, np.flatnonzero(titles[1:] != titles[:-1]) + 1]
+        ends = np.r_[starts[1:], len(titles)]
+        return {titles[lo]: (int(lo), int(hi)) for lo, hi in zip(starts, ends)}
+
+    @property
+    def occupations(self) -> list[str]:
+        return list(self._panel_blocks)
+
+    def series(self, occupation: str) -> pd.DataFrame:
+        """Filas (AREA, YEAR) de la ocupación con sus métricas y YoY."""
+        lo, hi = self._panel_blocks.get(occupation, (0, 0))
+        return self._tagged(self.panel.iloc[lo:hi], "series", occupation)
+
+    def growth(self, occupation: str) -> pd.DataFrame:
+        """CAGR por área de la ocupación, de mayor a menor crecimiento salarial."""
+        lo, hi = self._cagr_blocks.get(occupation, (0, 0))
+        return self._tagged(self.cagr.iloc[lo:hi], "growth", occupation)
+
+    def _tagged(self, df: pd.DataFrame, table: str, occupation: str) -> pd.DataFrame:
+        if self.version is None:
+            return df
+        return set_frame_version(df, "trends", self.version, table, occupation)
+
+
+_TREND_STORES: dict[str, TrendStore] = {}
+
+
+def load_trends(store_dir: Path = OEWS_STORE_DIR, area_level: str = "state") -> TrendStore | None:
+    """
+    TrendStore del estado actual del store, o None si no hay datos.
+    Se reutiliza en memoria y en disco mientras el store no cambie.
+    """
+    key = store_key(store_dir, area_level)
+    if key is None:
+        return None
+    if key in _TREND_STORES:
+        return _TREND_STORES[key]
+
+    out_dir = TRENDS_DIR / key
+    try:
+        panel = pd.read_parquet(out_dir / "panel.parquet")
+        cagr = pd.read_parquet(out_dir / "cagr.parquet")
+        report = json.loads((out_dir / "soc_report.json").read_text())
+    except (OSError, ValueError):
+        panel, cagr, report = build_trends(store_dir, area_level)
+        _save_trends(out_dir, panel, cagr, report)
+
+    store = TrendStore(panel, cagr, report, version=key)
+    _TREND_STORES.clear()
+    _TREND_STORES[key] = store
+    return store
+
+
+def _save_trends(out_dir: Path, panel: pd.DataFrame, cagr: pd.DataFrame, report: dict):
+    try:
+        tmp_dir = out_dir.with_name(f".{out_dir.name}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        panel.to_parquet(tmp_dir / "panel.parquet", index=False)
+        cagr.to_parquet(tmp_dir / "cagr.parquet", index=False)
+        (tmp_dir / "soc_report.json").write_text(json.dumps(report, default=str))
+        shutil.rmtree(out_dir, ignore_errors=True)
+        tmp_dir.replace(out_dir)
+
+        # Limpiar tendencias de versiones anteriores del store
+        for old in out_dir.parent.iterdir():
+            if old.is_dir() and old.name != out_dir.name:
+                shutil.rmtree(old, ignore_errors=True)
+    except OSError:
+        pass
+
+
+def _parse_source(arg: str) -> tuple[int, Path]:
+    if "=" in arg:
+        year, path = arg.split("=", 1)
+        return int(year), Path(path)
+    return infer_year(arg), Path(arg)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingesta multi-año del OEWS y cálculo de tendencias.")
+    parser.add_argument(
+        "inputs", nargs="*",
+        help="Ficheros OEWS (AÑO=fichero, o fichero con el año en el nombre)",
+    )
+    parser.add_argument("--store", type=Path, default=OEWS_STORE_DIR)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument(
+        "--import-crosswalk", type=Path, metavar="XLSX",
+        help="Regenerar data/reference/soc_2010_to_2018.csv desde el crosswalk oficial del BLS",
+    )
+    args = parser.parse_args(argv)
+
+    if args.import_crosswalk:
+        cw = crosswalk_from_bls(args.import_crosswalk)
+        print(f"{len(cw)} filas escritas en {CROSSWALK_PATH}")
+
+    sources = dict(_parse_source(a) for a in args.inputs)
+    for year, stats in ingest_oews_years(sources, args.store, chunk_size=args.chunk_size).items():
+        print(year, stats)
+
+    trends = load_trends(args.store)
+    if trends is None:
+        print("Store vacío")
+        return
+    print(f"años={trends.years} ocupaciones={len(trends.occupations)} filas={len(trends.panel)}")
+    print(f"códigos divididos: {', '.join(trends.report['split']) or '-'}")
+    for row in trends.report["unmapped"]:
+        print(f"sin traducir: {row['SOC']} {row['OCC_TITLE']} (último año {row['LAST_YEAR']})")
+
+
+if __name__ == "__main__":
+    main()
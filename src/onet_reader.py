@@ -0,0 +1,99 @@
+"""
+Lectura de tablas O*NET con proyección de columnas.
+
+O*NET publica cada tabla en Excel y en texto delimitado por tabuladores
+(`Skills.txt`, `Task Statements.txt`…). Si junto al .xlsx existe el .txt
+se usa éste: se lee por bloques con `read_csv`, solo con las columnas
+que usa la limpieza, con dtypes explícitos y aplicando en cada bloque el
+filtro de escala (p. ej. Scale ID == "IM") antes de concatenar.
+
+Knowledge, Abilities y Work Activities son opcionales: comparten el
+formato de Skills y alimentan la matriz de descriptores del recomendador.
+"""
+import csv
+from pathlib import Path
+
+import pandas as pd
+
+
+# Columnas de las tablas de elementos (Skills, Knowledge, Abilities,
+# Work Activities): mismo formato en todas
+ELEMENT_COLUMNS = {
+    "O*NET-SOC Code": object,
+    "Element Name": object,
+    "Scale ID": object,
+    "Data Value": "float64",
+    "Not Relevant": object,
+}
+
+ONET_TABLES = {
+    "occupation": {
+        "O*NET-SOC Code": object,
+        "Title": object,
+        "Description": object,
+    },
+    "skills": ELEMENT_COLUMNS,
+    "knowledge": ELEMENT_COLUMNS,
+    "abilities": ELEMENT_COLUMNS,
+    "work_activities": ELEMENT_COLUMNS,
+    "tasks": {
+        "O*NET-SOC Code": object,
+        "Task ID": "int64",
+        "Task": object,
+        "Task Type": object,
+    },
+}
+
+# Tablas de descriptores para el recomendador ampliado
+DESCRIPTOR_DOMAINS = ("skills", "knowledge", "abilities", "work_activities")
+DESCRIPTOR_SCALES = ("IM", "LV")
+
+# Filtros que se aplican durante la lectura: tabla → escalas a conservar
+ONET_FILTERS = {
+    "skills": ("IM",),
+}
+
+
+def prefer_text(path: Path) -> Path:
+    """Devuelve el .txt hermano de `path` si existe; si no, `path`."""
+    path = Path(path)
+    txt = path.with_suffix(".txt")
+    return txt if txt.exists() else path
+
+
+def read_onet(
+    path,
+    table: str,
+    chunk_size: int = 100_000,
+    scales: tuple[str, ...] | None = None,
+) -> pd.DataFrame:
+    """
+    Lee la tabla O*NET `table` desde `path` (.txt o .xlsx) proyectando
+    las columnas de ONET_TABLES[table] y conservando solo las filas de
+    `scales` (por defecto las de ONET_FILTERS[table], si las hay).
+    """
+    path = Path(path)
+    columns = ONET_TABLES[table]
+    scales = scales if scales is not None else ONET_FILTERS.get(table)
+
+    def keep(df):
+        if scales is None:
+            return df
+        return df[df["Scale ID"].isin(scales)]
+
+    if path.suffix.lower() == ".txt":
+        reader = pd.read_csv(
+            path,
+            sep="\t",
+            usecols=list(columns),
+            dtype=columns,
+            chunksize=chunk_size,
+            quoting=csv.QUOTE_NONE,
+            encoding="utf-8",
+        )
+        df = pd.concat([keep(chunk) for chunk in reader], ignore_index=True)
+    else:
+        df = pd.read_excel(path, engine="openpyxl", usecols=list(columns), dtype=columns)
+        df = keep(df).reset_index(drop=True)
+
+    return df[list(columns)]
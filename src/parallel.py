@@ -0,0 +1,45 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def default_workers(n_jobs: int) -> int:
+    """
+    Número de procesos por defecto: la variable de entorno DATA_WORKERS
+    si existe; si no, uno por trabajo sin pasar del número de CPUs.
+    """
+    env = os.environ.get("DATA_WORKERS")
+    if env:
+        return max(1, int(env))
+    return max(1, min(n_jobs, os.cpu_count() or 1))
+
+
+def _timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+
+def run_parallel(calls: dict, workers: int | None = None) -> dict:
+    """
+    Ejecuta `calls` (nombre → (función, *args)) en un pool de procesos.
+    Devuelve nombre → (resultado, segundos dentro del proceso).
+
+    El parseo de openpyxl es Python puro (limitado por la GIL), así que
+    se usan procesos y no hilos. Las llamadas se envían en el orden del
+    dict: conviene poner primero las más largas. Con un solo proceso o
+    una sola llamada se ejecuta en el proceso actual, sin pool.
+    """
+    if workers is None:
+        workers = default_workers(len(calls))
+
+    if workers <= 1 or len(calls) <= 1:
+        return {name: _timed(*call) for name, call in calls.items()}
+
+    # spawn: Streamlit ejecuta las páginas en hilos y fork con hilos vivos
+    # puede heredar locks tomados
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        futures = {name: pool.submit(_timed, *call) for name, call in calls.items()}
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,338 @@
+"""
+Pipeline de datos como DAG de etapas con salidas persistidas.
+
+Cada etapa declara sus entradas (ficheros raw o salidas de otras etapas)
+y sus salidas. Su clave es un hash de las huellas de contenido de las
+entradas: el SHA-256 de los ficheros raw o el digest de las salidas de
+las etapas anteriores. Si la clave coincide con la del manifest la etapa
+se reutiliza desde data/cache/pipeline (Arrow, memory mapping); si no,
+se recalcula y se guarda. Como las claves dependen del CONTENIDO de las
+salidas, una etapa que se recalcula y produce lo mismo (p. ej. los
+diccionarios tras cambiar solo el texto de las tasks) no invalida las
+etapas posteriores.
+
+    python -m src.pipeline            # ejecuta y muestra el informe
+    python -m src.pipeline --force    # recalcula todas las etapas
+"""
+import argparse
+import hashlib
+import json
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+import pandas as pd
+import pyarrow as pa
+
+from .artifacts import frame_digest
+from .encoding import Dictionaries, build_dictionaries, encode_frame
+from .merge_datasets import build_df_plot, build_df_rec, merge_oews_onet
+from .onet_reader import DESCRIPTOR_DOMAINS, DESCRIPTOR_SCALES, read_onet
+from .parallel import run_parallel
+from .preprocess_oews import clean_oews
+from .preprocess_onet import clean_descriptors, clean_occupations, clean_skills, clean_tasks
+from .snapshot import CACHE_DIR, inputs_fingerprint, read_frame, write_frame
+
+
+PIPELINE_DIR = CACHE_DIR / "pipeline"
+
+# Subir cuando cambie la lógica de alguna etapa sin cambiar su nombre
+PIPELINE_VERSION = 2
+
+OUTPUT_FRAMES = [
+    "oews_clean", "merged", "df_plot", "df_rec",
+    "occ", "skills_clean", "tasks_clean",
+]
+
+DICTIONARY_OUTPUTS = tuple(f"{name}_dict" for name in Dictionaries._fields)
+
+
+class Stage(NamedTuple):
+    name: str
+    func: Callable
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+
+
+# ============================================================
+#   ETAPAS
+# ============================================================
+
+def _dicts(soc_dict, skill_dict, state_dict, title_dict) -> Dictionaries:
+    return Dictionaries(*(
+        pd.CategoricalDtype(d["value"].to_numpy()) for d in (soc_dict, skill_dict, state_dict, title_dict)
+    ))
+
+
+def _encoded(df: pd.DataFrame, dicts: Dictionaries) -> pd.DataFrame:
+    # Copia superficial: la salida persistida de la etapa no se modifica
+    return encode_frame(df.copy(deep=False), dicts)
+
+
+def _stage_dictionaries(oews_clean, occ, skills_clean, tasks_clean):
+    dicts = build_dictionaries(oews_clean, occ, skills_clean, tasks_clean)
+    return tuple(pd.DataFrame({"value": dtype.categories}) for dtype in dicts)
+
+
+def _stage_merged(oews_clean, occ, soc_dict, skill_dict, state_dict, title_dict):
+    dicts = _dicts(soc_dict, skill_dict, state_dict, title_dict)
+    return (merge_oews_onet(_encoded(oews_clean, dicts), _encoded(occ, dicts)),)
+
+
+def _stage_df_plot(merged, skills_clean, soc_dict, skill_dict, state_dict, title_dict):
+    dicts = _dicts(soc_dict, skill_dict, state_dict, title_dict)
+    return (build_df_plot(merged, _encoded(skills_clean, dicts)),)
+
+
+def _stage_df_rec(skills_clean, occ, soc_dict, skill_dict, state_dict, title_dict):
+    dicts = _dicts(soc_dict, skill_dict, state_dict, title_dict)
+    return (build_df_rec(_encoded(skills_clean, dicts), _encoded(occ, dicts)),)
+
+
+# Etapas de lectura: funciones de módulo para poder enviarlas a otro proceso
+
+def _stage_clean_oews(path):
+    return (clean_oews(pd.read_excel(path, engine="openpyxl")),)
+
+
+def _stage_clean_occupations(path):
+    return (clean_occupations(read_onet(path, "occupation")),)
+
+
+def _stage_clean_skills(path):
+    return (clean_skills(read_onet(path, "skills")),)
+
+
+def _stage_clean_tasks(path):
+    return (clean_tasks(read_onet(path, "tasks")),)
+
+
+def _stage_clean_descriptors(path, domain):
+    return (clean_descriptors(read_onet(path, domain, scales=DESCRIPTOR_SCALES), domain),)
+
+
+def _stage_descriptors(occ, *domain_frames):
+    desc = pd.concat(domain_frames, ignore_index=True)
+    desc = desc.merge(occ[["SOC", "Title"]], on="SOC", how="inner")
+    for col in ("SOC", "Title", "Domain", "Element", "Scale"):
+        desc[col] = desc[col].astype("category")
+    return (desc,)
+
+
+STAGES = [
+    Stage("clean_oews", _stage_clean_oews, ("oews",), ("oews_clean",)),
+    Stage("clean_occupations", _stage_clean_occupations, ("occupation",), ("occ",)),
+    Stage("clean_skills", _stage_clean_skills, ("skills",), ("skills_clean",)),
+    Stage("clean_tasks", _stage_clean_tasks, ("tasks",), ("tasks_clean",)),
+    Stage(
+        "dictionaries", _stage_dictionaries,
+        ("oews_clean", "occ", "skills_clean", "tasks_clean"), DICTIONARY_OUTPUTS,
+    ),
+    Stage(
+        "merged", _stage_merged,
+        ("oews_clean", "occ") + DICTIONARY_OUTPUTS, ("merged",),
+    ),
+    Stage(
+        "df_plot", _stage_df_plot,
+        ("merged", "skills_clean") + DICTIONARY_OUTPUTS, ("df_plot",),
+    ),
+    Stage(
+        "df_rec", _stage_df_rec,
+        ("skills_clean", "occ") + DICTIONARY_OUTPUTS, ("df_rec",),
+    ),
+]
+
+
+def pipeline_stages(paths: dict[str, Path]) -> list[Stage]:
+    """
+    STAGES más las etapas de descriptores del recomendador: una por cada
+    tabla de DESCRIPTOR_DOMAINS presente en `paths` y la que las une.
+    """
+    domains = [d for d in DESCRIPTOR_DOMAINS if d in paths]
+    stages = list(STAGES)
+    stages += [
+        Stage(
+            f"clean_{d}_descriptors",
+            partial(_stage_clean_descriptors, domain=d),
+            (d,), (f"{d}_descriptors",),
+        )
+        for d in domains
+    ]
+    stages.append(Stage(
+        "descriptors", _stage_descriptors,
+        ("occ",) + tuple(f"{d}_descriptors" for d in domains), ("descriptors",),
+    ))
+    return stages
+
+
+# ============================================================
+#   EJECUCIÓN INCREMENTAL
+# ============================================================
+
+def output_digest(df: pd.DataFrame) -> str:
+    """Digest de contenido de una salida, incluidos dtypes y categorías."""
+    h = hashlib.sha256(frame_digest(df).encode())
+    for col, dtype in df.dtypes.items():
+        h.update(f"{col}:{dtype}".encode())
+        if isinstance(dtype, pd.CategoricalDtype):
+            h.update(pd.util.hash_pandas_object(dtype.categories.to_series(), index=False).values.tobytes())
+    return h.hexdigest()[:16]
+
+
+def stage_key(stage: Stage, input_digests: list[str]) -> str:
+    payload = [PIPELINE_VERSION, stage.name, list(zip(stage.inputs, input_digests))]
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()[:16]
+
+
+def _output_path(cache_dir: Path, output: str, key: str) -> Path:
+    return cache_dir / output / f"{key}.arrow"
+
+
+def _read_manifest(cache_dir: Path) -> dict:
+    try:
+        return json.loads((cache_dir / "manifest.json").read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(cache_dir: Path, manifest: dict):
+    tmp = cache_dir / "manifest.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    tmp.replace(cache_dir / "manifest.json")
+
+
+def _persist(cache_dir: Path, output: str, key: str, df: pd.DataFrame):
+    out_dir = cache_dir / output
+    out_dir.mkdir(parents=True, exist_ok=True)
+    write_frame(df, _output_path(cache_dir, output, key))
+    for old in out_dir.glob("*.arrow"):
+        if old.stem != key:
+            old.unlink(missing_ok=True)
+
+
+def run_pipeline(
+    paths: dict[str, Path],
+    cache_dir: Path = PIPELINE_DIR,
+    force: bool = False,
+    workers: int | None = None,
+    outputs: list[str] = OUTPUT_FRAMES,
+):
+    """
+    Ejecuta las etapas en orden reutilizando las que no han cambiado.
+
+    Las etapas que solo leen ficheros raw son independientes: las que hay
+    que recalcular se lanzan a la vez en un pool de `workers` procesos
+    (ver `parallel.run_parallel`) antes de recorrer el DAG.
+
+    Devuelve (salidas, informe): un dict nombre → DataFrame con los frames
+    de `outputs` (los base, ya codificados) y un DataFrame con una fila por
+    etapa (stage, status 'reused'/'rebuilt', seconds). En las etapas
+    paralelas `seconds` es el tiempo dentro de su proceso.
+    """
+    stages = pipeline_stages(paths)
+    manifest = _read_manifest(cache_dir)
+    fingerprints = inputs_fingerprint(paths, manifest.get("inputs"))
+    stages_meta = manifest.get("stages", {})
+
+    digests = {name: fp["sha256"] for name, fp in fingerprints.items()}
+    keys = {}
+    values = {name: path for name, path in paths.items()}
+
+    def value(name):
+        # Salidas reutilizadas: se leen del disco solo si alguien las pide
+        if name not in values:
+            values[name] = read_frame(_output_path(cache_dir, name, keys[name]))
+        return values[name]
+
+    def reusable(stage, key):
+        meta = stages_meta.get(stage.name)
+        return (
+            not force
+            and meta is not None
+            and meta["key"] == key
+            and all(_output_path(cache_dir, out, key).exists() for out in stage.outputs)
+        )
+
+    # Etapas de lectura pendientes: todas a la vez en el pool
+    pending = {}
+    for stage in stages:
+        if all(i in paths for i in stage.inputs):
+            key = stage_key(stage, [digests[i] for i in stage.inputs])
+            if not reusable(stage, key):
+                pending[stage.name] = (stage.func, *(paths[i] for i in stage.inputs))
+    pending = dict(sorted(
+        pending.items(), key=lambda kv: -sum(Path(p).stat().st_size for p in kv[1][1:])
+    ))
+    prefetched = run_parallel(pending, workers) if pending else {}
+
+    report = []
+    for stage in stages:
+        t0 = time.perf_counter()
+        key = stage_key(stage, [digests[i] for i in stage.inputs])
+        meta = stages_meta.get(stage.name)
+
+        if stage.name not in prefetched and reusable(stage, key):
+            status = "reused"
+            out_digests = meta["outputs"]
+            for out in stage.outputs:
+                keys[out] = key
+        else:
+            status = "rebuilt"
+            if stage.name in prefetched:
+                frames, seconds = prefetched[stage.name]
+            else:
+                frames = stage.func(*(value(i) for i in stage.inputs))
+            out_digests = {}
+            for out, df in zip(stage.outputs, frames):
+                out_digests[out] = output_digest(df)
+                keys[out] = key
+                values[out] = df
+                try:
+                    _persist(cache_dir, out, key, df)
+                except (OSError, pa.ArrowException):
+                    pass
+            stages_meta[stage.name] = {"key": key, "outputs": out_digests}
+
+        digests.update(out_digests)
+        if stage.name not in prefetched:
+            seconds = time.perf_counter() - t0
+        report.append({
+            "stage": stage.name,
+            "status": status,
+            "seconds": round(seconds, 3),
+        })
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_manifest(cache_dir, {"inputs": fingerprints, "stages": stages_meta})
+    except OSError:
+        pass
+
+    # Frames base con los diccionarios compartidos
+    base = {"oews_clean", "occ", "skills_clean", "tasks_clean"}
+    dicts = _dicts(*(value(name) for name in DICTIONARY_OUTPUTS)) if base & set(outputs) else None
+    result = {}
+    for name in outputs:
+        df = value(name)
+        result[name] = _encoded(df, dicts) if name in base else df
+
+    return result, pd.DataFrame(report)
+
+
+def main(argv=None):
+    from .load_data import raw_input_paths
+
+    parser = argparse.ArgumentParser(description="Pipeline incremental de datos.")
+    parser.add_argument("--force", action="store_true", help="Recalcular todas las etapas")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos para leer los raw")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    _, report = run_pipeline(raw_input_paths(), force=args.force, workers=args.workers)
+    print(report.to_string(index=False))
+    print(f"total: {time.perf_counter() - t0:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+from collections import Counter
+
+import numpy as np
 import pandas as pd
 
 
@@ -45,30 +48,128 @@ OEWS_COLS = [
 ]
 
 
-def clean_oews(df_raw: pd.DataFrame) -> pd.DataFrame:
-    """Replica la lógica del Notebook1 para limpiar el OEWS."""
+# Tipos declarados por columna (el resto se deja como venga)
+OEWS_SCHEMA = {
+    "AREA": "Int32",
+    "AREA_TITLE": "category",
+    "OCC_TITLE": "category",
+    "TOT_EMP": "Int32",
+    "JOBS_1000": "float32",
+    "LOC_QUOTIENT": "float32",
+    "A_MEAN": "float32",
+    "A_MEDIAN": "float32",
+    "A_PCT10": "float32",
+    "A_PCT90": "float32",
+    "H_MEAN": "float32",
+    "H_MEDIAN": "float32",
+    "AREA_TYPE": "Int8",
+}
+
+# Símbolos de supresión del BLS (se convierten en NaN)
+SUPPRESSION_MARKERS = {
+    "*": "salario no publicable",
+    "**": "empleo no publicable",
+    "#": "salario ≥ 239.200 $/año o 115 $/hora",
+    "~": "menos del 0,5 % de establecimientos",
+}
+
+# Códigos AREA_TYPE del fichero "all data" del BLS
+AREA_LEVELS = {
+    1: "national",
+    2: "state",
+    3: "territory",
+    4: "msa",
+    6: "nonmetro",
+}
+
+# Columnas extra del fichero completo (no existen en el extracto por estado)
+AREA_COLS = ["AREA_TYPE", "PRIM_STATE"]
+
+
+def coerce_oews_schema(
+    df: pd.DataFrame,
+    schema: dict = OEWS_SCHEMA,
+    report: Counter | None = None,
+) -> pd.DataFrame:
+    """
+    Convierte cada columna de `schema` a su tipo declarado.
+
+    En las columnas numéricas los símbolos de SUPPRESSION_MARKERS pasan
+    a NaN con una sola comparación vectorizada por columna; si se pasa
+    `report` (Counter) se acumula cuántas celdas suprimió cada símbolo.
+    """
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        s = df[col]
+
+        if dtype == "category":
+            df[col] = s.astype("category")
+            continue
+
+        if s.dtype == object or pd.api.types.is_string_dtype(s.dtype):
+            text = s.astype("string").str.strip()
+            is_marker = text.isin(list(SUPPRESSION_MARKERS))
+            if report is not None and is_marker.any():
+                report.update(text[is_marker].value_counts().to_dict())
+            s = pd.to_numeric(text.mask(is_marker), errors="coerce")
+
+        if dtype.startswith("Int"):
+            s = s.round()
+        df[col] = s.astype(dtype)
+
+    return df
+
+
+def clean_oews(
+    df_raw: pd.DataFrame,
+    occupations: list[str] | None = SELECTED_OCC,
+    states_only: bool = True,
+    report: Counter | None = None,
+) -> pd.DataFrame:
+    """
+    Replica la lógica del Notebook1 para limpiar el OEWS.
+
+    - occupations: títulos a conservar (None = todas las ocupaciones)
+    - states_only: si es False conserva todos los niveles geográficos
+      (nacional, estado, MSA, no metropolitano) y añade AREA_LEVEL;
+      requiere la columna AREA_TYPE del fichero completo del BLS.
+    - report: Counter donde acumular las celdas suprimidas por símbolo
+    """
     # Filtrar ocupaciones seleccionadas
-    df_occ = df_raw[df_raw["OCC_TITLE"].isin(SELECTED_OCC)].copy()
+    if occupations is not None:
+        df_raw = df_raw[df_raw["OCC_TITLE"].isin(occupations)]
+
+    # Solo filas agregadas de todas las industrias
+    if "I_GROUP" in df_raw.columns:
+        df_raw = df_raw[df_raw["I_GROUP"] == "cross-industry"]
 
     # Seleccionar columnas relevantes
-    df_trim = df_occ[OEWS_COLS].copy()
+    extra = [] if states_only else [c for c in AREA_COLS if c in df_raw.columns]
+    df_trim = df_raw[OEWS_COLS + extra].copy()
 
-    # Reemplazar símbolos especiales
-    df_trim = df_trim.replace({"*": None, "**": None, "~": None, "#": None})
-    df_trim = df_trim.apply(pd.to_numeric, errors="ignore")
+    # Tipos declarados + símbolos especiales → NaN
+    df_trim = coerce_oews_schema(df_trim, report=report)
 
     # Eliminar filas sin salario mediano
     df_trim = df_trim.dropna(subset=["A_MEDIAN"])
 
     # Añadir sigla de estado desde código FIPS (AREA)
     df_trim["STATE_ABBR"] = df_trim["AREA"].map(FIPS_TO_STATE)
-    df_trim = df_trim.dropna(subset=["STATE_ABBR"])
+    if states_only:
+        df_trim = df_trim.dropna(subset=["STATE_ABBR"])
+    else:
+        df_trim["AREA_LEVEL"] = df_trim["AREA_TYPE"].map(AREA_LEVELS).fillna("other")
+        # MSA / no metropolitanas: estado principal del área
+        if "PRIM_STATE" in df_trim.columns:
+            df_trim["STATE_ABBR"] = df_trim["STATE_ABBR"].fillna(df_trim["PRIM_STATE"])
+            df_trim = df_trim.drop(columns="PRIM_STATE")
 
     # Renombrar OCC_CODE a SOC para armonizar con O*NET
     df_trim = df_trim.rename(columns={"OCC_CODE": "SOC"})
 
     # SOC como string normalizado
-    df_trim["SOC"] = df_trim["SOC"].astype(str).str.strip()
-    df_trim["SOC"] = df_trim["SOC"].apply(lambda x: x if "." in x else x + ".00")
+    soc = df_trim["SOC"].astype(str).str.strip()
+    df_trim["SOC"] = np.where(soc.str.contains(".", regex=False), soc, soc + ".00")
 
     return df_trim
@@ -7,28 +7,18 @@ def clean_soc(x):
     return x
 
 
-def load_and_clean_onet(
-    occ_df: pd.DataFrame,
-    skills_df: pd.DataFrame,
-    tasks_df: pd.DataFrame,
-):
-    """
-    Aplica la lógica del Notebook2:
-    - Limpieza de SOC
-    - Filtro de skills (Scale ID = 'IM', Not Relevant != 'Y')
-    - Selección de columnas
-    """
-    # Limpiar SOC
+def clean_occupations(occ_df: pd.DataFrame) -> pd.DataFrame:
+    """Occupation Data: SOC limpio + título y descripción."""
     occ_df["O*NET-SOC Code"] = occ_df["O*NET-SOC Code"].apply(clean_soc)
-    skills_df["O*NET-SOC Code"] = skills_df["O*NET-SOC Code"].apply(clean_soc)
-    tasks_df["O*NET-SOC Code"] = tasks_df["O*NET-SOC Code"].apply(clean_soc)
-
-    # Occupation Data
-    occ = occ_df[["O*NET-SOC Code", "Title", "Description"]].rename(
+    return occ_df[["O*NET-SOC Code", "Title", "Description"]].rename(
         columns={"O*NET-SOC Code": "SOC"}
     )
 
-    # Skills
+
+def clean_skills(skills_df: pd.DataFrame) -> pd.DataFrame:
+    """Skills: filtro (Scale ID = 'IM', Not Relevant != 'Y') y selección de columnas."""
+    skills_df["O*NET-SOC Code"] = skills_df["O*NET-SOC Code"].apply(clean_soc)
+
     skills_clean = skills_df[
         (skills_df["Scale ID"] == "IM") &
         (skills_df["Not Relevant"] != "Y")
@@ -44,13 +34,57 @@ def load_and_clean_onet(
         }
     )
 
-    # Tasks
-    tasks_clean = tasks_df[
-        ["O*NET-SOC Code", "Task ID", "Task", "Task Type"]
-    ].rename(columns={"O*NET-SOC Code": "SOC"})
-
     # Normalización de strings
     skills_clean["SOC"] = skills_clean["SOC"].astype(str).str.strip()
     skills_clean["Skill"] = skills_clean["Skill"].astype(str).str.strip()
+    return skills_clean
 
-    return occ, skills_clean, tasks_clean
+
+def clean_tasks(tasks_df: pd.DataFrame) -> pd.DataFrame:
+    """Task Statements: SOC limpio + columnas de la tarea."""
+    tasks_df["O*NET-SOC Code"] = tasks_df["O*NET-SOC Code"].apply(clean_soc)
+    return tasks_df[
+        ["O*NET-SOC Code", "Task ID", "Task", "Task Type"]
+    ].rename(columns={"O*NET-SOC Code": "SOC"})
+
+
+def clean_descriptors(element_df: pd.DataFrame, domain: str) -> pd.DataFrame:
+    """
+    Tabla de elementos (Skills, Knowledge, Abilities, Work Activities) en
+    formato largo: SOC, Domain, Element, Scale, Value. Se descartan los
+    niveles marcados como no relevantes (Not Relevant = 'Y').
+    """
+    df = element_df[element_df["Not Relevant"] != "Y"]
+    return pd.DataFrame({
+        "SOC": df["O*NET-SOC Code"].astype(str).str.strip().to_numpy(),
+        "Domain": domain,
+        "Element": df["Element Name"].astype(str).str.strip().to_numpy(),
+        "Scale": df["Scale ID"].to_numpy(),
+        "Value": df["Data Value"].to_numpy(dtype="float32"),
+    })
+
+
+def load_and_clean_onet(
+    occ_df: pd.DataFrame,
+    skills_df: pd.DataFrame,
+    tasks_df: pd.DataFrame,
+    descriptor_dfs: dict[str, pd.DataFrame] | None = None,
+):
+    """
+    Aplica la lógica del Notebook2:
+    - Limpieza de SOC
+    - Filtro de skills (Scale ID = 'IM', Not Relevant != 'Y')
+    - Selección de columnas
+
+    Con `descriptor_dfs` (dominio → tabla de elementos, p. ej.
+    {"skills": ..., "knowledge": ...}) devuelve además los descriptores
+    del recomendador en formato largo (ver `clean_descriptors`).
+    """
+    cleaned = (clean_occupations(occ_df), clean_skills(skills_df), clean_tasks(tasks_df))
+    if descriptor_dfs is None:
+        return cleaned
+    descriptors = pd.concat(
+        [clean_descriptors(df, domain) for domain, df in descriptor_dfs.items()],
+        ignore_index=True,
+    )
+    return cleaned + (descriptors,)
@@ -0,0 +1,78 @@
+"""
+Recomendador por lotes sin interfaz (uso offline).
+
+Entrada: CSV ancho con una fila por usuario y una columna por skill
+(peso o nivel de la habilidad); opcionalmente una columna de id.
+
+    python -m src.recommend_cli cohorte.csv -o recomendaciones.csv \\
+        --top-n 10 --id-column student_id
+"""
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from .load_data import load_all_data
+from .recommender import recommend_batch
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Recomienda ocupaciones para una cohorte de perfiles de skills."
+    )
+    parser.add_argument("input", help="CSV con una fila por usuario y una columna por skill")
+    parser.add_argument("-o", "--output", default="-", help="CSV de salida (por defecto stdout)")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--id-column", default=None, help="Columna con el id de usuario")
+    parser.add_argument(
+        "--chunk-size", type=int, default=10_000,
+        help="Filas del CSV de entrada procesadas por bloque",
+    )
+    parser.add_argument(
+        "--backend", choices=["exact", "lsh"], default="exact",
+        help="Búsqueda exacta o aproximada (LSH)",
+    )
+    parser.add_argument("--lsh-tables", type=int, default=16)
+    parser.add_argument("--lsh-bits", type=int, default=16)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    df_rec = load_all_data()[3]
+
+    backend_params = None
+    if args.backend == "lsh":
+        backend_params = {"n_tables": args.lsh_tables, "n_bits": args.lsh_bits}
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    n_users = 0
+    t0 = time.perf_counter()
+
+    try:
+        reader = pd.read_csv(
+            args.input,
+            chunksize=args.chunk_size,
+            index_col=args.id_column,
+        )
+        header = True
+        for chunk in reader:
+            results = recommend_batch(
+                df_rec, chunk, top_n=args.top_n,
+                backend=args.backend, backend_params=backend_params,
+            )
+            for result in results:
+                result.to_csv(out, index=False, header=header)
+                header = False
+            n_users += len(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - t0
+    print(f"{n_users} perfiles procesados en {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
+import json
+from dataclasses import dataclass
+
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.metrics.pairwise import cosine_similarity
+
+from .artifacts import ARTIFACTS_DIR, cache_by_frame, frame_digest
+from .soc_index import get_skills_index
+
+
+RECOMMENDER_DIR = ARTIFACTS_DIR / "recommender"
+DESCRIPTORS_DIR = ARTIFACTS_DIR / "descriptors"
 
 
 def build_recommender_matrices(df_rec: pd.DataFrame):
@@ -11,12 +19,15 @@ def build_recommender_matrices(df_rec: pd.DataFrame):
     - occ_skill_scaled: matriz ocupación × skill escalada
     - all_skills: lista de skills en el mismo orden que columnas
     """
+    from sklearn.preprocessing import MinMaxScaler
+
     occ_skill = (
         df_rec.pivot_table(
             index=["SOC", "Title"],
             columns="Skill",
             values="Importance",
             aggfunc="mean",
+            observed=True,
         )
         .fillna(0)
     )
@@ -32,6 +43,130 @@ def build_recommender_matrices(df_rec: pd.DataFrame):
     return occ_skill_scaled, all_skills
 
 
+# ============================================================
+#   ARTEFACTO PRECALCULADO (matriz float32 + índices)
+# ============================================================
+
+class SkillVocabulary:
+    """
+    Vocabulario de skills con correspondencia nombre → columna en O(1).
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def get(self, name, default=None):
+        return self.index.get(name, default)
+
+    def sparse_vector(self, weights: dict):
+        """
+        Vector de usuario disperso: (columnas, pesos) solo para las skills
+        conocidas con peso distinto de cero.
+        """
+        pairs = [
+            (self.index[name], w)
+            for name, w in weights.items()
+            if name in self.index and w
+        ]
+        cols = np.fromiter((c for c, _ in pairs), dtype=np.intp, count=len(pairs))
+        vals = np.fromiter((w for _, w in pairs), dtype=np.float32, count=len(pairs))
+        return cols, vals
+
+    def dense_vector(self, weights: dict) -> np.ndarray:
+        vec = np.zeros(len(self), dtype=np.float32)
+        cols, vals = self.sparse_vector(weights)
+        vec[cols] = vals
+        return vec
+
+
+@dataclass
+class RecommenderArtifact:
+    """
+    Matriz ocupación × skill ya escalada, lista para el producto
+    matriz-vector de la similitud coseno.
+    """
+    matrix: np.ndarray          # (n_occ, n_skills) float32
+    norms: np.ndarray           # (n_occ,) float32, norma L2 de cada fila
+    socs: list[str]
+    titles: list[str]
+    vocab: SkillVocabulary
+
+    @property
+    def skills(self) -> list[str]:
+        return self.vocab.names
+
+    def save(self, path):
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "matrix.npy", self.matrix)
+        np.save(path / "norms.npy", self.norms)
+        index = {"socs": self.socs, "titles": self.titles, "skills": self.skills}
+        (path / "index.json").write_text(json.dumps(index))
+
+    @classmethod
+    def load(cls, path):
+        index = json.loads((path / "index.json").read_text())
+        return cls(
+            matrix=np.load(path / "matrix.npy", mmap_mode="r"),
+            norms=np.load(path / "norms.npy", mmap_mode="r"),
+            socs=index["socs"],
+            titles=index["titles"],
+            vocab=SkillVocabulary(index["skills"]),
+        )
+
+
+def build_recommender_artifact(df_rec: pd.DataFrame) -> RecommenderArtifact:
+    occ_skill_scaled, all_skills = build_recommender_matrices(df_rec)
+    matrix = np.ascontiguousarray(occ_skill_scaled.values, dtype=np.float32)
+
+    return RecommenderArtifact(
+        matrix=matrix,
+        norms=np.linalg.norm(matrix, axis=1).astype(np.float32),
+        socs=list(occ_skill_scaled.index.get_level_values("SOC")),
+        titles=list(occ_skill_scaled.index.get_level_values("Title")),
+        vocab=SkillVocabulary(all_skills),
+    )
+
+
+@cache_by_frame
+def get_recommender_artifact(df_rec: pd.DataFrame) -> RecommenderArtifact:
+    """
+    Devuelve el artefacto para `df_rec`: en memoria si ya se calculó
+    en este proceso, desde data/cache/artifacts si existe en disco
+    (con mmap) y, si no, lo construye y lo persiste.
+    """
+    path = RECOMMENDER_DIR / frame_digest(df_rec)
+    if (path / "index.json").exists():
+        try:
+            return RecommenderArtifact.load(path)
+        except (OSError, ValueError):
+            pass
+
+    artifact = build_recommender_artifact(df_rec)
+    try:
+        artifact.save(path)
+    except OSError:
+        pass
+    return artifact
+
+
+def cosine_scores(artifact: RecommenderArtifact, cols: np.ndarray, vals: np.ndarray) -> np.ndarray:
+    """
+    Similitud coseno de un vector de usuario disperso (cols, vals)
+    contra todas las ocupaciones: solo se leen las columnas usadas.
+    """
+    user_norm = np.linalg.norm(vals)
+    denom = artifact.norms * user_norm
+    dots = artifact.matrix[:, cols] @ vals
+    return np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+
+
 def recommend_occupations(
     df_rec: pd.DataFrame,
     user_skills: list[str],
@@ -44,35 +179,501 @@ def recommend_occupations(
     if not user_skills:
         return pd.DataFrame(columns=["SOC", "Title", "Similarity"])
 
-    occ_skill_scaled, all_skills = build_recommender_matrices(df_rec)
-
-    user_vec = np.zeros(len(all_skills))
+    artifact = get_recommender_artifact(df_rec)
 
     if skill_weights is None:
         skill_weights = {s: 1.0 for s in user_skills}
 
-    for skill, w in skill_weights.items():
-        if skill in all_skills:
-            idx = all_skills.index(skill)
-            user_vec[idx] = w
+    cols, vals = artifact.vocab.sparse_vector(skill_weights)
+    sims = cosine_scores(artifact, cols, vals)
 
-    user_vec = user_vec.reshape(1, -1)
-    sims = cosine_similarity(user_vec, occ_skill_scaled.values)[0]
+    # Top-k parcial: solo se construyen las top_n filas del resultado
+    top = top_k_indices(sims, top_n)
 
-    result = pd.DataFrame(
+    return pd.DataFrame(
         {
-            "SOC": occ_skill_scaled.index.get_level_values("SOC"),
-            "Title": occ_skill_scaled.index.get_level_values("Title"),
-            "Similarity": sims,
+            "SOC": [artifact.socs[i] for i in top],
+            "Title": [artifact.titles[i] for i in top],
+            "Similarity": sims[top],
+        },
+        index=top,
+    )
+
+
+# ============================================================
+#   DESCRIPTORES AMPLIADOS (matriz dispersa por dominios)
+# ============================================================
+
+DOMAIN_LABELS = {
+    "skills": "Habilidades",
+    "knowledge": "Conocimientos",
+    "abilities": "Aptitudes",
+    "work_activities": "Actividades laborales",
+}
+
+# Peso por defecto de cada dominio y de cada escala en el vector de usuario
+DOMAIN_WEIGHTS = {"skills": 1.0, "knowledge": 1.0, "abilities": 1.0, "work_activities": 1.0}
+SCALE_WEIGHTS = {"IM": 1.0, "LV": 0.5}
+
+# Valores escalados por debajo de este umbral se descartan de la matriz
+DESCRIPTOR_THRESHOLD = 0.05
+
+
+def feature_name(domain: str, element: str, scale: str) -> str:
+    return f"{domain}:{element}:{scale}"
+
+
+@dataclass
+class DescriptorArtifact:
+    """
+    Matriz ocupación × descriptor (dominio, elemento, escala) en CSR.
+
+    Cada columna está escalada a [0, 1] como en `build_recommender_matrices`
+    y los valores bajo DESCRIPTOR_THRESHOLD se eliminan, así que la memoria
+    crece con los descriptores relevantes de cada ocupación y no con el
+    número de columnas. Los pesos por dominio se aplican en la consulta:
+    `domain_norms` guarda la norma² de cada fila restringida a cada dominio,
+    de modo que la norma ponderada es sqrt(Σ w_d² · n_d²) sin tocar la matriz.
+    """
+    matrix: "scipy.sparse.csr_matrix"   # (n_occ, n_features) float32
+    domain_norms: np.ndarray    # (n_occ, n_domains) float32, norma² por dominio
+    feature_domains: np.ndarray  # (n_features,) int, dominio de cada columna
+    domains: list[str]
+    socs: list[str]
+    titles: list[str]
+    vocab: SkillVocabulary      # nombres "dominio:elemento:escala"
+
+    def __post_init__(self):
+        self._csc = None
+
+    @property
+    def columns(self) -> "scipy.sparse.csc_matrix":
+        """Copia CSC (perezosa) para extraer columnas sueltas en la consulta."""
+        if self._csc is None:
+            self._csc = self.matrix.tocsc()
+        return self._csc
+
+    def elements(self, domain: str) -> list[str]:
+        """Elementos disponibles de `domain`, ordenados y sin repetir por escala."""
+        prefix = f"{domain}:"
+        return sorted({
+            name[len(prefix):].rsplit(":", 1)[0]
+            for name in self.vocab.names
+            if name.startswith(prefix)
+        })
+
+    def save(self, path):
+        import scipy.sparse as sp
+
+        path.mkdir(parents=True, exist_ok=True)
+        sp.save_npz(path / "matrix.npz", self.matrix)
+        np.save(path / "domain_norms.npy", self.domain_norms)
+        np.save(path / "feature_domains.npy", self.feature_domains)
+        index = {
+            "socs": self.socs,
+            "titles": self.titles,
+            "features": self.vocab.names,
+            "domains": self.domains,
         }
-    ).sort_values("Similarity", ascending=False)
+        (path / "index.json").write_text(json.dumps(index))
+
+    @classmethod
+    def load(cls, path):
+        import scipy.sparse as sp
+
+        index = json.loads((path / "index.json").read_text())
+        return cls(
+            matrix=sp.load_npz(path / "matrix.npz").tocsr(),
+            domain_norms=np.load(path / "domain_norms.npy", mmap_mode="r"),
+            feature_domains=np.load(path / "feature_domains.npy"),
+            domains=index["domains"],
+            socs=index["socs"],
+            titles=index["titles"],
+            vocab=SkillVocabulary(index["features"]),
+        )
+
+
+def build_descriptor_artifact(
+    descriptors: pd.DataFrame,
+    threshold: float = DESCRIPTOR_THRESHOLD,
+) -> DescriptorArtifact:
+    """
+    descriptors: columnas ['SOC', 'Title', 'Domain', 'Element', 'Scale', 'Value']
+    (ver `load_data.load_descriptors`).
+    """
+    import scipy.sparse as sp
+
+    features = (
+        descriptors["Domain"].astype(str) + ":"
+        + descriptors["Element"].astype(str) + ":"
+        + descriptors["Scale"].astype(str)
+    )
+    rows, socs = pd.factorize(descriptors["SOC"].astype(str), sort=True)
+    cols, names = pd.factorize(features, sort=True)
+
+    # Media por celda (como pivot_table con aggfunc="mean")
+    shape = (len(socs), len(names))
+    values = descriptors["Value"].to_numpy(dtype=np.float64)
+    total = sp.coo_matrix((values, (rows, cols)), shape=shape).tocsr()
+    count = sp.coo_matrix((np.ones_like(values), (rows, cols)), shape=shape).tocsr()
+    total.data /= count.data
+
+    # Min-max por columna contando los ceros implícitos, igual que
+    # MinMaxScaler sobre la matriz densa con fillna(0)
+    filled = np.diff(total.tocsc().indptr)
+    col_max = total.max(axis=0).toarray().ravel()
+    col_min = total.min(axis=0).toarray().ravel()
+    col_min = np.where(filled < shape[0], np.minimum(col_min, 0), col_min)
+    span = np.where(col_max > col_min, col_max - col_min, 1.0)
+
+    matrix = total.tocoo()
+    scaled = (matrix.data - col_min[matrix.col]) / span[matrix.col]
+    keep = scaled >= threshold
+    matrix = sp.csr_matrix(
+        (scaled[keep].astype(np.float32), (matrix.row[keep], matrix.col[keep])),
+        shape=shape,
+    )
+
+    domains = sorted({name.split(":", 1)[0] for name in names})
+    feature_domains = np.searchsorted(domains, [name.split(":", 1)[0] for name in names])
+
+    # Norma² de cada fila por dominio
+    coo = matrix.tocoo()
+    domain_norms = np.zeros((shape[0], len(domains)), dtype=np.float32)
+    np.add.at(domain_norms, (coo.row, feature_domains[coo.col]), coo.data ** 2)
+
+    titles = (
+        descriptors.drop_duplicates("SOC")
+        .assign(SOC=lambda d: d["SOC"].astype(str))
+        .set_index("SOC")["Title"]
+        .reindex(socs)
+        .astype(str)
+    )
+
+    return DescriptorArtifact(
+        matrix=matrix,
+        domain_norms=domain_norms,
+        feature_domains=feature_domains,
+        domains=domains,
+        socs=list(socs),
+        titles=list(titles),
+        vocab=SkillVocabulary(names),
+    )
+
+
+@cache_by_frame
+def get_descriptor_artifact(descriptors: pd.DataFrame) -> DescriptorArtifact:
+    """Como `get_recommender_artifact`, para la matriz de descriptores."""
+    path = DESCRIPTORS_DIR / frame_digest(descriptors)
+    if (path / "index.json").exists():
+        try:
+            return DescriptorArtifact.load(path)
+        except (OSError, ValueError):
+            pass
+
+    artifact = build_descriptor_artifact(descriptors)
+    try:
+        artifact.save(path)
+    except OSError:
+        pass
+    return artifact
+
+
+def recommend_by_descriptors(
+    descriptors: pd.DataFrame,
+    selections: dict[str, list[str]],
+    top_n: int = 10,
+    domain_weights: dict | None = None,
+):
+    """
+    Recomendación sobre la matriz de descriptores.
+
+    selections: dominio → elementos elegidos, p. ej.
+    {"skills": ["Programming"], "knowledge": ["Mathematics"]}. Cada
+    elemento aporta sus escalas con SCALE_WEIGHTS. `domain_weights`
+    (por defecto DOMAIN_WEIGHTS) multiplica las columnas de cada dominio
+    en los dos lados del coseno; un peso 0 ignora el dominio.
+
+    Devuelve un DataFrame con columnas: SOC, Title, Similarity
+    """
+    artifact = get_descriptor_artifact(descriptors)
+    weights = {**DOMAIN_WEIGHTS, **(domain_weights or {})}
+
+    user = {
+        feature_name(domain, element, scale): w
+        for domain, elements in selections.items()
+        for element in elements
+        for scale, w in SCALE_WEIGHTS.items()
+    }
+    cols, vals = artifact.vocab.sparse_vector(user)
+    w = np.array([weights.get(d, 0.0) for d in artifact.domains], dtype=np.float32)
+    w_cols = w[artifact.feature_domains[cols]]
+    if not np.any(w_cols):
+        return pd.DataFrame(columns=["SOC", "Title", "Similarity"])
+
+    # cos(Wx, Wq) = Σ w² x q / (‖Wx‖ ‖Wq‖)
+    dots = artifact.columns[:, cols] @ (vals * w_cols ** 2)
+    occ_norms = np.sqrt(artifact.domain_norms @ (w ** 2))
+    denom = occ_norms * np.linalg.norm(vals * w_cols)
+    sims = np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+
+    top = top_k_indices(sims, top_n)
+
+    return pd.DataFrame(
+        {
+            "SOC": [artifact.socs[i] for i in top],
+            "Title": [artifact.titles[i] for i in top],
+            "Similarity": sims[top],
+        },
+        index=top,
+    )
+
+
+# ============================================================
+#   RECOMENDACIÓN POR LOTES (cohortes de usuarios)
+# ============================================================
+
+def profiles_to_matrix(artifact: RecommenderArtifact, profiles) -> np.ndarray:
+    """
+    Convierte perfiles de usuario a una matriz (N, n_skills) float32
+    alineada con las columnas del artefacto. Acepta:
+    - np.ndarray ya alineado con `artifact.skills`
+    - DataFrame con una columna por skill (se ignoran las desconocidas)
+    - lista de dicts {skill: peso}
+    """
+    n_skills = len(artifact.vocab)
+
+    if isinstance(profiles, np.ndarray):
+        if profiles.ndim != 2 or profiles.shape[1] != n_skills:
+            raise ValueError(
+                f"Se esperaba una matriz (N, {n_skills}), no {profiles.shape}"
+            )
+        return profiles.astype(np.float32, copy=False)
+
+    if isinstance(profiles, pd.DataFrame):
+        return (
+            profiles.reindex(columns=artifact.skills)
+            .fillna(0)
+            .to_numpy(dtype=np.float32)
+        )
+
+    weights = np.zeros((len(profiles), n_skills), dtype=np.float32)
+    for row, skill_weights in enumerate(profiles):
+        cols, vals = artifact.vocab.sparse_vector(skill_weights)
+        weights[row, cols] = vals
+    return weights
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Índices de los k mayores valores por fila, ordenados de mayor a menor.
+    `argpartition` es O(n) por fila; solo se ordenan los k elegidos.
+    """
+    n = scores.shape[-1]
+    k = min(k, n)
+    if k < n:
+        part = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        part = np.broadcast_to(np.arange(n), scores.shape).copy()
+    part_scores = np.take_along_axis(scores, part, axis=-1)
+    order = np.argsort(-part_scores, axis=-1, kind="stable")
+    return np.take_along_axis(part, order, axis=-1)
+
+
+# ============================================================
+#   BACKENDS DE SIMILITUD (exacto / aproximado)
+# ============================================================
+
+class ExactBackend:
+    """Coseno exacto por fuerza bruta: un producto matricial por lote."""
+
+    name = "exact"
+
+    def __init__(self, matrix: np.ndarray, norms: np.ndarray):
+        self.matrix_t = np.ascontiguousarray(np.asarray(matrix, dtype=np.float32).T)
+        self.norms = np.asarray(norms, dtype=np.float32)
 
-    return result.head(top_n)
+    def search(self, queries: np.ndarray, k: int):
+        """Devuelve (índices, similitudes) de forma (n_queries, k)."""
+        dots = queries @ self.matrix_t
+        denom = np.linalg.norm(queries, axis=1)[:, None] * self.norms[None, :]
+        sims = np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+
+        top = top_k_indices(sims, k)
+        return top, np.take_along_axis(sims, top, axis=1)
+
+
+class LSHBackend:
+    """
+    Vecinos aproximados con LSH de hiperplanos aleatorios (coseno).
+
+    Cada una de las `n_tables` tablas proyecta las filas normalizadas
+    sobre `n_bits` hiperplanos y agrupa las filas por el signo de la
+    proyección. Una consulta solo re-puntúa (de forma exacta) las filas
+    que comparten cubo en alguna tabla; con `probe_radius=1` también
+    visita los cubos a distancia Hamming 1 (multi-probe).
+
+    Compromiso recall/latencia:
+    - más `n_tables` o `probe_radius` → más candidatos, más recall
+    - más `n_bits` → cubos más pequeños, menos candidatos, más rápido
+    Si una consulta reúne menos de k candidatos se resuelve en exacto.
+    """
+
+    name = "lsh"
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        norms: np.ndarray,
+        n_tables: int = 16,
+        n_bits: int = 16,
+        probe_radius: int = 1,
+        seed: int = 42,
+    ):
+        if not 1 <= n_bits <= 62:
+            raise ValueError("n_bits debe estar entre 1 y 62")
+        if probe_radius not in (0, 1):
+            raise ValueError("probe_radius debe ser 0 o 1")
+
+        matrix = np.asarray(matrix, dtype=np.float32)
+        norms = np.asarray(norms, dtype=np.float32)
+        safe = np.where(norms > 0, norms, 1.0)[:, None]
+        self.unit = np.ascontiguousarray(matrix / safe)
+        # Centrar antes de proyectar: con datos no negativos todas las
+        # filas caen en el mismo ortante y los hiperplanos discriminan mal.
+        self.center = self.unit.mean(axis=0)
+        self.n_bits = n_bits
+        self.probe_radius = probe_radius
+        self._exact = ExactBackend(matrix, norms)
+
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal(
+            (n_tables, matrix.shape[1], n_bits)
+        ).astype(np.float32)
+        self._bit_values = (1 << np.arange(n_bits, dtype=np.int64))
+
+        # Por tabla: códigos ordenados + orden de filas (estilo CSR)
+        self.tables = []
+        for planes in self.planes:
+            codes = self._hash(self.unit, planes)
+            order = np.argsort(codes, kind="stable")
+            self.tables.append((codes[order], order))
+
+    def _hash(self, x: np.ndarray, planes: np.ndarray) -> np.ndarray:
+        bits = ((x - self.center) @ planes) > 0
+        return bits.astype(np.int64) @ self._bit_values
+
+    def _candidates(self, query_codes: np.ndarray) -> np.ndarray:
+        found = []
+        for t, (sorted_codes, order) in enumerate(self.tables):
+            code = query_codes[t]
+            probes = [code]
+            if self.probe_radius:
+                probes.extend(code ^ self._bit_values)
+            probes = np.asarray(probes)
+            lo = np.searchsorted(sorted_codes, probes, side="left")
+            hi = np.searchsorted(sorted_codes, probes, side="right")
+            found.extend(order[i:j] for i, j in zip(lo, hi) if j > i)
+        if not found:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate(found))
+
+    def search(self, queries: np.ndarray, k: int):
+        queries = np.asarray(queries, dtype=np.float32)
+        q_norms = np.linalg.norm(queries, axis=1)
+        unit_q = queries / np.where(q_norms > 0, q_norms, 1.0)[:, None]
+
+        k = min(k, len(self.unit))
+        codes = np.stack(
+            [self._hash(unit_q, planes) for planes in self.planes], axis=1
+        )
+
+        top = np.empty((len(queries), k), dtype=np.intp)
+        sims = np.empty((len(queries), k), dtype=np.float32)
+
+        for i, q in enumerate(unit_q):
+            cand = self._candidates(codes[i])
+            if len(cand) < k or q_norms[i] == 0:
+                idx, val = self._exact.search(queries[i:i + 1], k)
+                top[i], sims[i] = idx[0], val[0]
+                continue
+            cand_sims = self.unit[cand] @ q
+            best = top_k_indices(cand_sims, k)
+            top[i] = cand[best]
+            sims[i] = cand_sims[best]
+
+        return top, sims
+
+
+SIMILARITY_BACKENDS = {
+    "exact": ExactBackend,
+    "lsh": LSHBackend,
+}
+
+
+@cache_by_frame
+def get_similarity_backend(df_rec: pd.DataFrame, kind: str = "exact", **params):
+    """Backend de similitud construido (una vez) sobre el artefacto de `df_rec`."""
+    if kind not in SIMILARITY_BACKENDS:
+        raise ValueError(
+            f"Backend desconocido: {kind!r} (opciones: {sorted(SIMILARITY_BACKENDS)})"
+        )
+    artifact = get_recommender_artifact(df_rec)
+    return SIMILARITY_BACKENDS[kind](artifact.matrix, artifact.norms, **params)
+
+
+def recommend_batch(
+    df_rec: pd.DataFrame,
+    profiles,
+    top_n: int = 10,
+    batch_size: int = 4096,
+    user_ids=None,
+    backend: str = "exact",
+    backend_params: dict | None = None,
+):
+    """
+    Recomienda ocupaciones para muchos usuarios a la vez.
+
+    Genera un DataFrame largo por lote con columnas
+    User, Rank, SOC, Title, Similarity (top_n filas por usuario).
+    Cada lote es un único producto matricial (batch_size × n_occ), así
+    que la memoria queda acotada aunque haya cientos de miles de perfiles.
+    `backend="lsh"` usa búsqueda aproximada (ver `LSHBackend`).
+    """
+    artifact = get_recommender_artifact(df_rec)
+    searcher = get_similarity_backend(df_rec, backend, **(backend_params or {}))
+    weights = profiles_to_matrix(artifact, profiles)
+
+    if user_ids is None:
+        if isinstance(profiles, pd.DataFrame):
+            user_ids = profiles.index.to_numpy()
+        else:
+            user_ids = np.arange(len(weights))
+    user_ids = np.asarray(user_ids)
+
+    socs = np.asarray(artifact.socs, dtype=object)
+    titles = np.asarray(artifact.titles, dtype=object)
+
+    for start in range(0, len(weights), batch_size):
+        block = weights[start:start + batch_size]
+        top, sims = searcher.search(block, top_n)
+        k = top.shape[1]
+
+        yield pd.DataFrame(
+            {
+                "User": np.repeat(user_ids[start:start + len(block)], k),
+                "Rank": np.tile(np.arange(1, k + 1), len(block)),
+                "SOC": socs[top].ravel(),
+                "Title": titles[top].ravel(),
+                "Similarity": sims.ravel(),
+            }
+        )
 
 
 def top_skills_for_soc(df_rec: pd.DataFrame, soc: str, top_k: int = 15):
+    rows = get_skills_index(df_rec).positions(soc)
     occ_skills = (
-        df_rec[df_rec["SOC"] == soc][["Skill", "Importance"]]
+        df_rec.iloc[rows][["Skill", "Importance"]]
         .sort_values("Importance", ascending=False)
         .head(top_k)
     )
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+from .artifacts import cache_by_frame
+from .encoding import ids
+
+
+class SkillWageMatrix:
+    """
+    df_plot en forma de arrays alineados por SOC.
+
+    - importance: (n_soc, n_skills) importancia media, NaN si la skill no aplica
+    - wages: (n_soc,) salario medio anual
+    - socs / titles: SOC y OCC_TITLE de cada fila; skills: nombre de cada columna
+
+    Los gráficos de skills filtran filas por título y reducen columnas
+    con `nanmean`, en lugar de volver a agrupar el frame largo
+    (una fila por SOC × skill) en cada llamada.
+
+    `profiles` guarda además el perfil de cada OCC_TITLE (una fila por
+    título, 0 donde la skill no aplica): comparar N ocupaciones es un
+    único indexado con `profiles_for`.
+    """
+
+    def __init__(self, df_plot: pd.DataFrame):
+        rows = ids(df_plot["SOC"])
+        cols = ids(df_plot["Skill_Name"])
+        valid = (rows >= 0) & (cols >= 0)
+        rows, cols = rows[valid], cols[valid]
+
+        # Solo los SOC y skills presentes (las categorías son compartidas)
+        soc_used, rows = np.unique(rows, return_inverse=True)
+        skill_used, cols = np.unique(cols, return_inverse=True)
+        soc_labels = _labels(df_plot["SOC"])[soc_used]
+        skill_labels = _labels(df_plot["Skill_Name"])[skill_used]
+
+        shape = (len(soc_used), len(skill_used))
+        importance = df_plot["Importance"].to_numpy(dtype=float)[valid]
+        present = ~np.isnan(importance)
+        # Suma y número de filas por celda: las medias sobre varios SOC
+        # ponderan por filas, como un groupby sobre df_plot
+        self._total = np.zeros(shape)
+        self._count = np.zeros(shape)
+        np.add.at(self._total, (rows, cols), np.where(present, importance, 0.0))
+        np.add.at(self._count, (rows, cols), present)
+        with np.errstate(invalid="ignore"):
+            self.importance = self._total / self._count     # 0/0 → NaN
+
+        wages = df_plot["A_MEAN"].to_numpy(dtype=float)[valid]
+        # Salario medio por SOC (como groupby("SOC")["A_MEAN"].mean())
+        self.wages = np.bincount(rows, wages, shape[0]) / np.bincount(rows, minlength=shape[0])
+
+        titles = df_plot["OCC_TITLE"].to_numpy(dtype=object)[valid]
+        first = np.zeros(shape[0], dtype=np.intp)
+        first[rows[::-1]] = np.arange(len(rows))[::-1]
+        self.titles = titles[first]
+
+        self.socs = list(soc_labels)
+        self.skills = list(skill_labels)
+        self._title_rows = pd.Series(np.arange(shape[0])).groupby(self.titles).apply(np.asarray).to_dict()
+
+        # Perfil por título: media de las filas de todos sus SOC
+        codes, names = pd.factorize(self.titles, sort=True)
+        sums = np.zeros((len(names), shape[1]))
+        counts = np.zeros((len(names), shape[1]))
+        np.add.at(sums, codes, self._total)
+        np.add.at(counts, codes, self._count)
+        with np.errstate(invalid="ignore"):
+            self.profiles = np.nan_to_num(sums / counts)
+        self.profile_titles = list(names)
+        self._profile_index = {title: i for i, title in enumerate(self.profile_titles)}
+
+    def rows(self, titles) -> np.ndarray:
+        """Filas (SOC) cuyas OCC_TITLE están en `titles`."""
+        found = [self._title_rows[t] for t in titles if t in self._title_rows]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.intp)
+
+    def profiles_for(self, titles, skills=None) -> pd.DataFrame:
+        """
+        Perfiles de `titles` (en ese orden, sin los desconocidos) como
+        DataFrame título × skill; `skills` limita y ordena las columnas.
+        """
+        titles = [t for t in titles if t in self._profile_index]
+        rows = [self._profile_index[t] for t in titles]
+        if skills is None:
+            return pd.DataFrame(self.profiles[rows], index=titles, columns=self.skills)
+        cols = pd.Index(self.skills).get_indexer(skills)
+        block = self.profiles[np.ix_(rows, cols)]
+        block[:, cols < 0] = 0.0
+        return pd.DataFrame(block, index=titles, columns=list(skills))
+
+    def mean_importance(self, rows=None) -> pd.Series:
+        """
+        Importancia media por skill sobre `rows` (todas si es None), sin NaN.
+        Igual que `groupby("Skill_Name")["Importance"].mean()` sobre esas filas.
+        """
+        total = self._total if rows is None else self._total[rows]
+        count = self._count if rows is None else self._count[rows]
+        total, count = total.sum(axis=0), count.sum(axis=0)
+        keep = count > 0
+        return pd.Series(
+            total[keep] / count[keep], index=np.asarray(self.skills, dtype=object)[keep]
+        )
+
+
+def _labels(s: pd.Series) -> np.ndarray:
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.categories.to_numpy(dtype=object)
+    return np.asarray(pd.factorize(s)[1], dtype=object)
+
+
+@cache_by_frame
+def get_skill_wage_matrix(df_plot: pd.DataFrame) -> SkillWageMatrix:
+    return SkillWageMatrix(df_plot)
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+CACHE_DIR = BASE_DIR / "data" / "cache"
+SNAPSHOT_DIR = CACHE_DIR / "snapshot"
+MANIFEST_PATH = SNAPSHOT_DIR / "manifest.json"
+
+# Subir esta versión cuando cambie la lógica de limpieza o unión:
+# invalida todos los snapshots existentes aunque los raw no cambien.
+SNAPSHOT_VERSION = 5
+
+FRAME_NAMES = [
+    "oews_clean", "merged", "df_plot", "df_rec",
+    "occ", "skills_clean", "tasks_clean",
+]
+
+# Frames persistidos: los de `load_all_data()` más los descriptores O*NET
+# del recomendador, producidos en la misma ejecución del pipeline
+SNAPSHOT_FRAMES = FRAME_NAMES + ["descriptors"]
+
+
+# ============================================================
+#   HUELLAS DE LOS FICHEROS RAW
+# ============================================================
+
+def _sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_fingerprint(path: Path, previous: dict | None = None) -> dict:
+    """
+    Huella de un fichero: tamaño, mtime y hash SHA-256 del contenido.
+
+    Si `previous` coincide en tamaño y mtime se reutiliza su hash,
+    así un arranque en caliente solo hace un stat() por fichero.
+    """
+    stat = path.stat()
+    fp = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    if (
+        previous is not None
+        and previous.get("size") == fp["size"]
+        and previous.get("mtime_ns") == fp["mtime_ns"]
+    ):
+        fp["sha256"] = previous["sha256"]
+    else:
+        fp["sha256"] = _sha256(path)
+    return fp
+
+
+def inputs_fingerprint(paths: dict[str, Path], previous: dict | None = None) -> dict:
+    previous = previous or {}
+    return {
+        name: file_fingerprint(path, previous.get(name))
+        for name, path in sorted(paths.items())
+    }
+
+
+def snapshot_key(fingerprints: dict) -> str:
+    """
+    Clave del snapshot: versión + tamaño y hash de cada entrada.
+    El mtime no entra en la clave (un `touch` no debe forzar la
+    reconstrucción); solo sirve para evitar recalcular hashes.
+    """
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "inputs": {
+            name: [fp["size"], fp["sha256"]]
+            for name, fp in sorted(fingerprints.items())
+        },
+    }
+    raw = json.dumps(payload, sort_keys=True).encode()
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+# ============================================================
+#   LECTURA / ESCRITURA
+# ============================================================
+
+def _read_manifest() -> dict | None:
+    if not MANIFEST_PATH.exists():
+        return None
+    try:
+        return json.loads(MANIFEST_PATH.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(manifest: dict):
+    tmp = MANIFEST_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    tmp.replace(MANIFEST_PATH)
+
+
+def _frame_path(snapshot_dir: Path, name: str) -> Path:
+    return snapshot_dir / f"{name}.arrow"
+
+
+def write_frame(df: pd.DataFrame, path: Path):
+    """Escribe un DataFrame como Arrow IPC sin compresión (apto para mmap)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    feather.write_feather(table, path, compression="uncompressed")
+
+
+def read_frame(path: Path) -> pd.DataFrame:
+    """Lee un Arrow IPC con memory mapping (sin copiar el fichero a RAM)."""
+    table = feather.read_table(path, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+def load_snapshot(paths: dict[str, Path]):
+    """
+    Devuelve los DataFrames del snapshot (en el orden de SNAPSHOT_FRAMES)
+    si sigue siendo válido para los ficheros raw actuales; None en caso
+    contrario.
+    """
+    manifest = _read_manifest()
+    if manifest is None or manifest.get("version") != SNAPSHOT_VERSION:
+        return None
+
+    try:
+        fingerprints = inputs_fingerprint(paths, manifest.get("inputs"))
+    except OSError:
+        return None
+
+    key = snapshot_key(fingerprints)
+    snapshot_dir = SNAPSHOT_DIR / key
+    if key != manifest.get("key") or not snapshot_dir.exists():
+        return None
+
+    try:
+        frames = tuple(
+            read_frame(_frame_path(snapshot_dir, name))
+            for name in SNAPSHOT_FRAMES
+        )
+    except (OSError, pa.ArrowException):
+        return None
+
+    # Mismo contenido pero mtime distinto: actualizar para no re-hashear
+    if fingerprints != manifest.get("inputs"):
+        manifest["inputs"] = fingerprints
+        _write_manifest(manifest)
+
+    return frames
+
+
+def save_snapshot(paths: dict[str, Path], frames) -> str:
+    """
+    Persiste los DataFrames de SNAPSHOT_FRAMES (en ese orden) y apunta
+    el manifest al nuevo snapshot. Los snapshots anteriores se eliminan.
+    """
+    manifest = _read_manifest() or {}
+    fingerprints = inputs_fingerprint(paths, manifest.get("inputs"))
+    key = snapshot_key(fingerprints)
+
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    snapshot_dir = SNAPSHOT_DIR / key
+    tmp_dir = SNAPSHOT_DIR / f".{key}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir()
+
+    for name, df in zip(SNAPSHOT_FRAMES, frames):
+        write_frame(df, _frame_path(tmp_dir, name))
+
+    shutil.rmtree(snapshot_dir, ignore_errors=True)
+    tmp_dir.replace(snapshot_dir)
+
+    _write_manifest({
+        "version": SNAPSHOT_VERSION,
+        "key": key,
+        "inputs": fingerprints,
+    })
+
+    # Limpiar snapshots obsoletos
+    for old in SNAPSHOT_DIR.iterdir():
+        if old.is_dir() and old.name != key:
+            shutil.rmtree(old, ignore_errors=True)
+
+    return key
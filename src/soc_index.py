@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from .artifacts import cache_by_frame
+from .encoding import ids
+
+
+class SocIndex:
+    """
+    Índice SOC → elementos (skills, tasks…) en formato CSR.
+
+    Los valores de todas las ocupaciones viven en un único array plano
+    ordenado por SOC y `offsets[i]:offsets[i + 1]` delimita los de la
+    ocupación i, así que cada consulta es un slice sin copia. Sustituye
+    a las listas de Python por fila (Skills_List / Tasks_List) que se
+    repetían en cada estado de `merged`.
+
+    Con columnas codificadas (ver `encoding`) las posiciones son los IDs
+    globales de SOC y los valores categóricos se guardan como códigos.
+    `positions` devuelve además las filas del frame de origen, para
+    leer otras columnas del SOC sin recorrer el frame con una máscara.
+    """
+
+    def __init__(self, keys: pd.Series, values: pd.Series):
+        codes = ids(keys)
+        if isinstance(keys.dtype, pd.CategoricalDtype):
+            self.keys = keys.cat.categories
+        else:
+            self.keys = pd.Index(pd.unique(keys.dropna()))
+
+        valid = codes >= 0
+        order = np.argsort(codes[valid], kind="stable")
+        counts = np.bincount(codes[valid], minlength=len(self.keys))
+        self.offsets = np.r_[0, np.cumsum(counts)].astype(np.int64)
+        self.rows = np.flatnonzero(valid)[order]
+
+        values = values[valid]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            self.labels = values.cat.categories
+            self.values = ids(values)[order]
+        else:
+            self.labels = None
+            self.values = values.to_numpy()[order]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, soc):
+        return self._position(soc) >= 0
+
+    def _position(self, soc) -> int:
+        return int(self.keys.get_indexer([soc])[0])
+
+    def view(self, soc) -> np.ndarray:
+        """Valores crudos del SOC (códigos si son categóricos); vista sin copia."""
+        return self.values[self._slice(soc)]
+
+    def _slice(self, soc) -> slice:
+        pos = self._position(soc)
+        if pos < 0:
+            return slice(0, 0)
+        return slice(self.offsets[pos], self.offsets[pos + 1])
+
+    def positions(self, soc) -> np.ndarray:
+        """Filas (posicionales) del frame de origen que pertenecen al SOC."""
+        return self.rows[self._slice(soc)]
+
+    def get(self, soc) -> np.ndarray:
+        """Valores del SOC como etiquetas (strings), en el orden original."""
+        raw = self.view(soc)
+        if self.labels is None:
+            return raw
+        return self.labels.to_numpy()[raw]
+
+    def counts(self) -> pd.Series:
+        """Número de elementos por SOC."""
+        return pd.Series(np.diff(self.offsets), index=self.keys)
+
+
+@cache_by_frame
+def get_skills_index(skills_clean: pd.DataFrame) -> SocIndex:
+    """Índice SOC → skills de `skills_clean` (o de `df_rec`, con las mismas columnas)."""
+    return SocIndex(skills_clean["SOC"], skills_clean["Skill"])
+
+
+@cache_by_frame
+def get_tasks_index(tasks_clean: pd.DataFrame) -> SocIndex:
+    """Índice SOC → tasks de `tasks_clean`."""
+    return SocIndex(tasks_clean["SOC"], tasks_clean["Task"])
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from .artifacts import cache_by_frame
+from .encoding import ids
+
+
+class WageStore:
+    """
+    Índice de oews_clean por ocupación.
+
+    Las filas se ordenan una vez por (OCC_TITLE, A_MEDIAN desc), así que
+    cada ocupación ocupa un bloque contiguo ya ordenado por salario.
+    `block()` devuelve ese bloque con un slice posicional (sin máscara
+    booleana sobre todo el frame y sin copia).
+    """
+
+    def __init__(self, oews_clean: pd.DataFrame):
+        self.frame = oews_clean.sort_values(
+            ["OCC_TITLE", "A_MEDIAN"], ascending=[True, False], kind="stable"
+        ).reset_index(drop=True)
+
+        titles = self.frame["OCC_TITLE"].to_numpy()
+        codes = ids(self.frame["OCC_TITLE"])
+        starts = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        starts = np.r_[0, starts] if len(titles) else starts
+        ends = np.r_[starts[1:], len(titles)]
+        self.blocks = {
+            titles[lo]: (int(lo), int(hi)) for lo, hi in zip(starts, ends)
+        }
+
+    @property
+    def occupations(self) -> list[str]:
+        """Títulos de ocupación en orden alfabético."""
+        return list(self.blocks)
+
+    def block(self, occupation: str) -> pd.DataFrame:
+        """Filas de la ocupación, ordenadas por A_MEDIAN descendente."""
+        lo, hi = self.blocks.get(occupation, (0, 0))
+        return self.frame.iloc[lo:hi]
+
+
+@cache_by_frame
+def get_wage_store(oews_clean: pd.DataFrame) -> WageStore:
+    return WageStore(oews_clean)
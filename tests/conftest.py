@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Los módulos se importan como `src.*` desde la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture
+def df_plot():
+    """
+    df_plot pequeño (SOC × skill + A_MEAN) con los casos difíciles:
+    skills que faltan en algunos SOC, una skill presente en un solo SOC,
+    filas duplicadas SOC × skill, un título compartido por varios SOC y
+    un Skill_Name nulo.
+    """
+    rng = np.random.default_rng(7)
+    skills = ["Writing", "Programming", "Speaking", "Repairing"]
+    rows = []
+    for i in range(12):
+        soc = f"15-{1200 + i}.00"
+        title = "Analysts" if i < 3 else f"Occupation {i}"
+        wage = float(rng.integers(40, 150) * 1000)
+        for skill in skills:
+            if skill == "Repairing" and i % 3 == 0:
+                continue            # NaN en la matriz SOC × skill
+            rows.append((soc, title, skill, round(float(rng.uniform(1, 5)), 2), wage))
+        if i % 4 == 1:
+            rows.append((soc, title, "Writing", round(float(rng.uniform(1, 5)), 2), wage))
+    rows.append(("15-1200.00", "Analysts", "Negotiation", 3.0, rows[0][4]))
+    rows.append(("15-1201.00", "Analysts", None, 2.0, rows[5][4]))
+    return pd.DataFrame(rows, columns=["SOC", "OCC_TITLE", "Skill_Name", "Importance", "A_MEAN"])
@@ -0,0 +1,89 @@
+import gc
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.artifacts import cache_by_frame, frame_digest
+
+
+def counting(func):
+    calls = []
+
+    @cache_by_frame
+    def wrapper(df, *args, **kwargs):
+        calls.append(args)
+        return func(df, *args, **kwargs)
+
+    return wrapper, calls
+
+
+def test_memoizes_per_frame_and_args():
+    total, calls = counting(lambda df, col="x": df[col].sum())
+    df = pd.DataFrame({"x": [1, 2], "y": [3, 4]})
+
+    assert total(df) == 3
+    assert total(df) == 3
+    assert total(df, "y") == 7
+    assert len(calls) == 2
+
+    other = df.copy()
+    assert total(other) == 3
+    assert len(calls) == 3
+
+
+def test_entries_evicted_when_frame_is_collected():
+    total, calls = counting(lambda df, col="x": df[col].sum())
+    keep = pd.DataFrame({"x": [1]})
+    df = pd.DataFrame({"x": [1, 2]})
+    total(keep)
+    total(df)
+    total(df, "x")
+
+    assert total.cache_frames() == 2
+    del df
+    gc.collect()
+    assert total.cache_frames() == 1
+    assert total(keep) == 1
+    assert len(calls) == 3
+
+
+def test_concurrent_calls_while_frames_are_collected():
+    total, calls = counting(lambda df: df["x"].sum())
+    shared = pd.DataFrame({"x": [1, 2, 3]})
+    # Cambios de hilo muy frecuentes para que las liberaciones coincidan
+    # con consultas de otros hilos
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    def work(i):
+        for _ in range(200):
+            assert total(pd.DataFrame({"x": [i]})) == i
+            assert total(shared) == 6
+        return True
+
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            assert all(pool.map(work, range(8)))
+    finally:
+        sys.setswitchinterval(interval)
+    gc.collect()
+    assert total.cache_frames() == 1
+
+
+def test_cache_clear():
+    total, calls = counting(lambda df: len(df))
+    df = pd.DataFrame({"x": [1]})
+    total(df)
+    total.cache_clear()
+    total(df)
+
+    assert len(calls) == 2
+
+
+def test_frame_digest_tracks_content():
+    df = pd.DataFrame({"x": [1, 2]})
+
+    assert frame_digest(df) == frame_digest(df.copy())
+    assert frame_digest(df) != frame_digest(df.assign(x=[1, 3]))
+    assert frame_digest(df) != frame_digest(df.rename(columns={"x": "z"}))
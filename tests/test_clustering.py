@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.clustering import (
+    ClusteringEngine,
+    cluster_centroids,
+    clustering_metrics,
+    get_clustering_engine,
+    plot_heatmap_clusters,
+    run_clustering,
+)
+
+
+@pytest.fixture(scope="module")
+def df_rec():
+    """70 ocupaciones en 7 grupos bien separados sobre 12 skills."""
+    rng = np.random.default_rng(0)
+    skills = [f"Skill {i}" for i in range(12)]
+    centers = rng.uniform(1, 5, size=(7, len(skills)))
+    rows = []
+    for occ in range(70):
+        profile = centers[occ % 7] + rng.normal(0, 0.3, len(skills))
+        rows += [(f"{occ:02d}-0000.00", f"Occ {occ}", s, v) for s, v in zip(skills, profile)]
+    return pd.DataFrame(rows, columns=["SOC", "Title", "Skill", "Importance"])
+
+
+def test_cache_hit_returns_same_model(df_rec):
+    engine = get_clustering_engine(df_rec)
+
+    assert get_clustering_engine(df_rec) is engine
+    assert engine.fit(6) is engine.fit(6)
+    assert run_clustering(df_rec, 6) is run_clustering(df_rec, 6)
+
+
+def test_warm_start_keeps_labels_across_k(df_rec):
+    engine = ClusteringEngine(df_rec)
+    anchor = engine.fit(ClusteringEngine.ANCHOR_K).labels
+
+    # k + 1: cada ocupación conserva su cluster o pasa al nuevo (el último)
+    split = engine.fit(ClusteringEngine.ANCHOR_K + 1).labels
+    assert np.all((split == anchor) | (split == ClusteringEngine.ANCHOR_K))
+
+    # k - 1: los clusters de k se fusionan, nunca se reparten
+    merged = engine.fit(ClusteringEngine.ANCHOR_K - 1).labels
+    assert (pd.crosstab(anchor, merged) > 0).sum(axis=1).eq(1).all()
+
+
+def test_warm_start_does_not_depend_on_request_order(df_rec):
+    chained = ClusteringEngine(df_rec)
+    for k in (6, 7, 8):
+        chained.fit(k)
+    direct = ClusteringEngine(df_rec)
+
+    np.testing.assert_array_equal(direct.fit(8).labels, chained.fit(8).labels)
+    np.testing.assert_allclose(direct.fit(8).centers, chained.fit(8).centers)
+
+
+def test_metrics_are_memoized_per_k_and_sample(df_rec, monkeypatch):
+    engine = ClusteringEngine(df_rec)
+    calls = []
+    compute = engine._compute_metrics
+    monkeypatch.setattr(
+        engine, "_compute_metrics",
+        lambda k, sample: calls.append((k, sample)) or compute(k, sample),
+    )
+
+    first = engine.metrics(6)
+    first["inertia"] = -1.0     # se devuelve una copia
+    again = engine.metrics(6)
+    engine.metrics(6, silhouette_sample=20)
+
+    assert calls == [(6, 5000), (6, 20)]
+    assert again["inertia"] > 0
+    assert again["k"] == 6 and again["algorithm"] == "exact"
+
+
+def test_clustering_metrics_reuses_the_engine(df_rec):
+    metrics = clustering_metrics(df_rec, 6)
+
+    assert metrics == get_clustering_engine(df_rec).metrics(6)
+    assert -1.0 <= metrics["silhouette"] <= 1.0
+
+
+def test_heatmap_matrix_equals_centroids(df_rec):
+    centroids = cluster_centroids(df_rec, 6)
+    df_pivot = run_clustering(df_rec, 6)[0]
+    skills = list(centroids.columns)
+
+    # Los centroides de KMeans son la media de sus ocupaciones en el pivot
+    expected = df_pivot.groupby("Cluster")[skills].mean()
+    np.testing.assert_allclose(centroids.to_numpy(), expected.to_numpy(), rtol=1e-6)
+
+    heatmap = plot_heatmap_clusters(centroids).data[0]
+    np.testing.assert_allclose(np.asarray(heatmap.z, dtype=float), centroids.to_numpy())
+    assert list(heatmap.x) == skills
+    assert list(heatmap.y) == [str(c) for c in range(6)]
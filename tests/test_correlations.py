@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import correlations
+from src.correlations import (
+    bootstrap_batch_size,
+    bootstrap_ci,
+    compute_skill_salary_correlations,
+    skill_salary_correlations,
+    skill_wage_arrays,
+)
+
+
+def reference_correlations(df_plot, method):
+    """Versión anterior: groupby SOC × skill y Series.corr por skill."""
+    corr_data = (
+        df_plot.groupby(["SOC", "Skill_Name"])
+        .agg(Importance=("Importance", "mean"), Salary=("A_MEAN", "mean"))
+        .reset_index()
+    )
+    return corr_data.groupby("Skill_Name")[["Importance", "Salary"]].apply(
+        lambda x: x["Importance"].corr(x["Salary"], method=method)
+    )
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")     # Series.corr con un solo SOC
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+def test_matches_series_corr(df_plot, method):
+    result = compute_skill_salary_correlations(df_plot, n_boot=20).set_index("Skill_Name")
+    expected = reference_correlations(df_plot, method)
+
+    assert sorted(result.index) == sorted(expected.index)
+    np.testing.assert_allclose(
+        result[method.capitalize()].reindex(expected.index), expected, rtol=1e-10
+    )
+    # Skill presente en un solo SOC: sin correlación, como Series.corr
+    assert np.isnan(result.loc["Negotiation", method.capitalize()])
+
+
+def test_pairwise_counts_skip_missing_skills(df_plot):
+    result = compute_skill_salary_correlations(df_plot, n_boot=20).set_index("Skill_Name")
+    expected = df_plot.dropna(subset=["Skill_Name"]).groupby("Skill_Name")["SOC"].nunique()
+
+    assert result["N"].to_dict() == expected.to_dict()
+    assert result.loc["Repairing", "N"] == 8
+
+
+def test_skill_salary_correlations_is_cached_and_persisted(df_plot, tmp_path, monkeypatch):
+    monkeypatch.setattr(correlations, "CORRELATIONS_DIR", tmp_path)
+
+    first = skill_salary_correlations(df_plot, n_boot=20)
+    assert skill_salary_correlations(df_plot, n_boot=20) is first
+    pd.testing.assert_frame_equal(first, compute_skill_salary_correlations(df_plot, n_boot=20))
+
+    # Otro frame con el mismo contenido se lee del disco
+    assert len(list(tmp_path.glob("*_20.arrow"))) == 1
+    reread = skill_salary_correlations(df_plot.copy(), n_boot=20)
+    pd.testing.assert_frame_equal(reread, first, check_dtype=False)
+
+
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+def test_budget_limited_batches_give_same_ci(df_plot, method, monkeypatch):
+    X, y, _ = skill_wage_arrays(df_plot)
+    whole = bootstrap_ci(X, y, method=method, n_boot=50, batch_size=50)
+
+    monkeypatch.setenv("BOOTSTRAP_MEMORY_MB", "0.001")
+    batch = bootstrap_batch_size(len(y), X.shape[1], method, n_boot=50)
+    assert 1 <= batch < 50
+    limited = bootstrap_ci(X, y, method=method, n_boot=50)
+
+    np.testing.assert_allclose(limited, whole, rtol=1e-6, equal_nan=True)
+    low, high = limited
+    finite = ~np.isnan(low)
+    assert np.all(low[finite] <= high[finite])
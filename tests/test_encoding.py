@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from src.encoding import build_dictionaries, encode_frame, ids
+from src.pipeline import _dicts, _stage_dictionaries
+from src.preprocess_oews import FIPS_TO_STATE
+from src.snapshot import read_frame, write_frame
+
+
+@pytest.fixture
+def frames():
+    oews_clean = pd.DataFrame({
+        "SOC": ["15-1252.00", "29-1141.00", "15-1252.00"],
+        "STATE_ABBR": ["CA", "CA", "NY"],
+        "A_MEDIAN": [150_000.0, 120_000.0, 140_000.0],
+    })
+    occ = pd.DataFrame({
+        "SOC": ["15-1252.00", "29-1141.00", "11-1011.00"],
+        "Title": ["Software Developers", "Registered Nurses", "Chief Executives"],
+    })
+    skills_clean = pd.DataFrame({
+        "SOC": ["15-1252.00", "15-1252.00", "29-1141.00"],
+        "Skill": ["Programming", "Critical Thinking", "Critical Thinking"],
+        "Importance": [4.5, 4.0, 4.1],
+    })
+    tasks_clean = pd.DataFrame({"SOC": ["29-1141.00", "53-3032.00"], "Task": ["a", "b"]})
+    return oews_clean, occ, skills_clean, tasks_clean
+
+
+def test_dictionaries_are_sorted_unions(frames):
+    dicts = build_dictionaries(*frames)
+
+    assert list(dicts.soc.categories) == ["11-1011.00", "15-1252.00", "29-1141.00", "53-3032.00"]
+    assert list(dicts.skill.categories) == ["Critical Thinking", "Programming"]
+    # Los estados parten de la lista FIPS fija
+    assert set(FIPS_TO_STATE.values()) <= set(dicts.state.categories)
+
+
+def test_ids_are_global_across_frames(frames):
+    dicts = build_dictionaries(*frames)
+    oews_clean, occ, skills_clean, _ = (encode_frame(df.copy(), dicts) for df in frames)
+
+    assert oews_clean["SOC"].dtype == occ["SOC"].dtype == skills_clean["SOC"].dtype
+    soc_id = dicts.soc.categories.get_loc("15-1252.00")
+    assert set(ids(oews_clean["SOC"])[[0, 2]]) == {soc_id}
+    assert ids(occ["SOC"])[0] == soc_id
+    assert ids(skills_clean["SOC"])[0] == soc_id
+
+
+def test_merge_keeps_shared_dtype(frames):
+    dicts = build_dictionaries(*frames)
+    oews_clean, occ = (encode_frame(df.copy(), dicts) for df in frames[:2])
+
+    merged = oews_clean.merge(occ, on="SOC")
+    assert merged["SOC"].dtype == dicts.soc
+    assert len(merged) == 3
+
+
+def test_arrow_round_trip_keeps_categories_and_codes(frames, tmp_path):
+    dicts = build_dictionaries(*frames)
+    skills_clean = encode_frame(frames[2].copy(), dicts)
+
+    path = tmp_path / "skills.arrow"
+    write_frame(skills_clean, path)
+    loaded = read_frame(path)
+
+    pd.testing.assert_frame_equal(loaded, skills_clean)
+    assert loaded["Skill"].dtype == dicts.skill
+    assert (ids(loaded["SOC"]) == ids(skills_clean["SOC"])).all()
+
+
+def test_pipeline_dictionary_frames_round_trip(frames, tmp_path):
+    dicts = build_dictionaries(*frames)
+    stored = []
+    for i, df in enumerate(_stage_dictionaries(*frames)):
+        write_frame(df, tmp_path / f"{i}.arrow")
+        stored.append(read_frame(tmp_path / f"{i}.arrow"))
+
+    assert _dicts(*stored) == dicts
@@ -0,0 +1,122 @@
+import gc
+import json
+from unittest import mock
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+import pytest
+
+from src import artifacts, figure_cache
+from src.figure_cache import FigureCache, cached_figure, frame_version
+from src.oews_trends import TrendStore
+
+
+def test_lru_evicts_oldest_over_budget():
+    cache = FigureCache(max_bytes=10)
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    cache.get("a")              # "a" pasa a ser la más reciente
+    cache.put("c", "xxxx")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "xxxx"
+    assert cache.get("c") == "xxxx"
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert stats["bytes"] == 8
+
+
+def test_oversized_entry_is_not_stored():
+    cache = FigureCache(max_bytes=4)
+    cache.put("a", "xxxxx")
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_replacing_a_key_updates_bytes():
+    cache = FigureCache(max_bytes=100)
+    cache.put("a", "xxxx")
+    cache.put("a", "xx")
+
+    assert cache.stats()["bytes"] == 2
+
+
+def test_budget_counts_utf8_bytes():
+    cache = FigureCache(max_bytes=10)
+    cache.put("a", "Año")           # 3 caracteres, 4 bytes
+    assert cache.stats()["bytes"] == 4
+
+    cache.put("b", "ñññ")           # 6 bytes: 10 en total, cabe
+    cache.put("c", "é")             # 12 > 10: sale "a"
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 8
+
+    cache.put("d", "ñññññ")         # 10 bytes en 5 caracteres
+    assert cache.get("d") == "ñññññ"
+    assert cache.stats()["bytes"] == 10
+
+    cache.put("e", "ññññññ")        # 12 bytes: no cabe en el presupuesto
+    assert cache.get("e") is None
+
+
+@pytest.fixture
+def figure_cache_empty(monkeypatch):
+    monkeypatch.setattr(figure_cache, "FIGURE_CACHE", FigureCache(2**20))
+    return figure_cache.FIGURE_CACHE
+
+
+def test_cached_figure_keys_on_data_and_params(figure_cache_empty):
+    calls = []
+
+    @cached_figure
+    def bar(df, title):
+        calls.append(title)
+        return go.Figure(go.Bar(x=df["x"], y=df["y"]), layout={"title": title})
+
+    df = pd.DataFrame({"x": ["a", "b"], "y": [1, 2]})
+    first = bar(df, "t")
+    again = bar(df.copy(), "t")
+    bar(df, "otro")
+    bar(df.assign(y=[3, 4]), "t")
+
+    assert calls == ["t", "otro", "t"]
+    assert json.loads(pio.to_json(again)) == json.loads(pio.to_json(first))
+    # Cada acierto devuelve una figura independiente
+    again.update_layout(title="cambiado")
+    assert bar(df, "t").layout.title.text == "t"
+
+
+def test_assigned_version_skips_hashing():
+    df = pd.DataFrame({"x": [1, 2]})
+    artifacts.set_frame_version(df, "padre", "slice", 1)
+
+    with mock.patch.object(figure_cache, "_content_version", side_effect=AssertionError):
+        version = frame_version(df)
+    assert version == frame_version(artifacts.set_frame_version(pd.DataFrame(), "padre", "slice", 1))
+    assert version != frame_version(artifacts.set_frame_version(pd.DataFrame(), "padre", "slice", 2))
+
+    frame_id = id(df)
+    del df
+    gc.collect()
+    assert frame_id not in artifacts._FRAME_VERSIONS
+
+
+def test_trend_store_slices_carry_versions():
+    panel = pd.DataFrame({
+        "OCC_TITLE": ["A", "A", "B"], "AREA": ["06", "06", "06"], "YEAR": [2019, 2023, 2019],
+        "A_MEDIAN": [1.0, 2.0, 3.0],
+    })
+    cagr = pd.DataFrame({"OCC_TITLE": ["A", "B"], "A_MEDIAN_CAGR": [0.1, 0.2]})
+    store = TrendStore(panel, cagr, version="k1")
+
+    with mock.patch.object(figure_cache, "_content_version", side_effect=AssertionError):
+        assert frame_version(store.series("A")) == frame_version(store.series("A"))
+        assert frame_version(store.series("A")) != frame_version(store.series("B"))
+        assert frame_version(store.series("A")) != frame_version(store.growth("A"))
+
+    other = TrendStore(panel.assign(A_MEDIAN=[9.0, 9.0, 9.0]), cagr, version="k2")
+    assert frame_version(other.series("A")) != frame_version(store.series("A"))
+    # Sin versión de store, los slices se hashean por contenido
+    assert artifacts.known_frame_version(TrendStore(panel, cagr).series("A")) is None
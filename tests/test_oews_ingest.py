@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.oews_ingest import ingest_oews, iter_raw_chunks, load_oews_store
+
+
+SAMPLE = Path(__file__).parent / "data" / "oews_sample.csv"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return tmp_path / "oews"
+
+
+def _partitions(store_dir):
+    return sorted(str(p.parent.relative_to(store_dir)) for p in store_dir.rglob("*.parquet"))
+
+
+def test_iter_raw_chunks_splits_rows():
+    chunks = list(iter_raw_chunks(SAMPLE, chunk_size=4))
+
+    assert [len(c) for c in chunks] == [4, 4, 1]
+    assert all((c.dtypes == object).all() for c in chunks)
+
+
+def test_chunked_ingestion_writes_hive_partitions(store):
+    stats = ingest_oews(SAMPLE, year=2023, store_dir=store, chunk_size=3)
+
+    assert stats["chunks"] == 3
+    assert stats["rows_read"] == 9
+    # Fuera: la fila de industria y la de A_MEDIAN suprimido
+    assert stats["rows_written"] == 7
+    assert _partitions(store) == [
+        "AREA_LEVEL=msa/YEAR=2023",
+        "AREA_LEVEL=national/YEAR=2023",
+        "AREA_LEVEL=state/YEAR=2023",
+    ]
+
+    states = load_oews_store("state", 2023, store_dir=store)
+    assert sorted(states["STATE_ABBR"]) == ["CA", "CA", "NY", "NY"]
+    assert set(states["SOC"]) == {"15-1252.00", "29-1141.00"}
+    assert list(load_oews_store("msa", store_dir=store)["STATE_ABBR"]) == ["CA"]
+
+    nurses = load_oews_store(
+        "national", 2023, occupations=["Registered Nurses"],
+        columns=["OCC_TITLE", "A_MEDIAN"], store_dir=store,
+    )
+    assert nurses["A_MEDIAN"].tolist() == [86070.0]
+
+
+def test_reingest_replaces_only_its_partitions(store, tmp_path):
+    ingest_oews(SAMPLE, year=2022, store_dir=store, chunk_size=3)
+    ingest_oews(SAMPLE, year=2023, store_dir=store, chunk_size=3)
+
+    # Nueva versión de 2023 solo con filas estatales y un salario corregido
+    raw = pd.read_csv(SAMPLE, dtype=str)
+    update = raw[(raw["AREA_TYPE"] == "2") & (raw["OCC_CODE"] == "15-1252")].copy()
+    update["A_MEDIAN"] = "170000"
+    path = tmp_path / "update.csv"
+    update.to_csv(path, index=False)
+    ingest_oews(path, year=2023, store_dir=store)
+
+    states_2023 = load_oews_store("state", 2023, store_dir=store)
+    assert states_2023["OCC_TITLE"].astype(str).unique().tolist() == ["Software Developers"]
+    assert states_2023["A_MEDIAN"].tolist() == [170000.0, 170000.0]
+
+    # Otros niveles del mismo año y el año anterior siguen intactos
+    assert len(load_oews_store("national", 2023, store_dir=store)) == 2
+    assert len(load_oews_store("msa", 2023, store_dir=store)) == 1
+    assert len(load_oews_store("state", 2022, store_dir=store)) == 4
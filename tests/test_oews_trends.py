@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.oews_trends import add_yoy, compute_cagr, harmonize_soc, load_crosswalk
+
+
+CROSSWALK = """\
+# crosswalk de prueba
+SOC_OLD,TITLE_OLD,SOC_2018,TITLE_2018,SOURCE
+11-0001,Old A,11-0010,New A,2010
+11-0002,Old A bis,11-0010,New A,2010
+13-0001,Old B,13-0011,New B1,2010
+13-0001,Old B,13-0012,New B2,2010
+"""
+
+
+@pytest.fixture
+def crosswalk(tmp_path):
+    path = tmp_path / "crosswalk.csv"
+    path.write_text(CROSSWALK)
+    return load_crosswalk(path)
+
+
+def row(year, soc, title, emp, median, area="06"):
+    return {
+        "YEAR": year, "AREA": area, "AREA_TITLE": "California", "STATE_ABBR": "CA",
+        "SOC": soc, "OCC_TITLE": title, "TOT_EMP": emp,
+        "A_MEAN": median, "A_MEDIAN": median,
+    }
+
+
+@pytest.fixture
+def raw():
+    return pd.DataFrame([
+        row(2019, "11-0001.00", "Old A", 100, 50_000),
+        row(2019, "11-0002.00", "Old A bis", 300, 70_000),
+        row(2019, "13-0001.00", "Old B", 1_000, 40_000),
+        row(2019, "99-0001.00", "Retired", 10, 20_000),
+        row(2021, "11-0010.00", "New A", 500, 65_000),
+        row(2021, "13-0011.00", "New B1", 300, 45_000),
+        row(2021, "13-0012.00", "New B2", 100, 42_000),
+    ])
+
+
+def cell(panel, year, soc):
+    match = panel[(panel["YEAR"] == year) & (panel["SOC"] == soc)]
+    assert len(match) == 1
+    return match.iloc[0]
+
+
+def test_load_crosswalk_format(crosswalk):
+    assert crosswalk["SOC_OLD"].str.endswith(".00").all()
+    assert crosswalk.set_index("SOC_2018")["N_TARGETS"].to_dict() == {
+        "11-0010.00": 1, "13-0011.00": 2, "13-0012.00": 2,
+    }
+
+
+def test_many_to_one_aggregates(raw, crosswalk):
+    panel = harmonize_soc(raw, crosswalk)
+    merged = cell(panel, 2019, "11-0010.00")
+
+    assert merged["TOT_EMP"] == 400
+    # Salario ponderado por empleo
+    assert merged["A_MEDIAN"] == pytest.approx((100 * 50_000 + 300 * 70_000) / 400)
+    assert not merged["SOC_SPLIT"]
+    assert merged["OCC_TITLE"] == "New A"
+    assert not panel["SOC"].isin(["11-0001.00", "11-0002.00"]).any()
+
+
+def test_split_apportions_by_reference_year(raw, crosswalk):
+    report = {}
+    panel = harmonize_soc(raw, crosswalk, report=report)
+    b1 = cell(panel, 2019, "13-0011.00")
+    b2 = cell(panel, 2019, "13-0012.00")
+
+    assert b1["TOT_EMP"] == pytest.approx(750)
+    assert b2["TOT_EMP"] == pytest.approx(250)
+    assert b1["A_MEDIAN"] == b2["A_MEDIAN"] == 40_000
+    assert b1["SOC_SPLIT"] and b2["SOC_SPLIT"]
+    assert not cell(panel, 2021, "13-0011.00")["SOC_SPLIT"]
+    assert report["split"] == ["13-0001.00"]
+
+
+def test_split_without_reference_year_is_equal(raw, crosswalk):
+    panel = harmonize_soc(raw[raw["YEAR"] < 2021], crosswalk)
+
+    assert cell(panel, 2019, "13-0011.00")["TOT_EMP"] == pytest.approx(500)
+    assert cell(panel, 2019, "13-0012.00")["TOT_EMP"] == pytest.approx(500)
+
+
+def test_unmapped_retired_codes_reported(raw, crosswalk):
+    report = {}
+    panel = harmonize_soc(raw, crosswalk, report=report)
+
+    assert [r["SOC"] for r in report["unmapped"]] == ["99-0001.00"]
+    assert report["unmapped"][0]["LAST_YEAR"] == 2019
+    # La serie se conserva, solo se corta
+    assert cell(panel, 2019, "99-0001.00")["TOT_EMP"] == 10
+
+
+def test_total_employment_preserved(raw, crosswalk):
+    panel = harmonize_soc(raw, crosswalk)
+    totals = panel.groupby("YEAR")["TOT_EMP"].sum()
+
+    np.testing.assert_allclose(totals.to_numpy(), raw.groupby("YEAR")["TOT_EMP"].sum().to_numpy())
+
+
+def test_yoy_and_cagr_annualize_gaps():
+    panel = add_yoy(pd.DataFrame([
+        row(year, "15-1252.00", "Software Developers", emp, median)
+        for year, emp, median in [(2019, 100, 100_000), (2021, 121, 121_000)]
+    ]))
+
+    assert np.isnan(panel["A_MEDIAN_YOY"].iloc[0])
+    assert panel["A_MEDIAN_YOY"].iloc[1] == pytest.approx(0.1, rel=1e-5)
+
+    cagr = compute_cagr(panel)
+    assert cagr["A_MEDIAN_CAGR"].iloc[0] == pytest.approx(0.1, rel=1e-5)
+    assert cagr[["YEAR_START", "YEAR_END"]].iloc[0].tolist() == [2019, 2021]
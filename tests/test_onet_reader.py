@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from src.onet_reader import ONET_TABLES, prefer_text, read_onet
+
+
+SKILLS = pd.DataFrame({
+    "O*NET-SOC Code": ["15-1252.00"] * 3 + ["29-1141.00"] * 3,
+    "Title": ["Software Developers"] * 3 + ["Registered Nurses"] * 3,
+    "Element ID": ["2.A.1.a", "2.A.1.a", "2.B.3.e"] * 2,
+    "Element Name": ["Reading Comprehension", "Reading Comprehension", "Programming"] * 2,
+    "Scale ID": ["IM", "LV", "IM", "IM", "LV", "IM"],
+    "Data Value": [4.0, 4.5, 4.88, 4.12, 4.0, 1.25],
+    "N": [8] * 6,
+    "Not Relevant": ["n/a", "N", "n/a", "n/a", "N", "n/a"],
+    "Date": ["08/2023"] * 6,
+})
+
+
+@pytest.fixture
+def skills_txt(tmp_path):
+    path = tmp_path / "Skills.txt"
+    SKILLS.to_csv(path, sep="\t", index=False)
+    return path
+
+
+def test_reads_projected_typed_im_rows_in_chunks(skills_txt):
+    # chunk_size=3: dos bloques, cada uno con una fila LV que se descarta
+    df = read_onet(skills_txt, "skills", chunk_size=3)
+
+    assert list(df.columns) == list(ONET_TABLES["skills"])
+    assert df["Data Value"].dtype == "float64"
+    assert df["O*NET-SOC Code"].dtype == object
+    assert df["Scale ID"].eq("IM").all()
+    assert df["Data Value"].tolist() == [4.0, 4.88, 4.12, 1.25]
+    assert df.index.tolist() == [0, 1, 2, 3]
+
+
+def test_scales_override_and_single_chunk(skills_txt):
+    both = read_onet(skills_txt, "skills", scales=("IM", "LV"))
+    level = read_onet(skills_txt, "skills", chunk_size=2, scales=("LV",))
+
+    assert len(both) == len(SKILLS)
+    assert level["Data Value"].tolist() == [4.5, 4.0]
+
+
+def test_text_matches_excel(skills_txt, tmp_path):
+    xlsx = tmp_path / "Skills.xlsx"
+    SKILLS.to_excel(xlsx, index=False)
+
+    assert prefer_text(xlsx) == skills_txt
+    assert prefer_text(tmp_path / "Task Statements.xlsx") == tmp_path / "Task Statements.xlsx"
+    pd.testing.assert_frame_equal(read_onet(skills_txt, "skills"), read_onet(xlsx, "skills"))
+
+
+def test_tasks_dtypes_and_unquoted_text(tmp_path):
+    # Como en los .txt de O*NET: sin comillas de CSV, con comillas sueltas en el texto
+    path = tmp_path / "Task Statements.txt"
+    path.write_text(
+        "O*NET-SOC Code\tTitle\tTask ID\tTask\tTask Type\n"
+        '15-1252.00\tSoftware Developers\t1\tModify "legacy" software\tCore\n'
+        "15-1252.00\tSoftware Developers\t2\tAnalyze user needs\tCore\n",
+        encoding="utf-8",
+    )
+
+    df = read_onet(path, "tasks", chunk_size=1)
+
+    assert list(df.columns) == list(ONET_TABLES["tasks"])
+    assert df["Task ID"].dtype == "int64"
+    assert df["Task"].tolist() == ['Modify "legacy" software', "Analyze user needs"]
@@ -0,0 +1,40 @@
+import math
+
+import pandas as pd
+
+from src.parallel import default_workers, run_parallel
+
+
+def _calls(tmp_path):
+    path = tmp_path / "sample.csv"
+    pd.DataFrame({"SOC": ["15-1252.00", "29-1141.00"], "A_MEDIAN": [130160, 86070]}).to_csv(
+        path, index=False
+    )
+    # Funciones importables: el pool usa spawn
+    return {
+        "frame": (pd.read_csv, path),
+        "sum": (math.fsum, [0.1] * 10),
+        "sorted": (sorted, [3, 1, 2]),
+    }
+
+
+def test_workers_one_and_two_give_identical_results(tmp_path):
+    calls = _calls(tmp_path)
+
+    serial = run_parallel(calls, workers=1)
+    pooled = run_parallel(calls, workers=2)
+
+    assert list(serial) == list(pooled) == list(calls)
+    pd.testing.assert_frame_equal(serial["frame"][0], pooled["frame"][0])
+    assert serial["sum"][0] == pooled["sum"][0] == 1.0
+    assert serial["sorted"][0] == pooled["sorted"][0] == [1, 2, 3]
+    for timings in (serial, pooled):
+        assert all(isinstance(s, float) and s >= 0 for _, s in timings.values())
+
+
+def test_default_workers(monkeypatch):
+    monkeypatch.setenv("DATA_WORKERS", "3")
+    assert default_workers(10) == 3
+
+    monkeypatch.delenv("DATA_WORKERS")
+    assert 1 <= default_workers(2) <= 2
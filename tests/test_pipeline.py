@@ -0,0 +1,146 @@
+import pandas as pd
+import pytest
+
+from src import pipeline
+from src.pipeline import Stage, run_pipeline
+
+
+CALLS = []
+
+
+def _read(path):
+    CALLS.append(path.stem)
+    # Espacios finales ignorados: un cambio solo de formato da la misma salida
+    values = [int(v) for v in path.read_text().split()]
+    return (pd.DataFrame({"value": values}),)
+
+
+def _combine(a, b):
+    CALLS.append("combine")
+    return (pd.DataFrame({"value": [a["value"].sum() + b["value"].sum()]}),)
+
+
+def _double(a):
+    CALLS.append("double")
+    return (a.assign(value=a["value"] * 2),)
+
+
+TOY_STAGES = [
+    Stage("read_a", _read, ("a",), ("a_clean",)),
+    Stage("read_b", _read, ("b",), ("b_clean",)),
+    Stage("merged", _combine, ("a_clean", "b_clean"), ("merged",)),
+    Stage("descriptors", _double, ("a_clean",), ("descriptors",)),
+]
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "pipeline_stages", lambda paths: TOY_STAGES)
+    CALLS.clear()
+    paths = {"a": tmp_path / "a.txt", "b": tmp_path / "b.txt"}
+    paths["a"].write_text("1 2")
+    paths["b"].write_text("10")
+    return paths
+
+
+def run(paths, cache_dir, **kwargs):
+    CALLS.clear()
+    kwargs.setdefault("outputs", ["merged", "descriptors"])
+    result, report = run_pipeline(paths, cache_dir=cache_dir, workers=1, **kwargs)
+    return result, dict(zip(report["stage"], report["status"]))
+
+
+def test_cold_then_warm(paths, tmp_path):
+    cache_dir = tmp_path / "cache"
+    result, status = run(paths, cache_dir)
+    assert set(status.values()) == {"rebuilt"}
+    assert result["merged"]["value"].tolist() == [13]
+
+    result, status = run(paths, cache_dir)
+    assert set(status.values()) == {"reused"}
+    assert CALLS == []
+    assert result["merged"]["value"].tolist() == [13]
+    assert result["descriptors"]["value"].tolist() == [2, 4]
+
+
+def test_changed_input_rebuilds_only_downstream(paths, tmp_path):
+    cache_dir = tmp_path / "cache"
+    run(paths, cache_dir)
+    paths["b"].write_text("20")
+
+    result, status = run(paths, cache_dir)
+    assert status == {"read_a": "reused", "read_b": "rebuilt", "merged": "rebuilt", "descriptors": "reused"}
+    assert result["merged"]["value"].tolist() == [23]
+
+
+def test_same_output_does_not_invalidate_downstream(paths, tmp_path):
+    cache_dir = tmp_path / "cache"
+    run(paths, cache_dir)
+    paths["b"].write_text("10\n")
+
+    _, status = run(paths, cache_dir)
+    assert status["read_b"] == "rebuilt"
+    assert status["merged"] == "reused"
+
+
+def test_force_and_version_bump_rebuild(paths, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    run(paths, cache_dir)
+
+    _, status = run(paths, cache_dir, force=True)
+    assert set(status.values()) == {"rebuilt"}
+
+    monkeypatch.setattr(pipeline, "PIPELINE_VERSION", pipeline.PIPELINE_VERSION + 1)
+    _, status = run(paths, cache_dir)
+    assert set(status.values()) == {"rebuilt"}
+
+
+def test_outputs_prunes_what_is_returned_and_read(paths, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    run(paths, cache_dir)
+
+    read = []
+    original = pipeline.read_frame
+    monkeypatch.setattr(pipeline, "read_frame", lambda path: read.append(path.parent.name) or original(path))
+    result, status = run(paths, cache_dir, outputs=["descriptors"])
+
+    assert list(result) == ["descriptors"]
+    assert result["descriptors"]["value"].tolist() == [2, 4]
+    assert set(status.values()) == {"reused"}
+    # Las salidas reutilizadas solo se leen si se piden
+    assert read == ["descriptors"]
+
+
+def test_one_run_serves_all_outputs(paths, tmp_path):
+    cache_dir = tmp_path / "cache"
+    result, _ = run(paths, cache_dir, outputs=["merged", "descriptors", "a_clean"])
+
+    assert list(result) == ["merged", "descriptors", "a_clean"]
+    assert CALLS.count("a") == 1
+
+
+def test_load_frames_runs_pipeline_once_and_snapshots_descriptors(tmp_path, monkeypatch):
+    from src import load_data, snapshot
+
+    monkeypatch.setattr(snapshot, "SNAPSHOT_DIR", tmp_path / "snapshot")
+    monkeypatch.setattr(snapshot, "MANIFEST_PATH", tmp_path / "snapshot" / "manifest.json")
+    raw = tmp_path / "raw.xlsx"
+    raw.write_bytes(b"raw")
+    monkeypatch.setattr(load_data, "raw_input_paths", lambda: {"raw": raw})
+
+    runs = []
+
+    def fake_run_pipeline(paths, workers=None, outputs=()):
+        runs.append(list(outputs))
+        return {name: pd.DataFrame({"frame": [name]}) for name in outputs}, None
+
+    monkeypatch.setattr(load_data, "run_pipeline", fake_run_pipeline)
+
+    frames = load_data.load_frames()
+    assert runs == [snapshot.SNAPSHOT_FRAMES]
+    assert "descriptors" in frames
+
+    # Arranque en caliente: todo, descriptores incluidos, sale del snapshot
+    frames = load_data.load_frames()
+    assert len(runs) == 1
+    assert frames["descriptors"]["frame"].tolist() == ["descriptors"]
@@ -0,0 +1,57 @@
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.oews_ingest import ingest_oews
+from src.preprocess_oews import OEWS_SCHEMA, clean_oews, coerce_oews_schema
+
+
+SAMPLE = Path(__file__).parent / "data" / "oews_sample.csv"
+
+
+def _raw():
+    return pd.read_csv(SAMPLE, dtype=str)
+
+
+def test_coerce_declares_dtypes():
+    df = coerce_oews_schema(_raw())
+
+    for col, dtype in OEWS_SCHEMA.items():
+        assert str(df[col].dtype) == dtype, col
+    assert df["LOC_QUOTIENT"].iloc[4] == np.float32(1.13)    # " 1.13 " con espacios
+
+
+def test_markers_become_nan_in_place():
+    raw = _raw()
+    df = coerce_oews_schema(raw.copy(), report=Counter())
+
+    for col in ["TOT_EMP", "A_MEAN", "A_MEDIAN", "A_PCT90", "H_MEAN", "H_MEDIAN"]:
+        markers = raw[col].str.strip().isin(["#", "*", "**"])
+        assert df[col].isna().tolist() == markers.tolist(), col
+    assert df["A_PCT10"].notna().all()
+
+
+def test_report_counts_each_marker():
+    report = Counter()
+    coerce_oews_schema(_raw(), report=report)
+
+    assert report == {"#": 8, "*": 4, "**": 1}
+
+
+def test_clean_oews_drops_suppressed_medians_and_reports():
+    report = Counter()
+    df = clean_oews(_raw(), occupations=None, states_only=True, report=report)
+
+    assert "Financial Managers" not in set(df["OCC_TITLE"])
+    assert df["STATE_ABBR"].tolist() == ["CA", "CA", "NY", "NY"]
+    assert pd.isna(df.loc[df["STATE_ABBR"] == "NY", "TOT_EMP"]).tolist() == [True, False]
+    # La fila de industria (sin símbolos) se filtra antes de convertir
+    assert report == {"#": 8, "*": 4, "**": 1}
+
+
+def test_ingest_reports_suppressed_cells(tmp_path):
+    stats = ingest_oews(SAMPLE, year=2023, store_dir=tmp_path, chunk_size=4)
+
+    assert stats["suppressed"] == {"#": 8, "*": 4, "**": 1}
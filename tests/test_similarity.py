@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from src.recommender import ExactBackend, LSHBackend
+
+
+@pytest.fixture
+def matrix():
+    rng = np.random.default_rng(0)
+    return rng.random((400, 24)).astype(np.float32)
+
+
+def backends(matrix, **params):
+    norms = np.linalg.norm(matrix, axis=1)
+    return ExactBackend(matrix, norms), LSHBackend(matrix, norms, **params)
+
+
+def test_falls_back_to_exact_with_too_few_candidates(matrix):
+    # 62 bits sin multi-probe: cubos casi unitarios, menos de k candidatos
+    exact, lsh = backends(matrix, n_tables=1, n_bits=62, probe_radius=0)
+    queries = matrix[:5] + 0.01
+    k = 10
+
+    unit = queries / np.linalg.norm(queries, axis=1)[:, None]
+    codes = np.stack([lsh._hash(unit, planes) for planes in lsh.planes], axis=1)
+    assert all(len(lsh._candidates(c)) < k for c in codes)
+
+    top_lsh, sims_lsh = lsh.search(queries, k)
+    top_exact, sims_exact = exact.search(queries, k)
+    np.testing.assert_array_equal(top_lsh, top_exact)
+    np.testing.assert_allclose(sims_lsh, sims_exact, rtol=1e-5)
+
+
+def test_zero_query_uses_exact(matrix):
+    exact, lsh = backends(matrix)
+    zero = np.zeros((1, matrix.shape[1]), dtype=np.float32)
+
+    np.testing.assert_array_equal(lsh.search(zero, 5)[0], exact.search(zero, 5)[0])
+
+
+def test_recall_against_exact(matrix):
+    exact, lsh = backends(matrix, n_tables=16, n_bits=8)
+    queries = matrix[::20] + 0.05
+    k = 10
+
+    top_lsh, _ = lsh.search(queries, k)
+    top_exact, _ = exact.search(queries, k)
+    recall = np.mean([len(set(a) & set(b)) / k for a, b in zip(top_lsh, top_exact)])
+    assert recall >= 0.9
+
+
+def test_k_larger_than_matrix(matrix):
+    _, lsh = backends(matrix[:3])
+
+    top, sims = lsh.search(matrix[:1], 10)
+    assert top.shape == (1, 3)
+    assert sorted(top[0]) == [0, 1, 2]
+
+
+def test_invalid_parameters(matrix):
+    norms = np.linalg.norm(matrix, axis=1)
+    with pytest.raises(ValueError):
+        LSHBackend(matrix, norms, n_bits=63)
+    with pytest.raises(ValueError):
+        LSHBackend(matrix, norms, probe_radius=2)
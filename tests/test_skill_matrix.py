@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.charts_skills import comparison_skills, profile_heatmap, top_skills_bar
+from src.skill_matrix import SkillWageMatrix, get_skill_wage_matrix
+
+
+def test_importance_and_wages_match_pivot(df_plot):
+    matrix = SkillWageMatrix(df_plot)
+
+    pivot = df_plot.pivot_table(
+        index="SOC", columns="Skill_Name", values="Importance", aggfunc="mean"
+    ).reindex(index=matrix.socs, columns=matrix.skills)
+    np.testing.assert_allclose(matrix.importance, pivot.to_numpy(), equal_nan=True)
+
+    wages = df_plot.groupby("SOC")["A_MEAN"].mean().reindex(matrix.socs)
+    np.testing.assert_allclose(matrix.wages, wages.to_numpy())
+
+    titles = df_plot.groupby("SOC")["OCC_TITLE"].first().reindex(matrix.socs)
+    assert list(matrix.titles) == titles.tolist()
+    assert "Negotiation" in matrix.skills and None not in matrix.skills
+
+
+def test_rows_select_every_soc_of_a_title(df_plot):
+    matrix = get_skill_wage_matrix(df_plot)
+
+    rows = matrix.rows(["Analysts", "Occupation 7", "Unknown"])
+    expected = df_plot.loc[df_plot["OCC_TITLE"].isin(["Analysts", "Occupation 7"]), "SOC"].unique()
+    assert sorted(np.asarray(matrix.socs)[rows]) == sorted(expected)
+    assert len(matrix.rows(["Unknown"])) == 0
+
+
+@pytest.mark.parametrize("occupation", ["All", "Analysts", "Occupation 5"])
+def test_mean_importance_matches_groupby(df_plot, occupation):
+    matrix = get_skill_wage_matrix(df_plot)
+    if occupation == "All":
+        subset, rows = df_plot, None
+    else:
+        subset, rows = df_plot[df_plot["OCC_TITLE"] == occupation], matrix.rows([occupation])
+
+    expected = subset.groupby("Skill_Name")["Importance"].mean()
+    result = matrix.mean_importance(rows)
+    pd.testing.assert_series_equal(
+        result.sort_index(), expected.sort_index(), check_names=False, check_index_type=False
+    )
+
+
+def test_top_skills_bar_ranking_matches_groupby(df_plot):
+    fig = top_skills_bar(df_plot, "Analysts", 3)
+
+    expected = (
+        df_plot[df_plot["OCC_TITLE"] == "Analysts"]
+        .groupby("Skill_Name")["Importance"].mean()
+        .sort_values(ascending=False)
+        .head(3)
+        .sort_values()
+    )
+    assert list(fig.data[0].y) == expected.index.tolist()
+    np.testing.assert_allclose(np.asarray(fig.data[0].x, dtype=float), expected.to_numpy())
+
+
+def reference_profile(df_plot, occupation, skills):
+    """Versión anterior del radar: groupby sobre las filas del título, 0 si falta."""
+    avg = df_plot[df_plot["OCC_TITLE"] == occupation].groupby("Skill_Name")["Importance"].mean()
+    return [avg.get(skill, 0) for skill in skills]
+
+
+def test_profiles_of_titles_shared_by_several_socs(df_plot):
+    matrix = get_skill_wage_matrix(df_plot)
+    titles = ["Occupation 5", "Analysts", "Unknown", "Occupation 9"]
+
+    profiles = matrix.profiles_for(titles)
+
+    # "Analysts" agrupa tres SOC con filas duplicadas y una skill propia
+    assert df_plot.loc[df_plot["OCC_TITLE"] == "Analysts", "SOC"].nunique() == 3
+    assert list(profiles.index) == ["Occupation 5", "Analysts", "Occupation 9"]
+    for title in profiles.index:
+        np.testing.assert_allclose(
+            profiles.loc[title].to_numpy(), reference_profile(df_plot, title, matrix.skills)
+        )
+    assert profiles.loc["Occupation 5", "Negotiation"] == 0.0
+
+
+def test_profiles_for_selected_skills(df_plot):
+    matrix = get_skill_wage_matrix(df_plot)
+    titles = ["Analysts", "Occupation 3"]
+    skills = comparison_skills(df_plot, titles, 3) + ["Not a skill"]
+
+    profiles = matrix.profiles_for(titles, skills)
+
+    assert list(profiles.columns) == skills
+    for title in titles:
+        np.testing.assert_allclose(
+            profiles.loc[title].to_numpy(), reference_profile(df_plot, title, skills)
+        )
+
+
+def test_comparison_skills_match_groupby(df_plot):
+    titles = ["Analysts", "Occupation 4"]
+    expected = (
+        df_plot[df_plot["OCC_TITLE"].isin(titles)]
+        .groupby("Skill_Name")["Importance"].mean()
+        .sort_values(ascending=False)
+    )
+
+    assert comparison_skills(df_plot, titles, 4) == expected.head(4).index.tolist()
+
+
+def test_profile_heatmap_has_one_row_per_title(df_plot):
+    titles = [f"Occupation {i}" for i in range(3, 12)] + ["Analysts"]
+    fig = profile_heatmap(df_plot, titles, 4)
+
+    assert list(fig.data[0].y) == titles
+    assert np.asarray(fig.data[0].z).shape == (len(titles), 4)
@@ -0,0 +1,81 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src import snapshot
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    root = tmp_path / "snapshot"
+    monkeypatch.setattr(snapshot, "SNAPSHOT_DIR", root)
+    monkeypatch.setattr(snapshot, "MANIFEST_PATH", root / "manifest.json")
+    return root
+
+
+@pytest.fixture
+def raw_paths(tmp_path):
+    paths = {}
+    for name in ("oews", "skills"):
+        path = tmp_path / f"{name}.xlsx"
+        path.write_bytes(f"contenido de {name}".encode())
+        paths[name] = path
+    return paths
+
+
+def frames():
+    return [
+        pd.DataFrame({"SOC": [f"15-125{i}.00"], "value": [float(i)]})
+        for i in range(len(snapshot.SNAPSHOT_FRAMES))
+    ]
+
+
+def test_round_trip(snapshot_dir, raw_paths):
+    snapshot.save_snapshot(raw_paths, frames())
+    loaded = snapshot.load_snapshot(raw_paths)
+
+    assert len(loaded) == len(snapshot.SNAPSHOT_FRAMES)
+    for expected, got in zip(frames(), loaded):
+        pd.testing.assert_frame_equal(got, expected)
+
+
+def test_content_change_invalidates(snapshot_dir, raw_paths):
+    snapshot.save_snapshot(raw_paths, frames())
+    raw_paths["skills"].write_bytes(b"otro contenido")
+
+    assert snapshot.load_snapshot(raw_paths) is None
+
+
+def test_touch_keeps_snapshot_and_refreshes_mtime(snapshot_dir, raw_paths):
+    key = snapshot.save_snapshot(raw_paths, frames())
+    stat = raw_paths["oews"].stat()
+    os.utime(raw_paths["oews"], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert snapshot.load_snapshot(raw_paths) is not None
+    manifest = snapshot._read_manifest()
+    assert manifest["key"] == key
+    assert manifest["inputs"]["oews"]["mtime_ns"] == stat.st_mtime_ns + 10**9
+
+
+def test_version_bump_invalidates(snapshot_dir, raw_paths, monkeypatch):
+    snapshot.save_snapshot(raw_paths, frames())
+    monkeypatch.setattr(snapshot, "SNAPSHOT_VERSION", snapshot.SNAPSHOT_VERSION + 1)
+
+    assert snapshot.load_snapshot(raw_paths) is None
+
+
+def test_new_snapshot_replaces_old(snapshot_dir, raw_paths):
+    old_key = snapshot.save_snapshot(raw_paths, frames())
+    raw_paths["oews"].write_bytes(b"nueva edicion")
+    new_key = snapshot.save_snapshot(raw_paths, frames())
+
+    assert new_key != old_key
+    assert [p.name for p in snapshot_dir.iterdir() if p.is_dir()] == [new_key]
+
+
+def test_hash_reused_when_size_and_mtime_match(raw_paths, monkeypatch):
+    previous = snapshot.file_fingerprint(raw_paths["oews"])
+    monkeypatch.setattr(snapshot, "_sha256", lambda path: pytest.fail("re-hash"))
+
+    assert snapshot.file_fingerprint(raw_paths["oews"], previous) == previous
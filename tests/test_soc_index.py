@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.recommender import top_skills_for_soc
+from src.soc_index import SocIndex, get_skills_index, get_tasks_index
+
+
+@pytest.fixture
+def df_rec():
+    return pd.DataFrame({
+        "SOC": ["29-1141.00", "15-1252.00", "29-1141.00", None, "15-1252.00", "15-1252.00"],
+        "Skill": ["Monitoring", "Programming", "Active Listening", "Writing", "Critical Thinking", "Writing"],
+        "Importance": [4.0, 4.8, 4.2, 3.0, 4.1, 3.5],
+    })
+
+
+@pytest.mark.parametrize("categorical", [False, True])
+def test_lookups_match_mask(df_rec, categorical):
+    if categorical:
+        df_rec = df_rec.astype({"SOC": "category", "Skill": "category"})
+    index = SocIndex(df_rec["SOC"], df_rec["Skill"])
+
+    for soc in ("15-1252.00", "29-1141.00"):
+        mask = (df_rec["SOC"] == soc).to_numpy()
+        assert list(index.positions(soc)) == list(np.flatnonzero(mask))
+        assert list(index.get(soc)) == df_rec.loc[mask, "Skill"].astype(str).tolist()
+    assert len(index) == 2
+    assert index.counts().to_dict() == {"15-1252.00": 3, "29-1141.00": 2}
+
+
+def test_unknown_soc_is_empty(df_rec):
+    index = SocIndex(df_rec["SOC"], df_rec["Skill"])
+
+    assert "00-0000.00" not in index
+    assert "15-1252.00" in index
+    assert len(index.positions("00-0000.00")) == 0
+    assert len(index.get("00-0000.00")) == 0
+
+
+def test_view_is_not_a_copy(df_rec):
+    index = SocIndex(df_rec["SOC"], df_rec["Skill"])
+
+    assert np.shares_memory(index.view("15-1252.00"), index.values)
+
+
+def test_skills_and_tasks_accessors(df_rec):
+    tasks = pd.DataFrame({
+        "SOC": ["15-1252.00", "29-1141.00", "15-1252.00"],
+        "Task": ["Write code", "Assess patients", "Review code"],
+    }).astype({"SOC": "category", "Task": "category"})
+
+    skills = get_skills_index(df_rec)
+    task_index = get_tasks_index(tasks)
+
+    assert get_skills_index(df_rec) is skills
+    assert get_tasks_index(tasks) is task_index
+    assert list(skills.get("29-1141.00")) == ["Monitoring", "Active Listening"]
+    assert list(task_index.get("15-1252.00")) == ["Write code", "Review code"]
+    assert list(task_index.positions("15-1252.00")) == [0, 2]
+    assert list(task_index.get("29-1141.00")) == ["Assess patients"]
+
+
+def test_top_skills_for_soc(df_rec):
+    top = top_skills_for_soc(df_rec, "15-1252.00", top_k=2)
+
+    assert top["Skill"].tolist() == ["Programming", "Critical Thinking"]
+    assert top_skills_for_soc(df_rec, "00-0000.00").empty
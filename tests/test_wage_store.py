@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from src.charts_wages import employment_vs_wage_scatter, occupation_rows
+
+
+def _oews():
+    return pd.DataFrame({
+        "OCC_TITLE": ["Nurses", "Cooks", "Nurses", "Cooks"],
+        "STATE_ABBR": ["CA", "CA", "NY", "NY"],
+        "AREA_TITLE": ["California", "California", "New York", "New York"],
+        "A_MEDIAN": np.array([90000, 30000, 95000, 32000], dtype="float32"),
+        "TOT_EMP": [1000, 500, 800, 400],
+        "LOC_QUOTIENT": np.array([0.9, 1.1, 1.3, 0.7], dtype="float32"),
+    })
+
+
+def test_occupation_rows_match_mask():
+    df = _oews()
+    rows = occupation_rows(df, "Nurses")
+
+    expected = df[df["OCC_TITLE"] == "Nurses"].sort_values("A_MEDIAN", ascending=False)
+    assert rows["STATE_ABBR"].tolist() == expected["STATE_ABBR"].tolist()
+    assert occupation_rows(df, "Pilots").empty
+
+
+def test_scatter_hover_formats_float32_columns():
+    fig = employment_vs_wage_scatter(_oews(), "Nurses")
+    template = fig.data[0].hovertemplate
+
+    assert "%{marker.color:.2f}" in template
+    assert "%{y:,.0f}" in template
+    assert "Estado=" in template